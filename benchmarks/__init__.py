@@ -0,0 +1,4 @@
+"""
+Performance benchmarks for the PromptCraft API.
+Run modules with `python -m benchmarks.<name> --help`.
+"""
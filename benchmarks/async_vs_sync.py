@@ -0,0 +1,95 @@
+# benchmarks/async_vs_sync.py
+"""
+Compare the async request path against the old sync-`def` handlers.
+
+Both apps expose the same two hot endpoints (submit feedback, prompt stats)
+against the same database.  The sync app runs its handlers in FastAPI's
+threadpool (40 threads by default) on `FeedbackService`; the async app is
+the real `src.main.app` on `AsyncFeedbackService`.
+
+    python -m benchmarks.async_vs_sync --requests 2000 --concurrency 200
+    python -m benchmarks.async_vs_sync --database-url postgresql://…/promptcraft_bench
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+
+import httpx
+from fastapi import Depends, FastAPI, status
+
+from benchmarks.common import drive, safe_url
+from src.api.dependencies import get_db
+from src.api.schemas.base import APIResponse
+from src.api.schemas.feedback import FeedbackCreate, FeedbackOut, PromptStats
+from src.database.database import Database
+from src.services.feedback_service import FeedbackService
+from src.services.prompt_service import PromptService
+
+
+def build_sync_app() -> FastAPI:
+    """The pre-async handlers: plain `def`, run in the threadpool."""
+    app = FastAPI()
+
+    @app.post("/api/v1/responses/{response_id}/feedback", status_code=status.HTTP_201_CREATED)
+    def add_feedback(response_id: str, payload: FeedbackCreate, db: Database = Depends(get_db)):
+        fb = FeedbackService(db).add_feedback(response_id, payload.score)
+        return APIResponse(data=FeedbackOut.model_validate(fb, from_attributes=True))
+
+    @app.get("/api/v1/prompts/{prompt_id}/stats")
+    def prompt_stats(prompt_id: str, db: Database = Depends(get_db)):
+        return APIResponse(data=PromptStats(**FeedbackService(db).stats(prompt_id)))
+
+    return app
+
+
+async def run_app(app, make_request, total: int, concurrency: int) -> dict:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        return await drive(client, make_request, total, concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench.sqlite3"
+    os.environ["DATABASE_URL"] = url
+    db = Database(url)
+    db.initialize()
+
+    prompt_id = PromptService(db).create("Benchmark {x}", "async_vs_sync")
+    response_id = PromptService(db).add_feedback(prompt_id, 0.5).response_id
+
+    async def submit(client, i):
+        return await client.post(
+            f"/api/v1/responses/{response_id}/feedback", json={"score": (i % 100) / 100}
+        )
+
+    async def stats(client, _):
+        return await client.get(f"/api/v1/prompts/{prompt_id}/stats")
+
+    from src.main import app as async_app
+    from src.database.registry import registry
+
+    async def run_all() -> dict:
+        # one event loop for everything – async pools are bound to their loop
+        results = {}
+        for mode, app in (("sync", build_sync_app()), ("async", async_app)):
+            for name, fn in (("add_feedback", submit), ("stats", stats)):
+                results[f"{mode}.{name}"] = await run_app(app, fn, args.requests, args.concurrency)
+        await registry.dispose_all_async()
+        return results
+
+    results = asyncio.run(run_all())
+    print(json.dumps({"database": safe_url(url), "concurrency": args.concurrency,
+                      "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# benchmarks/blob_storage.py
+"""
+Disk footprint of instance / response text: inline columns vs text_blobs.
+
+Builds the old layout (formatted_text / content inline) with a realistic
+mix – a few support templates filled from small vocabularies, answers
+mostly from a pool of canned replies, some one-off – measures it, runs
+src/database/migrate_text_blobs.py over it and measures again, after
+VACUUM (SQLite: file size) or VACUUM FULL (Postgres: pg_total_relation_size
+of prompt_instances + responses + text_blobs).  Smaller tables mean fewer
+pages to read and cache for the same rows.
+
+    python -m benchmarks.blob_storage --instances 20000
+    python -m benchmarks.blob_storage --database-url postgresql://…/promptcraft_scratch   # dropped + rebuilt!
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+from benchmarks.common import safe_url
+from src.database import migrate_text_blobs
+
+PRODUCTS = ["Billing", "Search", "Storage", "Mail", "Calendar", "Docs", "Chat", "Maps", "Photos", "Drive"]
+TIERS = ["free", "pro", "enterprise"]
+LANGUAGES = ["English", "German", "Spanish", "Japanese"]
+POLICY = " ".join(
+    f"Rule {n}: be concise, cite the help-centre article that applies, never promise refunds "
+    f"or delivery dates, and escalate to a human agent when the customer asks twice."
+    for n in range(1, 9)
+)
+TEMPLATE = ("You are a support assistant for {product}. The customer is on the {tier} plan "
+            "and writes in {language}.\n{policy}\nQuestion: {question}")
+WORDS = ("account invoice quota sync error folder share limit plan upgrade export calendar "
+         "invite password device backup restore region latency").split()
+
+LEGACY_DDL = """
+CREATE TABLE prompt_instances (
+    id VARCHAR(36) PRIMARY KEY, prompt_id VARCHAR(36) NOT NULL, prompt_version_id VARCHAR(36),
+    formatted_text TEXT NOT NULL, context TEXT, created_at TIMESTAMP);
+CREATE TABLE responses (
+    id VARCHAR(36) PRIMARY KEY, prompt_instance_id VARCHAR(36) NOT NULL,
+    content TEXT NOT NULL, response_metadata TEXT, created_at TIMESTAMP);
+"""
+TABLES = ("prompt_instances", "responses", "text_blobs")
+
+
+def dataset(instances: int, responses: int, unique_share: float, rng: random.Random):
+    questions = [f"How do I {rng.choice(WORDS)} my {rng.choice(WORDS)} after the {rng.choice(WORDS)} change?"
+                 for _ in range(50)]
+    canned = [" ".join(rng.choice(WORDS) for _ in range(120)).capitalize() + "." for _ in range(200)]
+    start = datetime(2024, 1, 1)
+    for i in range(instances):
+        context = {"product": rng.choice(PRODUCTS), "tier": rng.choice(TIERS),
+                   "language": rng.choice(LANGUAGES), "question": rng.choice(questions)}
+        inst = {"id": str(uuid.uuid4()), "prompt_id": str(uuid.uuid5(uuid.NAMESPACE_OID, context["product"])),
+                "formatted_text": TEMPLATE.format(policy=POLICY, **context),
+                "context": json.dumps(context), "created_at": start + timedelta(seconds=i)}
+        answers = []
+        for _ in range(responses):
+            content = (" ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 160)))
+                       if rng.random() < unique_share else rng.choice(canned))
+            answers.append({"id": str(uuid.uuid4()), "prompt_instance_id": inst["id"],
+                            "content": content, "created_at": inst["created_at"]})
+        yield inst, answers
+
+
+def footprint(engine) -> dict:
+    """Bytes on disk: the whole file on SQLite, per table (with indexes and TOAST) on Postgres."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if engine.dialect.name == "sqlite":
+            conn.execute(text("VACUUM"))
+            return {"file": os.path.getsize(engine.url.database)}
+        existing = [t for t in TABLES if conn.execute(text("SELECT to_regclass(:t)"), {"t": t}).scalar()]
+        for table in existing:
+            conn.execute(text(f'VACUUM FULL "{table}"'))
+        return {table: conn.execute(text("SELECT pg_total_relation_size(:t)"), {"t": table}).scalar()
+                for table in existing}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None, help="scratch database; its tables are dropped")
+    parser.add_argument("--instances", type=int, default=20000)
+    parser.add_argument("--responses", type=int, default=1, help="responses per instance")
+    parser.add_argument("--unique-share", type=float, default=0.3, help="share of one-off answers")
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/blobs.sqlite3"
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        for table in TABLES:
+            conn.execute(text(f'DROP TABLE IF EXISTS "{table}" CASCADE'
+                              if engine.dialect.name == "postgresql" else f'DROP TABLE IF EXISTS "{table}"'))
+        for ddl in filter(str.strip, LEGACY_DDL.split(";")):
+            conn.execute(text(ddl))
+
+    rng = random.Random(42)
+    texts = set()
+    with engine.begin() as conn:
+        for inst, answers in dataset(args.instances, args.responses, args.unique_share, rng):
+            conn.execute(text("INSERT INTO prompt_instances (id, prompt_id, formatted_text, context, created_at) "
+                              "VALUES (:id, :prompt_id, :formatted_text, :context, :created_at)"), inst)
+            conn.execute(text("INSERT INTO responses (id, prompt_instance_id, content, created_at) "
+                              "VALUES (:id, :prompt_instance_id, :content, :created_at)"), answers)
+            texts.add(inst["formatted_text"])
+            texts.update(a["content"] for a in answers)
+
+    inline = footprint(engine)
+    migrate_text_blobs.migrate(engine, progress=lambda _: None)
+    blobbed = footprint(engine)
+    with engine.connect() as conn:
+        codecs = dict(conn.execute(text("SELECT codec, count(*) FROM text_blobs GROUP BY codec")).all())
+    engine.dispose()
+
+    print(json.dumps({
+        "database": safe_url(url),
+        "instances": args.instances,
+        "responses": args.instances * args.responses,
+        "distinct_texts": len(texts),
+        "blobs_by_codec": codecs,
+        "inline": inline,
+        "text_blobs": blobbed,
+        "reduction": round(1 - sum(blobbed.values()) / sum(inline.values()), 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
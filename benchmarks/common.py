@@ -0,0 +1,64 @@
+# benchmarks/common.py
+"""Shared load-driving and latency-summary helpers for the benchmarks."""
+import asyncio
+import subprocess
+import time
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    """Throughput and latency percentiles (ms) for one scenario."""
+    latencies = sorted(latencies)
+    total = len(latencies)
+    return {
+        "requests": total,
+        "errors": errors,
+        "rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+
+async def drive(client, make_request, total: int, concurrency: int) -> dict:
+    """Fire `total` requests from `concurrency` tasks sharing one counter."""
+    latencies = []
+    errors = 0
+    queue = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in queue:
+            start = time.perf_counter()
+            try:
+                r = await make_request(client, i)
+                failed = r.status_code >= 400
+            except Exception:          # timeouts / resets count, they don't abort the run
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+def safe_url(url: str) -> str:
+    from sqlalchemy.engine import make_url
+    return make_url(url).render_as_string(hide_password=True)
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,58 @@
+# benchmarks/compare.py
+"""
+Diff two `benchmarks.load_test` JSON results and flag regressions.
+
+    python -m benchmarks.compare base.json head.json --threshold 10
+
+A scenario regresses when its p95 latency grows, or its throughput
+drops, by more than --threshold percent.  Exits 1 if any did, so it can
+gate CI.
+"""
+import argparse
+import json
+import sys
+
+
+def pct_change(old: float, new: float) -> float:
+    return 0.0 if not old else (new - old) / old * 100
+
+
+def compare(base: dict, head: dict, threshold: float) -> tuple[list, bool]:
+    """Rows of (scenario, metric, base, head, change%, regressed)."""
+    rows, regressed = [], False
+    for name in sorted(set(base["results"]) & set(head["results"])):
+        b, h = base["results"][name], head["results"][name]
+        for metric, worse_when_higher in (("rps", False), ("p50_ms", True),
+                                          ("p95_ms", True), ("p99_ms", True)):
+            change = pct_change(b[metric], h[metric])
+            gated = metric in ("rps", "p95_ms")       # p50/p99 are informational
+            bad = gated and (change > threshold if worse_when_higher else change < -threshold)
+            regressed |= bad
+            rows.append((name, metric, b[metric], h[metric], change, bad))
+        if h.get("errors", 0) > b.get("errors", 0):
+            regressed = True
+            rows.append((name, "errors", b.get("errors", 0), h["errors"], 0.0, True))
+    return rows, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two load-test results")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent")
+    args = parser.parse_args()
+    with open(args.base) as fh:
+        base = json.load(fh)
+    with open(args.head) as fh:
+        head = json.load(fh)
+
+    rows, regressed = compare(base, head, args.threshold)
+    print(f"{'scenario':<16} {'metric':<8} {'base':>10} {'head':>10} {'change':>8}")
+    for name, metric, b, h, change, bad in rows:
+        flag = "  ⚠ regression" if bad else ""
+        print(f"{name:<16} {metric:<8} {b:>10} {h:>10} {change:>+7.1f}%{flag}")
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
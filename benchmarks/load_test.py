@@ -0,0 +1,192 @@
+# benchmarks/load_test.py
+"""
+End-to-end load test: seed a database, serve the real app with uvicorn,
+and hammer the hot endpoints with a concurrent HTTP client.
+
+    python -m benchmarks.load_test --prompts 1000 --requests 5000 --concurrency 100 \
+        --output results/$(git rev-parse --short HEAD).json
+    python -m benchmarks.compare results/base.json results/head.json
+
+Each scenario reports rps and p50/p95/p99 latency; the JSON written to
+--output (and stdout) also records the volumes, settings and git revision
+so runs can be diffed with `benchmarks.compare`.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import httpx
+
+from benchmarks import seed as seeding
+from benchmarks.common import drive, git_revision, safe_url
+from src.database.database import Database
+
+API = "/api/v1"
+
+
+def scenarios(data: seeding.SeedResult, rng: random.Random) -> dict:
+    """name → coroutine factory (client, i) → httpx.Response"""
+    def pick(ids):
+        return ids[rng.randrange(len(ids))]
+
+    async def create_instance(client, i):
+        return await client.post(f"{API}/prompts/{pick(data.prompt_ids)}/instances",
+                                 json={"formatted_text": f"load {i}", "context": {"i": i}})
+
+    async def add_feedback(client, i):
+        return await client.post(f"{API}/responses/{pick(data.response_ids)}/feedback",
+                                 json={"score": round(rng.random(), 2)})
+
+    async def log_call(client, i):
+        return await client.post(f"{API}/calls", json={
+            "prompt_id": pick(data.prompt_ids), "formatted_text": f"load {i}",
+            "context": {"i": i}, "content": "ok", "score": round(rng.random(), 2)})
+
+    async def stats(client, _):
+        return await client.get(f"{API}/prompts/{pick(data.prompt_ids)}/stats")
+
+    async def readiness(client, _):
+        return await client.get(f"{API}/prompts/{pick(data.prompt_ids)}/optimization/readiness")
+
+    async def list_feedback(client, _):
+        return await client.get(f"{API}/prompts/{pick(data.prompt_ids)}/feedback",
+                                params={"limit": 50})
+
+    return {
+        "create_instance": create_instance,
+        "add_feedback": add_feedback,
+        "log_call": log_call,
+        "stats": stats,
+        "readiness": readiness,
+        "list_feedback": list_feedback,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url: str, port: int, workers: int) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=database_url)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+         "--no-access-log"],
+        env=env,
+    )
+
+
+def wait_ready(base_url: str, proc: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {proc.returncode}")
+        try:
+            if httpx.get(f"{base_url}{API}/health", timeout=1).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("uvicorn did not become ready in time")
+
+
+async def run_scenarios(base_url: str, names: list, data, args) -> dict:
+    rng = random.Random(args.seed)
+    table = scenarios(data, rng)
+    limits = httpx.Limits(max_connections=args.concurrency,
+                          max_keepalive_connections=args.concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        for name in names:
+            if args.warmup:
+                await drive(client, table[name], args.warmup, min(args.concurrency, args.warmup))
+            results[name] = await drive(client, table[name], args.requests, args.concurrency)
+            print(f"  {name:<16} {results[name]['rps']:>9} rps  "
+                  f"p50 {results[name]['p50_ms']}ms  p95 {results[name]['p95_ms']}ms  "
+                  f"p99 {results[name]['p99_ms']}ms  errors {results[name]['errors']}",
+                  file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed, serve and load-test the API")
+    parser.add_argument("--database-url", default=None,
+                        help="defaults to a fresh SQLite file in a temp dir")
+    parser.add_argument("--no-seed", action="store_true",
+                        help="reuse the rows already in --database-url")
+    seeding.add_arguments(parser)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=100, help="untimed requests per scenario")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--scenario", action="append", dest="scenarios",
+                        help="run only these (repeatable); default: all")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="write the JSON result here too")
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench.sqlite3"
+    db = Database(url)
+    db.initialize()
+    if args.no_seed:
+        data = seeding.load_ids(db)
+    else:
+        started = time.perf_counter()
+        data = seeding.seed(db, args.prompts, args.instances, args.responses, args.feedback,
+                            rng_seed=args.seed)
+        print(f"seeded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    db.db_manager.dispose()
+    if not data.prompt_ids or not data.response_ids:
+        parser.error("database has no prompts/responses to load-test against")
+
+    names = args.scenarios or list(scenarios(data, random.Random()))
+    unknown = set(names) - set(scenarios(data, random.Random()))
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    proc = start_server(url, port, args.workers)
+    try:
+        wait_ready(base_url, proc)
+        results = asyncio.run(run_scenarios(base_url, names, data, args))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": safe_url(url),
+            "seeded": {"prompts": len(data.prompt_ids), "instances": len(data.instance_ids),
+                       "responses": len(data.response_ids), "feedback": data.feedback},
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
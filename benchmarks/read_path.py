@@ -0,0 +1,126 @@
+# benchmarks/read_path.py
+"""
+List reads: ORM objects + DTOs vs Core rows (src/services/reads.py).
+
+For prompts, instances, responses and feedback, fetch `--rows` rows and
+encode them the way the list endpoints do:
+
+* orm  – select(Model) → ORM objects → `*Out.model_validate(from_attributes=True)`
+         → model_dump → orjson (the pre-reads.py route path)
+* core – select(columns) → slotted rows → orjson
+
+Instance / response text is looked up in text_blobs on both sides
+(src/services/blobs.py; hot blobs come from its LRU after the first round),
+and report CPU µs and allocated bytes per row (tracemalloc peak over the
+fetch + encode, measured in a separate pass so tracing doesn't skew the
+timings).  Both sides produce the same JSON; that is checked first.
+
+    python -m benchmarks.read_path --rows 2000
+    python -m benchmarks.read_path --database-url postgresql://…/promptcraft_bench --no-seed
+"""
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import orjson
+from sqlalchemy import select
+
+from benchmarks import seed as seeding
+from benchmarks.common import safe_url
+from src.api.schemas.feedback import FeedbackOut
+from src.api.schemas.instance import PromptInstanceOut, ResponseOut
+from src.api.schemas.prompt import PromptOut
+from src.database.database import Database
+from src.models.models import Feedback, Prompt, PromptInstance, Response
+from src.services import blobs, reads
+
+ENTITIES = {
+    "prompts": (Prompt, PromptOut, reads.PromptRow),
+    "instances": (PromptInstance, PromptInstanceOut, reads.InstanceRow),
+    "responses": (Response, ResponseOut, reads.ResponseRow),
+    "feedback": (Feedback, FeedbackOut, reads.FeedbackRow),
+}
+
+
+# ORM text column → the DTO field it fills
+BLOB_TEXT = {"formatted_text_hash": "formatted_text", "content_hash": "content"}
+
+
+def _with_text(objs, texts: dict) -> list:
+    out = []
+    for o in objs:
+        attrs = {c.key: getattr(o, c.key) for c in o.__mapper__.column_attrs}
+        attrs.update({BLOB_TEXT[k]: texts[v] for k, v in attrs.items() if k in BLOB_TEXT})
+        out.append(SimpleNamespace(**attrs))
+    return out
+
+
+def orm_path(session, model, dto, n: int) -> bytes:
+    objs = session.scalars(select(model).order_by(model.id).limit(n)).all()
+    columns = [c for c in BLOB_TEXT if hasattr(model, c)]
+    if columns:
+        objs = _with_text(objs, blobs.load(session, {getattr(o, c) for o in objs for c in columns}))
+    items = [dto.model_validate(o, from_attributes=True).model_dump(by_alias=True) for o in objs]
+    return orjson.dumps(items)
+
+
+def core_path(session, model, row_type, n: int) -> bytes:
+    stmt, row_type = reads.select_rows(row_type)
+    items = reads.rows(session.execute(stmt.order_by(model.id).limit(n)), row_type)
+    return orjson.dumps(reads.resolve(session, items))
+
+
+def measure(db: Database, fn, n: int, rounds: int) -> dict:
+    def once():
+        with db.db_manager.get_session() as s:       # fresh session: no identity-map reuse
+            return fn(s)
+
+    once()                                           # warm caches (statement, pool)
+    cpu = time.process_time()
+    for _ in range(rounds):
+        once()
+    cpu = (time.process_time() - cpu) / rounds
+    tracemalloc.start()
+    once()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"cpu_us_per_row": round(cpu / n * 1e6, 2), "peak_bytes_per_row": round(peak / n)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--no-seed", action="store_true", help="use the rows already there")
+    parser.add_argument("--rows", type=int, default=2000, help="rows per fetch")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench.sqlite3"
+    db = Database(url)
+    db.initialize()
+    if not args.no_seed:
+        # enough parents that every table has at least --rows rows
+        seeding.seed(db, prompts=args.rows, instances=1, responses=1, feedback=1)
+
+    results = {}
+    for name, (model, dto, row_type) in ENTITIES.items():
+        def orm(s):
+            return orm_path(s, model, dto, args.rows)
+
+        def core(s):
+            return core_path(s, model, row_type, args.rows)
+
+        with db.db_manager.get_session() as s:
+            assert json.loads(orm(s)) == json.loads(core(s)), f"{name}: outputs differ"
+        results[name] = {"orm": measure(db, orm, args.rows, args.rounds),
+                         "core": measure(db, core, args.rows, args.rounds)}
+        results[name]["cpu_speedup"] = round(
+            results[name]["orm"]["cpu_us_per_row"] / results[name]["core"]["cpu_us_per_row"], 2)
+    print(json.dumps({"database": safe_url(url), "rows": args.rows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
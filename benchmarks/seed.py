@@ -0,0 +1,143 @@
+# benchmarks/seed.py
+"""
+Bulk-seed a database with synthetic prompts → instances → responses → feedback.
+
+    python -m benchmarks.seed --database-url sqlite:///bench.sqlite3 \
+        --prompts 1000 --instances 10 --responses 2 --feedback 3
+
+Volumes are per parent (instances per prompt, responses per instance,
+feedback per response).  Rows go in with Core executemany in chunks and
+the stats rollup is rebuilt once at the end, so a million feedback rows
+take seconds rather than the hours the API would need.
+"""
+import argparse
+import itertools
+import random
+from dataclasses import dataclass, field
+from typing import Callable
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, select
+from src.database.database import Database
+from src.models.ids import new_id
+from src.models.models import Feedback, Prompt, PromptInstance, PromptVersion, Response, TextBlob
+from src.services import blobs, stats_rollup
+
+
+@dataclass
+class SeedResult:
+    prompt_ids: list = field(default_factory=list)
+    instance_ids: list = field(default_factory=list)
+    response_ids: list = field(default_factory=list)
+    feedback: int = 0
+
+
+def seed(
+    db: Database,
+    prompts: int = 100,
+    instances: int = 10,
+    responses: int = 2,
+    feedback: int = 3,
+    chunk_size: int = 5000,
+    rng_seed: int = 42,
+    id_factory: Callable[[], str] = new_id,
+) -> SeedResult:
+    rng = random.Random(rng_seed)
+    result = SeedResult()
+    start = datetime.utcnow() - timedelta(days=30)
+    # spread rows evenly over the last 30 days, newest last – gives the
+    # created_at indexes a realistic spread instead of a single timestamp
+    total_rows = prompts * (1 + instances * (1 + responses * (1 + feedback)))
+    step = timedelta(days=30) / max(total_rows, 1)
+    tick = (start + step * n for n in itertools.count())
+    buffers = {TextBlob: [], Prompt: [], PromptVersion: [], PromptInstance: [], Response: [], Feedback: []}
+    stored = set()
+
+    def blob(text: str) -> str:
+        row = blobs.encode(text)
+        if row["hash"] not in stored:
+            stored.add(row["hash"])
+            buffers[TextBlob].append(row)
+        return row["hash"]
+
+    with db.db_manager.get_session() as s:
+        def flush(model, force=False):
+            rows = buffers[model]
+            if rows and (force or len(rows) >= chunk_size):
+                # parents before children, so FKs hold on Postgres
+                for parent in list(buffers)[:list(buffers).index(model)]:
+                    flush(parent, force=True)
+                if model is TextBlob:          # may be there from an earlier seed
+                    s.execute(blobs.insert_stmt(s.get_bind().dialect.name), rows)
+                else:
+                    s.execute(insert(model), rows)
+                rows.clear()
+
+        for p in range(prompts):
+            p_id = id_factory()
+            result.prompt_ids.append(p_id)
+            buffers[Prompt].append({"id": p_id, "text": f"Benchmark prompt {p}: {{input}}",
+                                    "description": "seed", "version": 1,
+                                    "created_at": next(tick), "updated_at": start})
+            v_id = id_factory()
+            buffers[PromptVersion].append({"id": v_id, "prompt_id": p_id, "version": 1,
+                                           "text": f"Benchmark prompt {p}: {{input}}",
+                                           "created_at": start})
+            for i in range(instances):
+                i_id = id_factory()
+                result.instance_ids.append(i_id)
+                buffers[PromptInstance].append({
+                    "id": i_id, "prompt_id": p_id, "prompt_version_id": v_id,
+                    "formatted_text_hash": blob(f"Benchmark prompt {p}: {i}"),
+                    "context": {"i": i}, "created_at": next(tick)})
+                for _ in range(responses):
+                    r_id = id_factory()
+                    result.response_ids.append(r_id)
+                    buffers[Response].append({"id": r_id, "prompt_instance_id": i_id,
+                                              "content_hash": blob("ok"), "created_at": next(tick)})
+                    for _ in range(feedback):
+                        buffers[Feedback].append({"id": id_factory(), "response_id": r_id,
+                                                  "score": round(rng.random(), 2),
+                                                  "created_at": next(tick)})
+                        result.feedback += 1
+            for model in buffers:
+                flush(model)
+        for model in buffers:
+            flush(model, force=True)
+        s.commit()
+        stats_rollup.rebuild(s)
+        s.commit()
+    return result
+
+
+def load_ids(db: Database) -> SeedResult:
+    """Ids already in the database, for load-testing a previously seeded one."""
+    with db.db_manager.get_session() as s:
+        return SeedResult(
+            prompt_ids=list(s.scalars(select(Prompt.id))),
+            instance_ids=list(s.scalars(select(PromptInstance.id))),
+            response_ids=list(s.scalars(select(Response.id))),
+            feedback=s.scalar(select(func.count()).select_from(Feedback)),
+        )
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--prompts", type=int, default=100)
+    parser.add_argument("--instances", type=int, default=10, help="instances per prompt")
+    parser.add_argument("--responses", type=int, default=2, help="responses per instance")
+    parser.add_argument("--feedback", type=int, default=3, help="feedback rows per response")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a PromptCraft database for benchmarks")
+    parser.add_argument("--database-url", default=None)
+    add_arguments(parser)
+    args = parser.parse_args()
+    db = Database(args.database_url)
+    db.initialize()
+    r = seed(db, args.prompts, args.instances, args.responses, args.feedback)
+    print(f"✅ seeded {len(r.prompt_ids)} prompts, {len(r.instance_ids)} instances, "
+          f"{len(r.response_ids)} responses, {r.feedback} feedback")
+
+
+if __name__ == "__main__":
+    main()
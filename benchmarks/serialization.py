@@ -0,0 +1,118 @@
+# benchmarks/serialization.py
+"""
+Response serialization: FastAPI's generic path vs the one-pass APIResponse path.
+
+* encode – the same `APIResponse(data=PaginatedPrompts(...))` envelope
+  turned into body bytes by FastAPI's `serialize_response` (model_dump →
+  re-validate against response_model → jsonable_encoder → json.dumps) and
+  by `APIJSONResponse` (one model_dump, then orjson).  Bodies are
+  checked to decode to the same JSON.
+* http – GET /api/v1/prompts?limit=N through the real app (in-process
+  ASGI transport, so no socket noise); run it on both sides of a change.
+
+    python -m benchmarks.serialization --items 20 100     # list limit is capped at 100
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+import httpx
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from benchmarks.common import drive
+from src.api.schemas.base import APIResponse
+from src.api.schemas.prompt import PaginatedPrompts, PromptOut
+from src.database.database import Database
+from src.services.prompt_service import PromptService
+
+
+def envelope(n: int) -> APIResponse:
+    now = datetime.utcnow()
+    items = [PromptOut(id=str(uuid.uuid4()), text=f"Prompt {i} {{x}}", version=1 + i % 3,
+                       description="benchmark", parent_id=None, created_at=now, updated_at=now)
+             for i in range(n)]
+    return APIResponse(data=PaginatedPrompts(items=items, total=n, offset=0, limit=n))
+
+
+async def encode(n: int, rounds: int) -> dict:
+    from src.api.routes.prompts import list_prompts
+    from src.main import app
+    field = next(r for r in app.routes if getattr(r, "endpoint", None) is list_prompts).response_field
+
+    async def legacy(env):
+        content = await serialize_response(field=field, response_content=env, is_coroutine=True)
+        return JSONResponse(content).body
+
+    try:
+        from src.api.responses import APIJSONResponse
+    except ImportError:                 # tree without the fast path
+        APIJSONResponse = None
+
+    env = envelope(n)
+    result = {}
+    if APIJSONResponse is not None:
+        assert json.loads(await legacy(env)) == json.loads(APIJSONResponse(env).body)
+    for name in ("legacy", "fast"):
+        if name == "fast" and APIJSONResponse is None:
+            continue
+        start = time.perf_counter()
+        for _ in range(rounds):
+            if name == "legacy":
+                await legacy(env)
+            else:
+                APIJSONResponse(env).body
+        per_call = (time.perf_counter() - start) / rounds
+        result[name] = {"us_per_response": round(per_call * 1e6, 1),
+                        "items_per_s": round(n / per_call)}
+    if "fast" in result:
+        result["speedup"] = round(result["legacy"]["us_per_response"] / result["fast"]["us_per_response"], 2)
+    return result
+
+
+async def http(n: int, requests: int, concurrency: int) -> dict:
+    from src.main import app
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def list_page(c, _):
+            return await c.get("/api/v1/prompts", params={"limit": n, "total": "none"})
+        await drive(client, list_page, 20, 1)                  # warm-up, fills pools
+        return await drive(client, list_page, requests, concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--rounds", type=int, default=200, help="encode rounds per size")
+    parser.add_argument("--requests", type=int, default=300, help="HTTP requests per size")
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    url = f"sqlite:///{tempfile.mkdtemp()}/bench.sqlite3"
+    os.environ["DATABASE_URL"] = url
+    db = Database(url)
+    db.initialize()
+    svc = PromptService(db)
+    for i in range(max(args.items)):
+        svc.create(f"Prompt {i} {{x}}", "benchmark")
+
+    from src.database.registry import registry
+
+    async def run_all() -> dict:
+        results = {}
+        for n in args.items:
+            results[n] = {"encode": await encode(n, args.rounds),
+                          "http": await http(n, args.requests, args.concurrency)}
+        await registry.dispose_all_async()
+        return results
+
+    print(json.dumps({"results": asyncio.run(run_all())}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
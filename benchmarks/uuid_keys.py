@@ -0,0 +1,80 @@
+# benchmarks/uuid_keys.py
+"""
+Random (v4) vs time-ordered (v7) primary keys: insert throughput and
+on-disk index size for the same seeded volumes.
+
+    python -m benchmarks.uuid_keys --prompts 500
+    python -m benchmarks.uuid_keys --database-url postgresql://…/promptcraft_bench
+
+Each mode gets a fresh schema (SQLite: a new file; Postgres: drop_all /
+create_all in the given database, so point it at a scratch database).
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import text
+
+from benchmarks import seed as seeding
+from benchmarks.common import safe_url
+from src.database.database import Database
+from src.models.ids import new_id
+from src.models.models import Base
+
+MODES = {"v4": lambda: str(uuid.uuid4()), "v7": new_id}
+
+
+def storage(db: Database) -> dict:
+    engine = db.db_manager.engine
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            tables = [t.name for t in Base.metadata.sorted_tables]
+            row = conn.execute(text(
+                "SELECT sum(pg_indexes_size(c.oid)), sum(pg_table_size(c.oid)) "
+                "FROM pg_class c WHERE c.relname = ANY(:names)"), {"names": tables}).one()
+            return {"index_bytes": int(row[0]), "table_bytes": int(row[1])}
+        # SQLite: per-b-tree sizes need the dbstat extension; whole-file size otherwise
+        try:
+            rows = conn.execute(text(
+                "SELECT name LIKE 'sqlite_autoindex%' OR name LIKE 'idx_%', sum(pgsize) "
+                "FROM dbstat GROUP BY 1")).all()
+            sizes = {bool(is_index): int(size) for is_index, size in rows}
+            return {"index_bytes": sizes.get(True, 0), "table_bytes": sizes.get(False, 0)}
+        except Exception:
+            return {"file_bytes": os.path.getsize(engine.url.database)}
+
+
+def run_mode(url: str, factory, args) -> dict:
+    db = Database(url)
+    Base.metadata.drop_all(db.db_manager.engine)
+    db.initialize()
+    started = time.perf_counter()
+    r = seeding.seed(db, args.prompts, args.instances, args.responses, args.feedback,
+                     id_factory=factory)
+    elapsed = time.perf_counter() - started
+    rows = len(r.prompt_ids) + len(r.instance_ids) + len(r.response_ids) + r.feedback
+    result = {"rows": rows, "seconds": round(elapsed, 2),
+              "rows_per_s": round(rows / elapsed), **storage(db)}
+    db.db_manager.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="v4 vs v7 primary keys")
+    parser.add_argument("--database-url", default=None)
+    seeding.add_arguments(parser)
+    args = parser.parse_args()
+
+    results = {}
+    for mode, factory in MODES.items():
+        url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/{mode}.sqlite3"
+        results[mode] = run_mode(url, factory, args)
+    print(json.dumps({"database": safe_url(args.database_url or "sqlite://"),
+                      "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
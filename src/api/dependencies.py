@@ -0,0 +1,98 @@
+from typing import AsyncIterator
+
+from fastapi import Query
+from src.api.exceptions import APIException
+from src.config import Config
+from src.database.async_database import AsyncDatabaseManager
+from src.database.database import Database
+from src.database.registry import registry
+from src.database.unit_of_work import unit_of_work
+from src.services import reads
+from src.services.json_filters import JSONFilter, parse_filters
+from src.services.pagination import Page, decode_cursor
+
+
+# Shared by every router – returns the app-lifetime Database (one pool per URL)
+def get_db() -> Database:
+    return registry.get()
+
+
+# Admin export – a full data dump, so it only exists when ADMIN_EXPORT_ENABLED is set
+def require_admin_export():
+    if not Config.ADMIN_EXPORT_ENABLED:
+        raise APIException(status_code=404, message="Not found")
+
+
+# Async routers – same idea, backed by an AsyncEngine.  Also opens the
+# request's unit of work: one session / transaction shared by every service
+# call, committed by TimedRoute when the endpoint returns.
+async def get_async_db() -> AsyncIterator[AsyncDatabaseManager]:
+    db = registry.get_async()
+    async with unit_of_work(db) as uow:
+        yield db
+        await uow.commit()          # no-op after TimedRoute's commit; a safety net elsewhere
+
+
+# List endpoints – offset paging kept for old clients, cursor paging preferred
+class PageParams:
+    def __init__(
+        self,
+        offset: int = Query(0, ge=0),
+        limit: int = Query(10, ge=1, le=100),
+        cursor: str | None = Query(None, description="next_cursor from the previous page"),
+        total: str = Query("exact", pattern="^(exact|estimate|none)$"),
+    ):
+        if cursor:
+            try:
+                decode_cursor(cursor)
+            except ValueError:
+                raise APIException(status_code=400, message="Invalid cursor")
+        self.offset, self.limit, self.cursor, self.total = offset, limit, cursor, total
+
+    def kwargs(self) -> dict:
+        return {"cursor": self.cursor, "total": self.total}
+
+    def payload(self, page: Page) -> dict:
+        """The Paginated* shape for a service Page; its rows (src/services/reads.py)
+        go to the encoder as they are, without a DTO copy."""
+        return {"items": page.items, "total": page.total, "offset": self.offset,
+                "limit": self.limit, "next_cursor": page.next_cursor}
+
+
+def _json_filters(exprs: list[str]) -> list[JSONFilter]:
+    try:
+        return parse_filters(exprs)
+    except ValueError as exc:
+        raise APIException(status_code=400, message="Invalid filter", errors=[str(exc)])
+
+
+def metadata_filters(
+    metadata: list[str] = Query([], description="response metadata filter, e.g. model=gpt-4 or latency_ms>2000 (repeatable)"),
+) -> list[JSONFilter]:
+    return _json_filters(metadata)
+
+
+def context_filters(
+    context: list[str] = Query([], description="instance context filter, e.g. user_tier=pro (repeatable)"),
+) -> list[JSONFilter]:
+    return _json_filters(context)
+
+
+# Sparse fieldsets – `?fields=id,context` returns (and reads) only those
+# columns; id and created_at always come back.  None means every field.
+def sparse_fields(row_type):
+    allowed = reads.field_names(row_type)
+
+    def dependency(
+        fields: str | None = Query(None, description=f"comma-separated subset of: {', '.join(allowed)}"),
+    ) -> frozenset[str] | None:
+        if fields is None:
+            return None
+        names = frozenset(f.strip() for f in fields.split(",") if f.strip())
+        unknown = sorted(names - set(allowed))
+        if unknown:
+            raise APIException(status_code=400, message="Invalid fields",
+                               errors=[f"unknown field: {name}" for name in unknown])
+        return names
+
+    return dependency
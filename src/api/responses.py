@@ -0,0 +1,61 @@
+# src/api/responses.py
+"""
+One-pass encoding for the `APIResponse` envelope.
+
+Left to itself FastAPI turns a returned `APIResponse` into bytes in four
+passes: model_dump, re-validation against `response_model=APIResponse`
+(whose `data` is `Any`, so it checks nothing), `jsonable_encoder` over the
+resulting dicts, then `json.dumps`.  The envelope was built from validated
+DTOs already, so `TimedRoute` hands it to `APIJSONResponse` instead:
+orjson straight to bytes, with DTOs model_dump'ed on the way (about twice
+as fast as pydantic-core's own JSON mode on datetime-heavy DTOs; that is
+the fallback when orjson isn't installed).  The envelope itself is taken
+apart shallowly, so list pages of slotted rows (src/services/reads.py) are
+serialized natively by orjson without any Python per row.  The wire
+format is the same; `response_model` stays on the routes for the OpenAPI
+schema.
+"""
+from typing import Any, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from src.api.schemas.base import APIResponse
+
+try:
+    import orjson
+except ImportError:                     # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(by_alias=True)
+    return jsonable_encoder(obj)        # Decimal & co., as FastAPI encoded them before
+
+
+class APIJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        if not isinstance(content, BaseModel):
+            return super().render(content)
+        if orjson is None:
+            return content.__pydantic_serializer__.to_json(content, by_alias=True)
+        if isinstance(content, APIResponse):
+            content = dict(content)     # shallow: `data` keeps its own types
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def api_response(content: APIResponse, status_code: int,
+                 sub_response: Optional[Response] = None) -> APIJSONResponse:
+    """Build the response FastAPI would have, honouring a `response: Response`
+    parameter the endpoint used to change the status code or add headers."""
+    if sub_response is not None and sub_response.status_code:
+        status_code = sub_response.status_code
+    response = APIJSONResponse(content, status_code=status_code)
+    if sub_response is not None:
+        for key, value in sub_response.raw_headers:
+            if key != b"content-length":
+                response.raw_headers.append((key, value))
+    return response
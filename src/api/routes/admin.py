@@ -0,0 +1,45 @@
+# src/api/routes/admin.py
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from src.api.dependencies import get_async_db, require_admin_export
+from src.api.exceptions import APIException
+from src.database.async_database import AsyncDatabaseManager
+from src.services.export_utils import EXPORT_TABLES, aiter_export, agzip_chunks, check_export
+from src.api.timing import TimedRoute
+
+router = APIRouter(prefix="/admin", tags=["Admin"], route_class=TimedRoute,
+                   dependencies=[Depends(require_admin_export)])
+
+_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+# ---------- GET /admin/export ----------
+@router.get("/export")
+async def export_tables(
+    format: str = Query("ndjson", pattern="^(csv|ndjson|json)$"),
+    tables: list[str] = Query(default=list(EXPORT_TABLES)),
+    gzip: bool = Query(False),
+    db: AsyncDatabaseManager = Depends(get_async_db),
+):
+    """
+    Stream a dump of the given tables (all by default).
+    CSV takes a single table; NDJSON lines carry a "table" key.
+    """
+    try:
+        check_export(format, tables)
+    except ValueError as exc:
+        raise APIException(status_code=400, message="Invalid export request", errors=[str(exc)])
+
+    body = aiter_export(db, tables, format)
+    filename = f"promptcraft-{'-'.join(tables) if len(tables) == 1 else 'export'}.{format}"
+    media_type = _MEDIA_TYPES[format]
+    if gzip:
+        body, filename, media_type = agzip_chunks(body), filename + ".gz", "application/gzip"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,52 @@
+# src/api/routes/calls.py
+from fastapi import APIRouter, status, Depends
+from sqlalchemy.exc import IntegrityError
+from src.database.async_database import AsyncDatabaseManager
+from src.api.dependencies import get_async_db
+from src.api.exceptions import APIException
+from src.api.schemas.base import APIResponse
+from src.api.schemas.call import CallCreate, CallBatchCreate, CallResult, CallBatchOut
+from src.services.async_call_service import AsyncCallService
+from src.api.timing import TimedRoute
+
+router = APIRouter(tags=["LLM Calls"], route_class=TimedRoute)
+
+
+async def _log(db: AsyncDatabaseManager, calls: list[CallCreate]) -> list[dict]:
+    try:
+        return await AsyncCallService(db).log_calls([c.model_dump() for c in calls])
+    except IntegrityError:
+        # a client-supplied response/feedback id collides with an existing row
+        raise APIException(status_code=409, message="Conflicting client-supplied id")
+
+
+# ------------------- POST /calls -------------------
+@router.post(
+    "/calls",
+    response_model=APIResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def log_call(payload: CallCreate, db: AsyncDatabaseManager = Depends(get_async_db)):
+    """Instance + response (+ feedback when `score` is set) in one transaction."""
+    result = (await _log(db, [payload]))[0]
+    if result["error"] in ("Prompt not found", "Prompt version not found"):
+        raise APIException(status_code=404, message=result["error"])
+    if not result["ok"]:
+        raise APIException(status_code=400, message="Invalid call", errors=[result["error"]])
+    return APIResponse(data=CallResult(**result))
+
+
+# ---------------- POST /calls:batch ----------------
+@router.post(
+    "/calls:batch",
+    response_model=APIResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def log_calls_batch(payload: CallBatchCreate, db: AsyncDatabaseManager = Depends(get_async_db)):
+    results = await _log(db, payload.items)
+    duplicates = sum(r["duplicate"] for r in results)
+    failed = sum(not r["ok"] for r in results)
+    return APIResponse(data=CallBatchOut(
+        created=len(results) - duplicates - failed, duplicates=duplicates,
+        failed=failed, items=results,
+    ))
@@ -1,19 +1,26 @@
-from fastapi import APIRouter, status, Depends, Query
-from src.services.feedback_service import FeedbackService
-from src.database.database import Database
+from datetime import datetime, timedelta
+from fastapi import APIRouter, status, Depends, Query, Response
+from src.services.async_feedback_service import AsyncFeedbackService
+from src.database.async_database import AsyncDatabaseManager
+from src.api.dependencies import get_async_db, PageParams, metadata_filters
+from src.services.json_filters import JSONFilter
 from src.api.schemas.base import APIResponse
 from src.api.schemas.feedback import (
-    FeedbackCreate, FeedbackOut, PaginatedFeedback,
-    PromptStats, OptimizationReadiness
+    FeedbackCreate, FeedbackOut,
+    PromptStats, OptimizationReadiness,
+    FeedbackBatchCreate, FeedbackBatchOut, PromptTimeseries,
+    ScoreAnalytics, ReadinessBatchCreate, BatchReadiness,
+    OptimizationCandidate, PaginatedCandidates,
 )
 from src.api.exceptions import APIException
-from src.services.prompt_service import PromptService
-import os
+from src.services.async_prompt_service import AsyncPromptService
+from src.services.prompt_service import MIN_AVG_SCORE, MIN_FEEDBACK_SAMPLES
+from src.services import analytics
+from src.services.feedback_buffer import BufferClosed, BufferFull, get_feedback_buffer
+from src.services.timeseries import as_utc_naive, check_range, parse_bucket
+from src.api.timing import TimedRoute
 
-router = APIRouter(tags=["Feedback / Stats"])
-
-def get_db():
-    return Database(os.getenv("DATABASE_URL"))
+router = APIRouter(tags=["Feedback / Stats"], route_class=TimedRoute)
 
 # ---------- POST /responses/{id}/feedback ----------
 @router.post(
@@ -21,58 +28,172 @@ def get_db():
     response_model=APIResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def add_feedback(
+async def add_feedback(
     response_id: str,
     payload: FeedbackCreate,
-    db: Database = Depends(get_db),
+    response: Response,
+    db: AsyncDatabaseManager = Depends(get_async_db),
 ):
-    svc = FeedbackService(db)
-    fb  = svc.add_feedback(response_id, payload.score)
+    """
+    201 once the score is committed.  With FEEDBACK_WRITE_MODE=buffered the
+    score is only queued and the answer is 202 (see feedback_buffer.py).
+    """
+    svc = AsyncFeedbackService(db)
+    buffer = get_feedback_buffer()
+    try:
+        if buffer is not None:
+            if not await svc.response_exists(response_id):
+                raise LookupError(response_id)
+            try:
+                item = await buffer.submit(response_id, payload.score)
+            except BufferClosed:            # shutting down – write it ourselves
+                buffer = None
+            else:
+                if not buffer.wait_for_commit:
+                    response.status_code = status.HTTP_202_ACCEPTED
+                return APIResponse(data=FeedbackOut(
+                    id=item.id, response_id=response_id, score=item.score,
+                    created_at=item.created_at,
+                ))
+        fb = await svc.add_feedback(response_id, payload.score)
+    except LookupError:
+        raise APIException(status_code=404, message="Response not found")
+    except BufferFull:
+        raise APIException(status_code=503, message="Feedback queue is full, retry shortly")
     dto = FeedbackOut.model_validate(fb, from_attributes=True)
     return APIResponse(data=dto)
 
+# ---------- POST /feedback:batch ----------
+@router.post(
+    "/feedback:batch",
+    response_model=APIResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_feedback_batch(
+    payload: FeedbackBatchCreate,
+    db: AsyncDatabaseManager = Depends(get_async_db),
+):
+    svc = AsyncFeedbackService(db)
+    results = await svc.add_scores_batch([(i.response_id, i.score) for i in payload.items])
+    created = sum(r["ok"] for r in results)
+    return APIResponse(data=FeedbackBatchOut(
+        created=created, failed=len(results) - created, items=results,
+    ))
+
 # ---------- GET /prompts/{id}/feedback ----------
 @router.get(
     "/prompts/{prompt_id}/feedback",
     response_model=APIResponse,
 )
-def prompt_feedback(
+async def prompt_feedback(
     prompt_id: str,
-    offset: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1, le=100),
-    db: Database = Depends(get_db),
+    page: PageParams = Depends(),
+    metadata: list[JSONFilter] = Depends(metadata_filters),
+    db: AsyncDatabaseManager = Depends(get_async_db),
 ):
-    svc = FeedbackService(db)
-    orm_items, total = svc.list_by_prompt(prompt_id, offset, limit)
-    dto_items = [FeedbackOut.model_validate(fb, from_attributes=True) for fb in orm_items]
-    payload   = PaginatedFeedback(items=dto_items, total=total, offset=offset, limit=limit)
-    return APIResponse(data=payload)
+    svc = AsyncFeedbackService(db)
+    result = await svc.list_by_prompt(
+        prompt_id, page.offset, page.limit, metadata=metadata, **page.kwargs()
+    )
+    return APIResponse(data=page.payload(result))
 
 # ---------- GET /feedback (global) ----------
 @router.get("/feedback", response_model=APIResponse)
-def list_feedback(
-    offset: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1, le=100),
-    db: Database = Depends(get_db),
+async def list_feedback(
+    page: PageParams = Depends(),
+    db: AsyncDatabaseManager = Depends(get_async_db),
 ):
-    svc = FeedbackService(db)
-    dto_items, total = svc.list_all(offset, limit)
-
-    return APIResponse(
-        data=PaginatedFeedback(items=dto_items, total=total, offset=offset, limit=limit)
-    )
+    svc = AsyncFeedbackService(db)
+    result = await svc.list_all(page.offset, page.limit, **page.kwargs())
+    return APIResponse(data=page.payload(result))
 
 # ---------- GET /prompts/{id}/stats ----------
 @router.get("/prompts/{prompt_id}/stats", response_model=APIResponse)
-def prompt_stats(prompt_id: str, db: Database = Depends(get_db)):
-    svc = FeedbackService(db)
-    stats = svc.stats(prompt_id)
+async def prompt_stats(prompt_id: str, db: AsyncDatabaseManager = Depends(get_async_db)):
+    svc = AsyncFeedbackService(db)
+    stats = await svc.stats(prompt_id)
     return APIResponse(data=PromptStats(**stats))
 
+# ---------- GET /prompts/{id}/stats/timeseries ----------
+@router.get("/prompts/{prompt_id}/stats/timeseries", response_model=APIResponse)
+async def prompt_stats_timeseries(
+    prompt_id: str,
+    bucket: str = Query("1h", description="bucket size: Nh, Nd or Nw"),
+    from_: datetime | None = Query(None, alias="from", description="default: 7 days before 'to'"),
+    to: datetime | None = Query(None, description="default: now"),
+    db: AsyncDatabaseManager = Depends(get_async_db),
+):
+    """
+    Feedback count / avg / p50 / p90 / min / max per UTC-aligned bucket.
+    Buckets overlapping [from, to) are returned whole.
+    """
+    end = as_utc_naive(to) if to else datetime.utcnow()
+    start = as_utc_naive(from_) if from_ else end - timedelta(days=7)
+    try:
+        size = parse_bucket(bucket)
+        check_range(start, end, size)
+    except ValueError as exc:
+        raise APIException(status_code=400, message="Invalid timeseries request", errors=[str(exc)])
+    svc = AsyncFeedbackService(db)
+    buckets = await svc.timeseries(prompt_id, size, start, end)
+    return APIResponse(data=PromptTimeseries(
+        prompt_id=prompt_id, bucket=bucket, to=end, buckets=buckets, **{"from": start},
+    ))
+
+# ---------- GET /prompts/{id}/stats/analytics ----------
+@router.get("/prompts/{prompt_id}/stats/analytics", response_model=APIResponse)
+async def prompt_stats_analytics(
+    prompt_id: str,
+    since: datetime | None = Query(None, description="only feedback from this point on"),
+    window: int = Query(analytics.DEFAULT_WINDOW, ge=2, le=10_000, description="recent scores for drift"),
+    ewma_alpha: float = Query(analytics.DEFAULT_EWMA_ALPHA, gt=0, le=1),
+    confidence: float = Query(analytics.DEFAULT_CONFIDENCE, gt=0, lt=1),
+    db: AsyncDatabaseManager = Depends(get_async_db),
+):
+    """Spread, quantiles, EWMA trend, CI of the mean and drift, from the raw scores."""
+    psvc = AsyncPromptService(db)
+    [stats] = await psvc.analytics(
+        [prompt_id], as_utc_naive(since) if since else None,
+        window=window, ewma_alpha=ewma_alpha, confidence=confidence,
+    )
+    return APIResponse(data=ScoreAnalytics(**stats))
+
 # ---------- GET /prompts/{id}/optimization/readiness ----------
 @router.get("/prompts/{prompt_id}/optimization/readiness", response_model=APIResponse)
-def readiness(prompt_id: str, db: Database = Depends(get_db)):
-    psvc = PromptService(db)
-    readiness_dict = psvc.ready_for_optimization(prompt_id)
+async def readiness(prompt_id: str, db: AsyncDatabaseManager = Depends(get_async_db)):
+    psvc = AsyncPromptService(db)
+    readiness_dict = await psvc.ready_for_optimization(prompt_id)
     readiness_dict["prompt_id"] = prompt_id
-    return APIResponse(data=OptimizationReadiness(**readiness_dict))
\ No newline at end of file
+    return APIResponse(data=OptimizationReadiness(**readiness_dict))
+
+# ---------- POST /optimization/readiness:batch ----------
+@router.post("/optimization/readiness:batch", response_model=APIResponse)
+async def readiness_batch(
+    payload: ReadinessBatchCreate,
+    db: AsyncDatabaseManager = Depends(get_async_db),
+):
+    """Readiness of up to 10k prompts from one scan, each with its full analytics."""
+    psvc = AsyncPromptService(db)
+    since = as_utc_naive(payload.since) if payload.since else None
+    items = await psvc.ready_for_optimization_many(payload.prompt_ids, since)
+    return APIResponse(data=[BatchReadiness(**item) for item in items])
+
+# ---------- GET /optimization/candidates ----------
+@router.get("/optimization/candidates", response_model=APIResponse)
+async def optimization_candidates(
+    min_samples: int = Query(MIN_FEEDBACK_SAMPLES, ge=1),
+    max_avg_score: float = Query(MIN_AVG_SCORE, ge=0.0, le=1.0),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    total: str = Query("exact", pattern="^(exact|estimate|none)$"),
+    db: AsyncDatabaseManager = Depends(get_async_db),
+):
+    """Prompts due for optimization, largest expected gain first (one rollup scan)."""
+    psvc = AsyncPromptService(db)
+    items, count, _ = await psvc.optimization_candidates(
+        min_samples, max_avg_score, offset, limit, total
+    )
+    return APIResponse(data=PaginatedCandidates(
+        items=[OptimizationCandidate(**c) for c in items], total=count, offset=offset,
+        limit=limit, min_samples=min_samples, max_avg_score=max_avg_score,
+    ))
@@ -1,8 +1,13 @@
 from datetime import datetime
 from fastapi import APIRouter
 from src.api.schemas.base import APIResponse
+from src.database.registry import registry
+from src.services import blobs
+from src.services.cache import get_cache
+from src.services.feedback_buffer import get_feedback_buffer
+from src.api.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.get("/health", tags=["System"])
 def health_check():
@@ -13,3 +18,19 @@ def health_check():
     }
     # Wrap in standard envelope
     return APIResponse(data=payload)
+
+@router.get("/health/pool", tags=["System"])
+def pool_metrics():
+    """Connection-pool size / checkout / wait metrics for every live engine."""
+    return APIResponse(data={"engines": registry.stats()})
+
+@router.get("/health/cache", tags=["System"])
+async def cache_metrics():
+    """Hit / miss / eviction counters of the read-through cache and the text-blob LRU."""
+    return APIResponse(data={**await get_cache().stats(), "text_blobs": blobs.cache.stats()})
+
+@router.get("/health/feedback-buffer", tags=["System"])
+def feedback_buffer_metrics():
+    """Queue depth / flush counters of the write-behind feedback buffer."""
+    buffer = get_feedback_buffer()
+    return APIResponse(data=buffer.stats() if buffer is not None else {"mode": "sync"})
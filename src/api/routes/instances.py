@@ -1,27 +1,19 @@
 # src/api/routes/instances.py
-from fastapi import APIRouter, status, Depends, Query
-from src.database.database import Database
-from src.models.models import PromptInstance, Response
-from src.services.feedback_service import FeedbackService
+from fastapi import APIRouter, status, Depends
+from src.database.async_database import AsyncDatabaseManager
+from src.api.dependencies import (
+    get_async_db, PageParams, context_filters, metadata_filters, sparse_fields,
+)
+from src.services.async_feedback_service import AsyncFeedbackService
 from src.api.exceptions import APIException
 from src.api.schemas.base import APIResponse
-from src.services.prompt_service import PromptService
-from src.api.schemas.instance import (
-    PromptInstanceCreate,
-    ResponseCreate,
-    PromptInstanceOut,
-    ResponseOut,
-    PaginatedInstances,
-    PaginatedResponses,
-)
-import os
-import json
-
-router = APIRouter(tags=["Prompt Instances / Responses"])
+from src.services.async_prompt_service import AsyncPromptService
+from src.api.schemas.instance import PromptInstanceCreate, ResponseCreate
+from src.services import reads
+from src.services.json_filters import JSONFilter
+from src.api.timing import TimedRoute
 
-# ----------------- helpers -----------------
-def get_db():
-    return Database(os.getenv("DATABASE_URL"))
+router = APIRouter(tags=["Prompt Instances / Responses"], route_class=TimedRoute)
 
 
 # ------------ POST /prompts/{id}/instances -------------
@@ -30,15 +22,18 @@ def get_db():
     response_model=APIResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def create_instance(
+async def create_instance(
     prompt_id: str,
     payload: PromptInstanceCreate,
-    db: Database = Depends(get_db),
+    db: AsyncDatabaseManager = Depends(get_async_db),
 ):
-    svc  = PromptService(db)
-    inst = svc.add_instance(prompt_id, payload.formatted_text, payload.context)
-    dto = PromptInstanceOut.model_validate(inst, from_attributes=True)
-    return APIResponse(data=dto)
+    svc  = AsyncPromptService(db)
+    try:
+        inst = await svc.add_instance(prompt_id, payload.formatted_text, payload.context,
+                                      version=payload.version)
+    except LookupError:
+        raise APIException(status_code=404, message="Prompt version not found")
+    return APIResponse(data=inst)
 
 
 # ------------- POST /instances/{id}/responses -----------
@@ -47,22 +42,14 @@ def create_instance(
     response_model=APIResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def create_response(
+async def create_response(
     instance_id: str,
     payload: ResponseCreate,
-    db: Database = Depends(get_db),
+    db: AsyncDatabaseManager = Depends(get_async_db),
 ):
-    svc  = FeedbackService(db)
-    resp = svc.add_response(instance_id, content=payload.content, metadata=payload.metadata)
-
-    dto = ResponseOut(
-        id=resp.id,
-        prompt_instance_id=resp.prompt_instance_id,
-        content=resp.content,
-        metadata=payload.metadata or {},
-        created_at=resp.created_at,
-    )
-    return APIResponse(data=dto)
+    svc  = AsyncFeedbackService(db)
+    resp = await svc.add_response(instance_id, content=payload.content, metadata=payload.metadata)
+    return APIResponse(data=resp)
 
 
 # --------- GET /prompts/{id}/instances (history) -------
@@ -71,23 +58,18 @@ def create_response(
     response_model=APIResponse,
     status_code=status.HTTP_200_OK,
 )
-def list_instances(
+async def list_instances(
     prompt_id: str,
-    offset: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1, le=100),
-    db: Database = Depends(get_db),
+    page: PageParams = Depends(),
+    context: list[JSONFilter] = Depends(context_filters),
+    fields: frozenset[str] | None = Depends(sparse_fields(reads.InstanceRow)),
+    db: AsyncDatabaseManager = Depends(get_async_db),
 ):
-    with db.db_manager.get_session() as session:
-        q = (
-            session.query(PromptInstance)
-            .filter(PromptInstance.prompt_id == prompt_id)
-        )
-        total = q.count()
-        orm_items = q.offset(offset).limit(limit).all()
-        items = [PromptInstanceOut.model_validate(i, from_attributes=True) for i in orm_items]
-
-    payload = PaginatedInstances(items=items, total=total, offset=offset, limit=limit)
-    return APIResponse(data=payload)
+    svc = AsyncPromptService(db)
+    result = await svc.list_instances(
+        prompt_id, page.offset, page.limit, context=context, fields=fields, **page.kwargs()
+    )
+    return APIResponse(data=page.payload(result))
 
 
 # -------- GET /instances/{id}/responses (list) ---------
@@ -96,25 +78,49 @@ def list_instances(
     response_model=APIResponse,
     status_code=status.HTTP_200_OK,
 )
-def list_responses(
+async def list_responses(
     instance_id: str,
-    offset: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1, le=100),
-    db: Database = Depends(get_db),
+    page: PageParams = Depends(),
+    metadata: list[JSONFilter] = Depends(metadata_filters),
+    fields: frozenset[str] | None = Depends(sparse_fields(reads.ResponseRow)),
+    db: AsyncDatabaseManager = Depends(get_async_db),
+):
+    svc = AsyncFeedbackService(db)
+    result = await svc.list_responses(
+        instance_id, page.offset, page.limit, metadata=metadata, fields=fields, **page.kwargs()
+    )
+    return APIResponse(data=page.payload(result))
+
+
+# ------------- GET /instances/{id} (full text) ---------
+@router.get(
+    "/instances/{instance_id}",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_instance(
+    instance_id: str,
+    fields: frozenset[str] | None = Depends(sparse_fields(reads.InstanceRow)),
+    db: AsyncDatabaseManager = Depends(get_async_db),
+):
+    inst = await AsyncPromptService(db).get_instance(instance_id, fields=fields)
+    if inst is None:
+        raise APIException(status_code=404, message="Instance not found")
+    return APIResponse(data=inst)
+
+
+# ------------- GET /responses/{id} (full text) ---------
+@router.get(
+    "/responses/{response_id}",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_response(
+    response_id: str,
+    fields: frozenset[str] | None = Depends(sparse_fields(reads.ResponseRow)),
+    db: AsyncDatabaseManager = Depends(get_async_db),
 ):
-    with db.db_manager.get_session() as session:
-        q = session.query(Response).filter(Response.prompt_instance_id == instance_id)
-        total = q.count()
-        orm_items = q.offset(offset).limit(limit).all()
-        items = [
-            ResponseOut(
-                id=r.id,
-                prompt_instance_id=r.prompt_instance_id,
-                content=r.content,
-                metadata=json.loads(r.response_metadata) if r.response_metadata else {},
-                created_at=r.created_at,
-            )
-            for r in orm_items
-        ]
-    payload = PaginatedResponses(items=items, total=total, offset=offset, limit=limit)
-    return APIResponse(data=payload)
+    resp = await AsyncFeedbackService(db).get_response(response_id, fields=fields)
+    if resp is None:
+        raise APIException(status_code=404, message="Response not found")
+    return APIResponse(data=resp)
@@ -0,0 +1,45 @@
+# src/api/routes/jobs.py
+from fastapi import APIRouter, status, Depends
+from src.config import Config
+from src.database.async_database import AsyncDatabaseManager
+from src.api.dependencies import get_async_db
+from src.api.exceptions import APIException
+from src.api.schemas.base import APIResponse
+from src.api.schemas.job import OptimizeRequest, JobOut
+from src.services.async_job_service import AsyncJobService
+from src.api.timing import TimedRoute
+
+router = APIRouter(tags=["Optimization Jobs"], route_class=TimedRoute)
+
+# ------------ POST /prompts/{id}/optimize -------------
+@router.post(
+    "/prompts/{prompt_id}/optimize",
+    response_model=APIResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def optimize_prompt(
+    prompt_id: str,
+    payload: OptimizeRequest | None = None,
+    db: AsyncDatabaseManager = Depends(get_async_db),
+):
+    strategy = (payload and payload.strategy) or Config.OPTIMIZATION_STRATEGY
+    try:
+        job = await AsyncJobService(db).enqueue(prompt_id, strategy)
+    except LookupError:
+        raise APIException(status_code=404, message="Prompt not found")
+    except ValueError as exc:
+        raise APIException(status_code=400, message="Invalid optimization request", errors=[str(exc)])
+    return APIResponse(data=JobOut.model_validate(job, from_attributes=True))
+
+
+# ------------------- GET /jobs/{id} -------------------
+@router.get(
+    "/jobs/{job_id}",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_job(job_id: str, db: AsyncDatabaseManager = Depends(get_async_db)):
+    job = await AsyncJobService(db).get(job_id)
+    if job is None:
+        raise APIException(status_code=404, message="Job not found")
+    return APIResponse(data=JobOut.model_validate(job, from_attributes=True))
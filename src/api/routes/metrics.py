@@ -0,0 +1,16 @@
+# src/api/routes/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from src.api.timing import TimedRoute
+from src.services.metrics import metrics
+
+router = APIRouter(route_class=TimedRoute)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# ---------- GET /metrics (Prometheus scrape target) ----------
+@router.get("/metrics", tags=["System"], response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Per-route latency, SQL statement count / time and serialization histograms."""
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
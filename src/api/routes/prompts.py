@@ -3,29 +3,27 @@ from src.api.schemas.prompt import (
     PromptCreate,
     PromptUpdate,
     PromptOut,
-    PaginatedPrompts,
+    PromptVersionOut,
+    VersionComparison,
 )
 from src.api.schemas.base import APIResponse
 from src.api.exceptions import APIException
-from src.database.database import Database
+from src.database.async_database import AsyncDatabaseManager
+from src.api.dependencies import get_async_db, PageParams, sparse_fields
 from src.models.models import Prompt
-from src.services.prompt_service import PromptService
-import os
+from src.services import ab_testing, reads
+from src.services.async_prompt_service import AsyncPromptService
+from src.api.timing import TimedRoute
 
-router = APIRouter(prefix="/prompts", tags=["Prompts"])
-
-# Dependency to obtain DB instance (keeps things testable)
-def get_db():
-    return Database(os.getenv("DATABASE_URL"))
+router = APIRouter(prefix="/prompts", tags=["Prompts"], route_class=TimedRoute)
 
 @router.post("", response_model=APIResponse,
              status_code=status.HTTP_201_CREATED)
-def create_prompt(payload: PromptCreate,
-                  db: Database = Depends(get_db)):
-    svc = PromptService(db)
+async def create_prompt(payload: PromptCreate,
+                        db: AsyncDatabaseManager = Depends(get_async_db)):
+    svc = AsyncPromptService(db)
     try:
-        prompt_id = svc.create(payload.text, payload.description or "")
-        prompt    = svc.get(prompt_id)          
+        prompt = await svc.create_prompt(payload.text, payload.description or "")
         dto = PromptOut.model_validate(prompt, from_attributes=True)
         return APIResponse(data=dto)
     except Exception as exc:
@@ -43,12 +41,19 @@ def create_prompt(payload: PromptCreate,
     response_model=APIResponse,
     status_code=status.HTTP_200_OK,
 )
-def get_prompt(prompt_id: str, db: Database = Depends(get_db)):
-    svc = PromptService(db)
-    prompt = svc.get(prompt_id)
+async def get_prompt(
+    prompt_id: str,
+    fields: frozenset[str] | None = Depends(sparse_fields(reads.PromptRow)),
+    db: AsyncDatabaseManager = Depends(get_async_db),
+):
+    svc = AsyncPromptService(db)
+    prompt = await svc.get(prompt_id)
     if not prompt:
         raise APIException(status_code=404, message="Prompt not found")
-    return APIResponse(data=PromptOut.model_validate(prompt, from_attributes=True))
+    dto = PromptOut.model_validate(prompt, from_attributes=True)
+    if fields is not None:              # served from the prompt cache, so just trim the output
+        return APIResponse(data=dto.model_dump(by_alias=True, include=fields | set(reads.ALWAYS)))
+    return APIResponse(data=dto)
 
 
 # ---------- GET list with pagination ---------- #
@@ -57,21 +62,14 @@ def get_prompt(prompt_id: str, db: Database = Depends(get_db)):
     response_model=APIResponse,
     status_code=status.HTTP_200_OK,
 )
-def list_prompts(
-    offset: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1, le=100),
-    db: Database = Depends(get_db),
+async def list_prompts(
+    page: PageParams = Depends(),
+    fields: frozenset[str] | None = Depends(sparse_fields(reads.PromptRow)),
+    db: AsyncDatabaseManager = Depends(get_async_db),
 ):
-    svc = PromptService(db)
-    orm_items, total = svc.list_paginated(offset, limit)
-    items = [PromptOut.model_validate(p, from_attributes=True) for p in orm_items]
-    payload = PaginatedPrompts(
-        items=items,
-        total=total,
-        offset=offset,
-        limit=limit,
-    )
-    return APIResponse(data=payload)
+    svc = AsyncPromptService(db)
+    result = await svc.list_paginated(page.offset, page.limit, fields=fields, **page.kwargs())
+    return APIResponse(data=page.payload(result))
 
 
 # ---------- PUT update prompt ---------- #
@@ -81,17 +79,61 @@ def list_prompts(
     response_model=APIResponse,
     status_code=status.HTTP_200_OK,
 )
-def update_prompt(
+async def update_prompt(
     prompt_id: str,
     payload: PromptUpdate,
-    db: Database = Depends(get_db),
+    db: AsyncDatabaseManager = Depends(get_async_db),
 ):
-    svc = PromptService(db)
-    prompt = svc.update(prompt_id,
+    svc = AsyncPromptService(db)
+    prompt = await svc.update(prompt_id,
                             text=payload.text,
                             description=payload.description)
     if not prompt:
         raise APIException(404, "Prompt not found")
     
     dto = PromptOut.model_validate(prompt, from_attributes=True)
-    return APIResponse(data=dto)
\ No newline at end of file
+    return APIResponse(data=dto)
+
+
+# ---------- GET version history ---------- #
+@router.get(
+    "/{prompt_id}/versions",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def list_versions(prompt_id: str, db: AsyncDatabaseManager = Depends(get_async_db)):
+    svc = AsyncPromptService(db)
+    if not await svc.get(prompt_id):
+        raise APIException(status_code=404, message="Prompt not found")
+    versions = await svc.list_versions(prompt_id)
+    return APIResponse(data=[PromptVersionOut(**v) for v in versions])
+
+
+# ---------- GET A/B comparison of two versions ---------- #
+@router.get(
+    "/{prompt_id}/versions/compare",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def compare_versions(
+    prompt_id: str,
+    a: int | None = Query(None, ge=1, description="baseline version, default: b - 1"),
+    b: int | None = Query(None, ge=1, description="candidate version, default: current head"),
+    alpha: float = Query(ab_testing.DEFAULT_ALPHA, gt=0, lt=1),
+    bootstrap: int = Query(ab_testing.DEFAULT_BOOTSTRAP, ge=0, le=ab_testing.MAX_BOOTSTRAP),
+    seed: int | None = Query(None, description="bootstrap RNG seed, for reproducible CIs"),
+    db: AsyncDatabaseManager = Depends(get_async_db),
+):
+    """
+    Welch t-test and bootstrap CI of mean score, version b vs a, on the
+    feedback attributed to each version.  Instances logged before
+    versioning are not attributable and are left out.
+    """
+    svc = AsyncPromptService(db)
+    try:
+        result = await svc.compare_versions(prompt_id, a, b, alpha, bootstrap, seed)
+    except LookupError as exc:
+        raise APIException(status_code=404, message="Prompt version not found", errors=[str(exc)])
+    except ValueError as exc:
+        raise APIException(status_code=400, message="Invalid comparison", errors=[str(exc)])
+    return APIResponse(data=VersionComparison(prompt_id=prompt_id, **result))
@@ -0,0 +1,39 @@
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+
+# ----------   POST /calls , POST /calls:batch   ----------
+class CallCreate(BaseModel):
+    """One LLM interaction: instance + response (+ optional feedback)."""
+    prompt_id: str
+    version: int | None = None        # prompt version that was sent; default: current head
+    formatted_text: str = Field(..., min_length=1, max_length=50_000)
+    context: dict | None = None
+    content: str = Field(..., min_length=1, max_length=100_000)
+    metadata: dict | None = None
+    score: float | None = None        # range checked per item, see CallResult.error
+    # optional client-generated ids – resending a call with the same
+    # instance_id is a no-op, so gateway retries are safe
+    instance_id: UUID | None = None
+    response_id: UUID | None = None
+    feedback_id: UUID | None = None
+
+class CallBatchCreate(BaseModel):
+    items: list[CallCreate] = Field(..., min_length=1, max_length=5_000)
+
+
+# ----------   DTO   ----------
+class CallResult(BaseModel):
+    index: int
+    ok: bool
+    duplicate: bool = False           # already logged by an earlier request
+    instance_id: str | None = None
+    response_id: str | None = None
+    feedback_id: str | None = None
+    error: str | None = None
+
+class CallBatchOut(BaseModel):
+    created: int
+    duplicates: int
+    failed: int
+    items: list[CallResult]
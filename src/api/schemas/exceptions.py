@@ -1,12 +1,3 @@
-from typing import List
-
-
-class APIException(Exception):
-    """
-    Raise this inside routes or services to return structured errors.
-    """
-    def __init__(self, status_code: int, message: str, errors: List[str] | None = None):
-        self.status_code = status_code
-        self.message = message
-        self.errors = errors or []
-        super().__init__(message)
+# kept for older imports – the one class lives in src/api/exceptions.py so the
+# global handler catches what the routers raise
+from src.api.exceptions import APIException  # noqa: F401
@@ -5,6 +5,14 @@ from pydantic import BaseModel, Field
 class FeedbackCreate(BaseModel):
     score: float = Field(..., ge=0.0, le=1.0)
 
+# ----------   POST /feedback:batch   ----------
+class FeedbackBatchItem(BaseModel):
+    response_id: str
+    score: float          # range checked per item, see FeedbackBatchResult.error
+
+class FeedbackBatchCreate(BaseModel):
+    items: list[FeedbackBatchItem] = Field(..., min_length=1, max_length=10_000)
+
 # ----------   DTO   ----------
 class FeedbackOut(BaseModel):
     id: str
@@ -12,20 +20,100 @@ class FeedbackOut(BaseModel):
     score: float
     created_at: datetime
 
+class FeedbackBatchResult(BaseModel):
+    index: int
+    response_id: str
+    id: str | None = None
+    ok: bool
+    error: str | None = None
+
+class FeedbackBatchOut(BaseModel):
+    created: int
+    failed: int
+    items: list[FeedbackBatchResult]
+
 # ----------   Pagination   ----------
 class PaginatedFeedback(BaseModel):
     items: list[FeedbackOut]
-    total: int
+    total: int | None = None          # None when the client asked for total=none
     offset: int
     limit: int
+    next_cursor: str | None = None
 
 # ----------   Stats / Readiness ----------
 class PromptStats(BaseModel):
     prompt_id: str
     total_feedback: int
     avg_score: float | None = None
+    min_score: float | None = None
+    max_score: float | None = None
+    stddev: float | None = None
+    last_score: float | None = None
+
+class StatsBucket(BaseModel):
+    start: datetime                   # UTC, aligned to the bucket size
+    count: int
+    avg_score: float
+    p50: float
+    p90: float
+    min_score: float
+    max_score: float
+
+class PromptTimeseries(BaseModel):
+    prompt_id: str
+    bucket: str
+    from_: datetime = Field(..., alias="from")
+    to: datetime
+    buckets: list[StatsBucket]        # non-empty buckets only, oldest first
 
 class OptimizationReadiness(BaseModel):
     prompt_id: str
     ready: bool
     reason: str
+
+# ----------   Analytics   ----------
+class ScoreDrift(BaseModel):
+    recent_avg: float | None = None   # last `window` scores; None until 2 × window exist
+    baseline_avg: float | None = None
+    z: float | None = None
+    drifting: bool = False
+
+class ScoreAnalytics(BaseModel):
+    prompt_id: str
+    total_feedback: int
+    avg_score: float
+    variance: float | None = None
+    stddev: float | None = None
+    min_score: float | None = None
+    max_score: float | None = None
+    p50: float | None = None
+    p90: float | None = None
+    ewma: float | None = None         # exponentially weighted, newest scores count most
+    ci_low: float | None = None       # confidence interval of avg_score
+    ci_high: float | None = None
+    drift: ScoreDrift
+
+class ReadinessBatchCreate(BaseModel):
+    prompt_ids: list[str] = Field(..., min_length=1, max_length=10_000)
+    since: datetime | None = None     # only feedback from this point on
+
+class BatchReadiness(OptimizationReadiness):
+    stats: ScoreAnalytics
+
+class OptimizationCandidate(BaseModel):
+    prompt_id: str
+    total_feedback: int
+    avg_score: float
+    stddev: float | None = None
+    min_score: float | None = None
+    max_score: float | None = None
+    last_score: float | None = None
+    expected_gain: float              # (max_avg_score - avg_score) * total_feedback
+
+class PaginatedCandidates(BaseModel):
+    items: list[OptimizationCandidate]
+    total: int | None = None          # None when the client asked for total=none
+    offset: int
+    limit: int
+    min_samples: int
+    max_avg_score: float
@@ -1,11 +1,12 @@
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 # ----------   POST /prompts/{id}/instances   ----------
 class PromptInstanceCreate(BaseModel):
     formatted_text: str = Field(..., min_length=1, max_length=50_000)
     context: dict | None = None            # any extra metadata
+    version: int | None = Field(None, ge=1)  # pin to an older version; default: current head
 
 
 # ----------   POST /instances/{id}/responses ----------
@@ -18,29 +19,39 @@ class ResponseCreate(BaseModel):
 class PromptInstanceOut(BaseModel):
     id: str
     prompt_id: str
+    prompt_version_id: str | None = None
     formatted_text: str
     context: dict | None
     created_at: datetime
 
 
 class ResponseOut(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
     id: str
     prompt_instance_id: str
     content: str
     metadata: dict | None = Field(None, alias="response_metadata")
     created_at: datetime
 
+    @field_validator("metadata", mode="before")
+    @classmethod
+    def _empty_metadata(cls, v):
+        return v or {}          # responses without metadata have always read back as {}
+
 
 # ----------   Pagination wrappers   ------------------
 class PaginatedInstances(BaseModel):
     items: list[PromptInstanceOut]
-    total: int
+    total: int | None = None          # None when the client asked for total=none
     offset: int
     limit: int
+    next_cursor: str | None = None
 
 
 class PaginatedResponses(BaseModel):
     items: list[ResponseOut]
-    total: int
+    total: int | None = None          # None when the client asked for total=none
     offset: int
     limit: int
+    next_cursor: str | None = None
@@ -0,0 +1,24 @@
+import json
+from datetime import datetime
+from pydantic import BaseModel, field_validator
+
+# ----------   POST /prompts/{id}/optimize   ----------
+class OptimizeRequest(BaseModel):
+    strategy: str | None = None       # defaults to Config.OPTIMIZATION_STRATEGY
+
+# ----------   DTO   ----------
+class JobOut(BaseModel):
+    id: str
+    prompt_id: str
+    status: str
+    strategy: str
+    progress: int
+    result: dict | None = None        # {"prompt_id", "version"} of the new version once completed
+    error_message: str | None = None
+    created_at: datetime
+    completed_at: datetime | None = None
+
+    @field_validator("result", mode="before")
+    @classmethod
+    def _parse_result(cls, v):
+        return json.loads(v) if isinstance(v, str) else v
@@ -12,6 +12,7 @@ class PromptOut(BaseModel):
     id: str
     text: str
     version: int
+    parent_id: str | None = None
     description: str | None
     created_at: datetime
     updated_at: datetime
@@ -22,6 +23,48 @@ class PromptUpdate(BaseModel):
 
 class PaginatedPrompts(BaseModel):
     items: list[PromptOut]
-    total: int
+    total: int | None = None          # None when the client asked for total=none
     offset: int
-    limit: int
\ No newline at end of file
+    limit: int
+    next_cursor: str | None = None
+
+# ---------- Versions / A/B comparison ----------
+class PromptVersionOut(BaseModel):
+    id: str
+    version: int
+    text: str
+    created_at: datetime
+    feedback_count: int               # feedback attributed to this exact text
+
+class VersionSummary(BaseModel):
+    version: int
+    version_id: str
+    count: int
+    avg_score: float | None = None
+    stddev: float | None = None
+    p50: float | None = None
+    p90: float | None = None
+    min_score: float | None = None
+    max_score: float | None = None
+
+class WelchTest(BaseModel):
+    t: float | None = None            # None with fewer than 2 samples per side
+    df: float | None = None
+    p_value: float | None = None
+
+class BootstrapResult(BaseModel):
+    iterations: int
+    ci_low: float | None = None       # CI of mean(b) - mean(a)
+    ci_high: float | None = None
+    prob_b_better: float | None = None
+
+class VersionComparison(BaseModel):
+    prompt_id: str
+    a: VersionSummary
+    b: VersionSummary
+    difference: float | None = None   # mean(b) - mean(a)
+    welch: WelchTest
+    bootstrap: BootstrapResult
+    alpha: float
+    significant: bool
+    winner: str | None = None         # "a" / "b" when significant
@@ -0,0 +1,168 @@
+# src/api/timing.py
+"""
+Request timing: where did a slow request spend its time?
+
+* `TimingMiddleware` (pure ASGI, outermost) times the whole request,
+  opens a `query_stats.track()` block for its SQL, records everything in
+  `src.services.metrics` and – with SERVER_TIMING=true – adds a
+  `Server-Timing: db;dur=…, serialize;dur=…, total;dur=…` header that
+  browser dev tools display per request.
+* `TimedRoute` (every router's `route_class`) names the route template for
+  the metrics labels and splits off serialization: the time from the
+  endpoint function returning to the response being built, i.e.
+  response_model validation plus JSON encoding.  It also labels the
+  request's `QueryStats` with the route, for the slow-query log, and sends
+  a returned `APIResponse` down the one-pass path in src/api/responses.py.
+  The request's unit of work (src/database/unit_of_work.py) is committed
+  as part of the endpoint – its time counts as db, not serialize.
+* `observe_requests()` subscribes to finished requests with their SQL
+  statements – the `query_budget` test fixture uses it.
+"""
+import asyncio
+import functools
+import time
+from contextvars import ContextVar
+from typing import Callable, List, Optional
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from src.api.responses import api_response
+from src.api.schemas.base import APIResponse
+from src.config import Config
+from src.database import query_stats, unit_of_work
+from src.services.metrics import metrics
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestTiming:
+    __slots__ = ("route", "endpoint_end", "serialize")
+
+    def __init__(self):
+        self.route: Optional[str] = None
+        self.endpoint_end: Optional[float] = None
+        self.serialize = 0.0
+
+
+_timing: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def current_route() -> Optional[str]:
+    timing = _timing.get()
+    return timing.route if timing is not None else None
+
+
+RequestObserver = Callable[[str, str, int, query_stats.QueryStats], None]
+_observers: List[RequestObserver] = []
+
+
+def observe_requests(callback: RequestObserver) -> Callable[[], None]:
+    """Call `callback(method, route, status, sql)` after every request until
+    the returned function is called.  Statements are recorded (`sql.statements`)
+    only while somebody is observing."""
+    _observers.append(callback)
+    return lambda: _observers.remove(callback)
+
+
+def _mark_endpoint_end():
+    timing = _timing.get()
+    if timing is not None:
+        timing.endpoint_end = time.perf_counter()
+
+
+class TimedRoute(APIRoute):
+    def _finish(self, result, kwargs):
+        # the exclude/alias options need FastAPI's own serialize_response
+        if isinstance(result, APIResponse) and not (
+            self.response_model_include or self.response_model_exclude
+            or self.response_model_exclude_unset or self.response_model_exclude_defaults
+            or self.response_model_exclude_none
+        ):
+            sub_response = kwargs.get(self.dependant.response_param_name or "")
+            return api_response(result, self.status_code or 200, sub_response)
+        return result
+
+    def get_route_handler(self):
+        call = self.dependant.call
+        if not getattr(call, "_timed", False):
+            if asyncio.iscoroutinefunction(call):
+                @functools.wraps(call)
+                async def timed(*args, **kwargs):
+                    try:
+                        result = await call(*args, **kwargs)
+                        await unit_of_work.commit_current()
+                    except BaseException:
+                        await unit_of_work.rollback_current()
+                        raise
+                    finally:
+                        _mark_endpoint_end()
+                    return self._finish(result, kwargs)
+            else:                       # stays sync, so FastAPI still uses the threadpool
+                @functools.wraps(call)
+                def timed(*args, **kwargs):
+                    try:
+                        result = call(*args, **kwargs)
+                    finally:
+                        _mark_endpoint_end()
+                    return self._finish(result, kwargs)
+            timed._timed = True
+            self.dependant.call = timed
+        handler = super().get_route_handler()
+        route = self.path_format
+
+        async def timed_handler(request):
+            timing = _timing.get()
+            if timing is None:
+                return await handler(request)
+            timing.route = route
+            sql = query_stats.current()
+            if sql is not None:
+                sql.label = f"{request.method} {route}"
+            response = await handler(request)
+            if timing.endpoint_end is not None:
+                timing.serialize = time.perf_counter() - timing.endpoint_end
+            return response
+
+        return timed_handler
+
+
+def server_timing(sql: query_stats.QueryStats, timing: RequestTiming, total: float) -> str:
+    return (f'db;dur={sql.duration * 1000:.2f};desc="{sql.count} queries", '
+            f"serialize;dur={timing.serialize * 1000:.2f}, total;dur={total * 1000:.2f}")
+
+
+class TimingMiddleware:
+    def __init__(self, app, server_timing_header: Optional[bool] = None):
+        self.app = app
+        self.server_timing_header = server_timing_header     # None: follow Config.SERVER_TIMING
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        timing = RequestTiming()
+        token = _timing.set(timing)
+        status = 500
+        add_header = (Config.SERVER_TIMING if self.server_timing_header is None
+                      else self.server_timing_header)
+        with query_stats.track(record=bool(_observers)) as sql:
+            async def send_wrapper(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    if add_header:
+                        MutableHeaders(scope=message).append(
+                            "Server-Timing", server_timing(sql, timing, time.perf_counter() - start))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                _timing.reset(token)
+                route = timing.route or UNMATCHED_ROUTE
+                metrics.observe_request(
+                    scope["method"], route, status,
+                    time.perf_counter() - start, sql.count, sql.duration, timing.serialize,
+                )
+                for observer in list(_observers):
+                    observer(scope["method"], route, status, sql)
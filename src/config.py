@@ -7,3 +7,47 @@ class Config:
     DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://localhost/promptcraft")
     REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+
+    # Connection pool (one engine per database URL for the app lifetime)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+    # Read-through cache for prompts / stats: memory | redis | none
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+    CACHE_TTL = float(os.getenv("CACHE_TTL", "30"))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+
+    # Optimization jobs
+    OPTIMIZATION_STRATEGY = os.getenv("OPTIMIZATION_STRATEGY", "stub")
+    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+    JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+
+    # Feedback writes: sync | group | buffered (see src/services/feedback_buffer.py)
+    FEEDBACK_WRITE_MODE = os.getenv("FEEDBACK_WRITE_MODE", "sync").lower()
+    FEEDBACK_FLUSH_INTERVAL_MS = float(os.getenv("FEEDBACK_FLUSH_INTERVAL_MS", "50"))
+    FEEDBACK_FLUSH_MAX_ROWS = int(os.getenv("FEEDBACK_FLUSH_MAX_ROWS", "500"))
+    FEEDBACK_QUEUE_SIZE = int(os.getenv("FEEDBACK_QUEUE_SIZE", "10000"))
+    FEEDBACK_ENQUEUE_TIMEOUT = float(os.getenv("FEEDBACK_ENQUEUE_TIMEOUT", "0.1"))
+    # A failed flush is retried this many times with doubling backoff; buffered scores that
+    # still can't be written are spilled to JSONL files here and replayed later
+    FEEDBACK_FLUSH_RETRIES = int(os.getenv("FEEDBACK_FLUSH_RETRIES", "5"))
+    FEEDBACK_RETRY_BACKOFF_MS = float(os.getenv("FEEDBACK_RETRY_BACKOFF_MS", "100"))
+    FEEDBACK_SPILL_DIR = os.getenv("FEEDBACK_SPILL_DIR", "feedback_spill")
+
+    # GET /admin/export streams whole tables (all prompt / response text) – off unless enabled
+    ADMIN_EXPORT_ENABLED = os.getenv("ADMIN_EXPORT_ENABLED", "false").lower() == "true"
+
+    # Instrumentation: add a Server-Timing header (db / serialize / total) to every response
+    SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() == "true"
+    # Log SQL statements slower than this (ms) with their route; 0 = off
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+
+    # Text blobs (src/services/blobs.py): zlib-compress texts from this many UTF-8 bytes up,
+    # and keep this many bytes of hot decoded text in each process's LRU
+    BLOB_COMPRESS_MIN_BYTES = int(os.getenv("BLOB_COMPRESS_MIN_BYTES", "256"))
+    BLOB_CACHE_BYTES = int(os.getenv("BLOB_CACHE_BYTES", str(16 * 1024 * 1024)))
@@ -0,0 +1,69 @@
+# src/database/async_database.py
+"""
+asyncio counterpart of `DatabaseManager`, used by the async services and
+routers.  The same DATABASE_URL is accepted; the driver is swapped for its
+async flavour (asyncpg for Postgres, aiosqlite for SQLite).
+"""
+from contextlib import asynccontextmanager
+import os
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from src.database.database import create_missing_indexes
+from src.database.pool import engine_options
+from src.models.models import Base
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(database_url: str) -> str:
+    """postgresql://… → postgresql+asyncpg://…, sqlite:///… → sqlite+aiosqlite:///…"""
+    url = make_url(database_url)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None or url.get_driver_name() in ("asyncpg", "aiosqlite"):
+        return url.render_as_string(hide_password=False)
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+class AsyncDatabaseManager:
+    def __init__(self, database_url: str = None):
+        database_url = database_url or os.getenv('DATABASE_URL')
+        if not database_url:
+            raise ValueError("DATABASE_URL environment variable is required")
+        self.database_url = to_async_url(database_url)
+
+        self.engine = create_async_engine(
+            self.database_url,
+            echo=False,
+            **engine_options(self.database_url, is_async=True),
+        )
+        self.SessionLocal = async_sessionmaker(
+            autoflush=False,
+            expire_on_commit=False,
+            bind=self.engine,
+        )
+
+    async def create_tables(self):
+        """Create all tables if they don't exist"""
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(create_missing_indexes)
+
+    async def dispose(self):
+        """Close every pooled connection (called on app shutdown)"""
+        await self.engine.dispose()
+
+    @asynccontextmanager
+    async def get_session(self):
+        """Get an AsyncSession that commits on success and rolls back on error"""
+        session = self.SessionLocal()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
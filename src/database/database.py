@@ -1,9 +1,31 @@
 # src/database/database.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 import os
+from src.database.pool import engine_options
 from src.models.models import Base, Prompt, PromptInstance, Response, Feedback, OptimizationJob
+from src.services import blobs, reads
+from src.services.versions import head_version_id, snapshot
+
+# replaced by composite indexes in __table_args__ (schema.sql drops the same ones)
+SUPERSEDED_INDEXES = (
+    "idx_prompt_instances_prompt_id",
+    "idx_responses_prompt_instance_id",
+    "idx_feedback_response_id",
+    "idx_feedback_created_at",
+)
+
+def create_missing_indexes(bind):
+    """create_all only indexes tables it creates – add new indexes to old tables
+    too, and drop the ones they replace"""
+    with bind.begin() if isinstance(bind, Engine) else nullcontext(bind) as conn:
+        for name in SUPERSEDED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
 
 class DatabaseManager:
     def __init__(self, database_url: str = None):
@@ -11,7 +33,9 @@ class DatabaseManager:
         if not self.database_url:
             raise ValueError("DATABASE_URL environment variable is required")
         
-        self.engine = create_engine(self.database_url, echo=False)
+        self.engine = create_engine(
+            self.database_url, echo=False, **engine_options(self.database_url)
+        )
         self.SessionLocal = sessionmaker(
             autocommit=False,
             autoflush=False,
@@ -23,11 +47,16 @@ class DatabaseManager:
         """Create all tables if they don't exist"""
         try:
             Base.metadata.create_all(bind=self.engine)
+            create_missing_indexes(self.engine)
             print("✅ Database tables created successfully")
         except Exception as e:
             print(f"❌ Error creating tables: {e}")
             raise
     
+    def dispose(self):
+        """Close every pooled connection (called on app shutdown)"""
+        self.engine.dispose()
+
     @contextmanager
     def get_session(self):
         """Get a database session with automatic cleanup"""
@@ -56,8 +85,9 @@ class Database:
         with self.db_manager.get_session() as session:
             prompt = Prompt(text=text, description=description)
             session.add(prompt)
-            session.commit()  # Commit to get the ID
-            session.refresh(prompt)  # Refresh to get all data
+            session.flush()
+            session.add(snapshot(prompt))
+            session.commit()
             
             # Create a detached copy to return
             prompt_dict = prompt.to_dict()
@@ -73,21 +103,19 @@ class Database:
                 session.expunge(prompt)  # Detach from session
             return prompt
     
-    def list_prompts(self, limit: int = 50, offset: int = 0) -> list[Prompt]:
+    def list_prompts(self, limit: int = 50, offset: int = 0) -> list[reads.PromptRow]:
+        # plain rows – nothing to load or detach
         with self.db_manager.get_session() as session:
-            prompts = session.query(Prompt).offset(offset).limit(limit).all()
-            # Detach all objects from session
-            for prompt in prompts:
-                _ = prompt.to_dict()  # Force attribute loading
-                session.expunge(prompt)
-            return prompts
+            q, row_type = reads.select_rows(reads.PromptRow)
+            return reads.rows(session.execute(q.offset(offset).limit(limit)), row_type)
     
     # Instance operations
-    def create_instance(self, prompt_id: str, formatted_text: str, context: str = None) -> PromptInstance:
+    def create_instance(self, prompt_id: str, formatted_text: str, context: dict = None) -> PromptInstance:
         with self.db_manager.get_session() as session:
             instance = PromptInstance(
                 prompt_id=prompt_id,
-                formatted_text=formatted_text,
+                prompt_version_id=head_version_id(prompt_id),
+                formatted_text_hash=blobs.store(session, [formatted_text])[0],
                 context=context
             )
             session.add(instance)
@@ -112,12 +140,11 @@ class Database:
         with self.db_manager.get_session() as session:
             response = Response(
                 prompt_instance_id=prompt_instance_id,
-                content=content,
+                content_hash=blobs.store(session, [content])[0],
                 metadata=metadata
             )
             session.add(response)
             session.commit()
-            session.refresh(response)
             
             # Detach from session
             _ = response.to_dict()
@@ -138,7 +165,6 @@ class Database:
             feedback = Feedback(response_id=response_id, score=score)
             session.add(feedback)
             session.commit()
-            session.refresh(feedback)
             
             # Detach from session
             _ = feedback.to_dict()
@@ -158,13 +184,14 @@ class Database:
                 PromptInstance.prompt_id == prompt_id
             ).all()
             
+            texts = blobs.load(session, {h for _, r, i in results for h in (r.content_hash, i.formatted_text_hash)})
             feedback_list = []
             for feedback, response, instance in results:
                 # Convert to dict immediately while session is active
                 feedback_list.append({
                     'feedback': feedback.to_dict(),
-                    'response': response.to_dict(),
-                    'instance': instance.to_dict()
+                    'response': {**response.to_dict(), 'content': texts[response.content_hash]},
+                    'instance': {**instance.to_dict(), 'formatted_text': texts[instance.formatted_text_hash]}
                 })
             
             return feedback_list
\ No newline at end of file
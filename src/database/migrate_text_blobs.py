@@ -0,0 +1,119 @@
+# src/database/migrate_text_blobs.py
+"""
+One-off move of inline `prompt_instances.formatted_text` and
+`responses.content` into text_blobs (src/services/blobs.py).
+
+    python -m src.database.migrate_text_blobs [--database-url URL] [--batch-size N] [--dry-run]
+
+Creates text_blobs and the `*_hash` columns, then fills them in batches of
+`--batch-size` rows, one transaction per batch – so it can be stopped and
+re-run, and picks up where it left off.  When a table is done its hash
+column becomes NOT NULL (Postgres; SQLite can't add that to a column) and
+the text column is dropped.  Dropping doesn't shrink the table: run
+VACUUM FULL (Postgres) or VACUUM (SQLite) afterwards to get the space back.
+"""
+import argparse
+from sqlalchemy import inspect, text
+from src.database.database import DatabaseManager
+from src.models.models import TextBlob
+from src.services import blobs
+
+# table → (inline text column, hash column)
+TEXT_COLUMNS = {
+    "prompt_instances": ("formatted_text", "formatted_text_hash"),
+    "responses": ("content", "content_hash"),
+}
+
+
+def pending(conn) -> dict:
+    """table → rows still holding inline text, for tables not migrated yet."""
+    insp = inspect(conn)
+    out = {}
+    for table, (text_col, hash_col) in TEXT_COLUMNS.items():
+        if table not in insp.get_table_names():
+            continue
+        columns = {c["name"] for c in insp.get_columns(table)}
+        if text_col not in columns:
+            continue
+        where = f'WHERE "{hash_col}" IS NULL' if hash_col in columns else ""
+        out[table] = conn.execute(text(f'SELECT count(*) FROM "{table}" {where}')).scalar()
+    return out
+
+
+def _add_hash_column(conn, table: str, hash_col: str):
+    if hash_col not in {c["name"] for c in inspect(conn).get_columns(table)}:
+        conn.execute(text(f'ALTER TABLE "{table}" ADD COLUMN "{hash_col}" VARCHAR(32) '
+                          f'REFERENCES text_blobs(hash)'))
+
+
+def _move_batch(conn, table: str, text_col: str, hash_col: str, batch_size: int) -> int:
+    rows = conn.execute(text(
+        f'SELECT id, "{text_col}" FROM "{table}" WHERE "{hash_col}" IS NULL LIMIT :n'),
+        {"n": batch_size}).all()
+    if not rows:
+        return 0
+    encoded, updates = {}, []
+    for row_id, value in rows:
+        blob = blobs.encode(value)
+        encoded.setdefault(blob["hash"], blob)
+        updates.append({"h": blob["hash"], "row_id": row_id})
+    conn.execute(blobs.insert_stmt(conn.dialect.name), list(encoded.values()))
+    conn.execute(text(f'UPDATE "{table}" SET "{hash_col}" = :h WHERE id = :row_id'), updates)
+    return len(rows)
+
+
+def _finish(conn, table: str, text_col: str, hash_col: str):
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(f'ALTER TABLE "{table}" ALTER COLUMN "{hash_col}" SET NOT NULL'))
+    conn.execute(text(f'ALTER TABLE "{table}" DROP COLUMN "{text_col}"'))
+
+
+def migrate(engine, batch_size: int = 5000, progress=print) -> dict:
+    """Returns table → rows moved."""
+    TextBlob.__table__.create(engine, checkfirst=True)
+    moved = {}
+    with engine.connect() as conn:
+        tables = list(pending(conn))
+    for table in tables:
+        text_col, hash_col = TEXT_COLUMNS[table]
+        with engine.begin() as conn:
+            _add_hash_column(conn, table, hash_col)
+        moved[table] = 0
+        while True:
+            with engine.begin() as conn:
+                n = _move_batch(conn, table, text_col, hash_col, batch_size)
+            if not n:
+                break
+            moved[table] += n
+            progress(f"  {table}: {moved[table]} rows")
+        with engine.begin() as conn:
+            _finish(conn, table, text_col, hash_col)
+    return moved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move instance / response text into text_blobs")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--dry-run", action="store_true", help="count the rows to move, change nothing")
+    args = parser.parse_args()
+    manager = DatabaseManager(args.database_url)
+    try:
+        if args.dry_run:
+            with manager.engine.connect() as conn:
+                todo = pending(conn)
+            for table, n in todo.items():
+                print(f"{table}: {n} row(s) to move")
+            print("✅ already migrated" if not todo else "ℹ️  dry run – nothing changed")
+            return
+        moved = migrate(manager.engine, batch_size=args.batch_size)
+        if not moved:
+            print("✅ already migrated")
+            return
+        print(f"✅ moved {sum(moved.values())} row(s); run VACUUM FULL / VACUUM to reclaim the space")
+    finally:
+        manager.dispose()
+
+
+if __name__ == "__main__":
+    main()
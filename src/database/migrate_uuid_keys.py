@@ -0,0 +1,117 @@
+# src/database/migrate_uuid_keys.py
+"""
+One-off migration of VARCHAR(36) id / foreign-key columns to native
+`uuid` on Postgres (see src/models/ids.py).
+
+    python -m src.database.migrate_uuid_keys [--database-url URL] [--dry-run]
+
+Runs in a single transaction: drops the foreign keys that touch id
+columns, converts every GUID column with `USING col::uuid`, then puts the
+foreign keys back unchanged.  Existing v4 ids stay valid – new rows just
+get v7 ones.  Idempotent; a no-op on SQLite, where ids stay text.
+"""
+import argparse
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects import postgresql
+from src.database.database import DatabaseManager
+from src.models.ids import GUID
+from src.models.models import Base
+
+UUID_PATTERN = "^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+
+
+def guid_columns() -> dict:
+    """table name → [column names] declared as GUID in the models."""
+    out = {}
+    for table in Base.metadata.sorted_tables:
+        cols = [c.name for c in table.columns if isinstance(c.type, GUID)]
+        if cols:
+            out[table.name] = cols
+    return out
+
+
+def plan(conn) -> tuple[list, list, list]:
+    """(foreign keys to drop/recreate, (table, column) to convert, bad-value problems)"""
+    insp = inspect(conn)
+    targets = guid_columns()
+    existing = set(insp.get_table_names())
+    to_convert, problems = [], []
+    for table, cols in targets.items():
+        if table not in existing:
+            continue
+        types = {c["name"]: c["type"] for c in insp.get_columns(table)}
+        for col in cols:
+            if col in types and not isinstance(types[col], postgresql.UUID):
+                to_convert.append((table, col))
+                bad = conn.execute(text(
+                    f'SELECT count(*) FROM "{table}" WHERE "{col}" IS NOT NULL '
+                    f'AND "{col}" !~ :pattern'), {"pattern": UUID_PATTERN}).scalar()
+                if bad:
+                    problems.append(f"{table}.{col}: {bad} value(s) are not UUIDs")
+    converting = set(to_convert)
+    fks = []
+    for table in targets:
+        if table not in existing:
+            continue
+        for fk in insp.get_foreign_keys(table):
+            local = {(table, c) for c in fk["constrained_columns"]}
+            remote = {(fk["referred_table"], c) for c in fk["referred_columns"]}
+            if (local | remote) & converting:
+                fks.append((table, fk))
+    return fks, to_convert, problems
+
+
+def _add_fk_sql(table: str, fk: dict) -> str:
+    cols = ", ".join(f'"{c}"' for c in fk["constrained_columns"])
+    refs = ", ".join(f'"{c}"' for c in fk["referred_columns"])
+    sql = (f'ALTER TABLE "{table}" ADD CONSTRAINT "{fk["name"]}" FOREIGN KEY ({cols}) '
+           f'REFERENCES "{fk["referred_table"]}" ({refs})')
+    ondelete = (fk.get("options") or {}).get("ondelete")
+    return f"{sql} ON DELETE {ondelete}" if ondelete else sql
+
+
+def migration_sql(fks: list, to_convert: list) -> list[str]:
+    return (
+        [f'ALTER TABLE "{table}" DROP CONSTRAINT "{fk["name"]}"' for table, fk in fks]
+        + [f'ALTER TABLE "{table}" ALTER COLUMN "{col}" TYPE uuid USING "{col}"::uuid'
+           for table, col in to_convert]
+        + [_add_fk_sql(table, fk) for table, fk in fks]
+    )
+
+
+def migrate(engine, dry_run: bool = False) -> list[str]:
+    """Returns the statements run (or that would run with dry_run)."""
+    if engine.dialect.name != "postgresql":
+        return []
+    with engine.begin() as conn:
+        fks, to_convert, problems = plan(conn)
+        if problems:
+            raise ValueError("Cannot convert to uuid:\n  " + "\n  ".join(problems))
+        statements = migration_sql(fks, to_convert)
+        if not dry_run:
+            for sql in statements:
+                conn.execute(text(sql))
+    return statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert id columns to native uuid (Postgres)")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--dry-run", action="store_true", help="print the SQL, change nothing")
+    args = parser.parse_args()
+    manager = DatabaseManager(args.database_url)
+    try:
+        if manager.engine.dialect.name != "postgresql":
+            print("ℹ️  not Postgres – ids stay VARCHAR(36), nothing to do")
+            return
+        statements = migrate(manager.engine, dry_run=args.dry_run)
+        for sql in statements:
+            print(f"{sql};")
+        verb = "would run" if args.dry_run else "ran"
+        print(f"✅ {verb} {len(statements)} statement(s)" if statements else "✅ already migrated")
+    finally:
+        manager.dispose()
+
+
+if __name__ == "__main__":
+    main()
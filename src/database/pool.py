@@ -0,0 +1,117 @@
+# src/database/pool.py
+"""
+Connection-pool settings and checkout metrics.
+
+Every engine the app builds goes through `engine_options()`, so pool size,
+overflow, pre-ping and recycle all come from `Config`.  The pool classes
+below are the stock SQLAlchemy ones plus a timer around `connect()` so we
+can see how long requests wait for a connection when sizing the pool.
+"""
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from src.config import Config
+
+
+class PoolMetrics:
+    """Thread-safe counters for one engine's pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_checkout(self, waited: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_total_ms": round(self.wait_total * 1000, 3),
+                "wait_avg_ms": round(self.wait_total * 1000 / self.checkouts, 3)
+                if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+class _TimedPoolMixin:
+    """Times every `connect()` (queue wait + pre-ping) into `self.metrics`."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool – keep the counters
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            **self.metrics.snapshot(),
+        }
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(database_url: str, is_async: bool = False) -> dict:
+    """
+    Keyword arguments for `create_engine` / `create_async_engine`.
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool.
+    """
+    url = make_url(database_url)
+    if _is_memory_sqlite(url):
+        return {}
+    return {
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_size": Config.DB_POOL_SIZE,
+        "max_overflow": Config.DB_MAX_OVERFLOW,
+        "pool_timeout": Config.DB_POOL_TIMEOUT,
+        "pool_recycle": Config.DB_POOL_RECYCLE,
+        "pool_pre_ping": Config.DB_POOL_PRE_PING,
+    }
+
+
+def pool_stats(engine) -> dict:
+    pool = engine.pool
+    if isinstance(pool, _TimedPoolMixin):
+        return pool.stats()
+    return {"status": pool.status()}
@@ -0,0 +1,133 @@
+# src/database/query_stats.py
+"""
+Per-request SQL statement counters, query budgets and the slow-query log.
+
+`install()` hooks `before_cursor_execute` / `after_cursor_execute` on every
+Engine (sync engines and the ones behind AsyncEngine alike); each
+statement is timed and added to the `QueryStats` of the current
+`track()` block, as are connection checkouts and commits.  The block
+lives in a ContextVar, which SQLAlchemy carries
+into the greenlets that run async drivers, so concurrent requests never
+see each other's counts.  Statements outside a `track()` block cost one
+ContextVar lookup.
+
+* `query_budget(n)` – fail (QueryBudgetExceeded) when the block runs more
+  than n statements; the message lists them, repeats (N+1s) first.  For
+  API calls see the `query_budget` fixture in src/tests/conftest.py.
+* SLOW_QUERY_MS > 0 – log every statement slower than that, with the
+  route it ran for (`QueryStats.label`).
+"""
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    __slots__ = ("count", "duration", "checkouts", "commits", "statements", "label")
+
+    def __init__(self, record: bool = False, label: Optional[str] = None):
+        self.count = 0
+        self.duration = 0.0       # seconds spent in cursor.execute / executemany
+        self.checkouts = 0        # connections taken from the pool
+        self.commits = 0
+        self.statements: Optional[list] = [] if record else None
+        self.label = label        # route (set by src/api/timing.py) for log lines
+
+    def report(self, limit: int = 20) -> str:
+        """Statements by frequency – an N+1 shows up as one line with a big count."""
+        if not self.statements:
+            return f"{self.count} statements (not recorded)"
+        lines = [f"{n:>4} × {' '.join(sql.split())[:300]}"
+                 for sql, n in Counter(self.statements).most_common(limit)]
+        return f"{self.count} statements:\n" + "\n".join(lines)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_installed = False
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def track(record: bool = False, label: Optional[str] = None) -> Iterator[QueryStats]:
+    """Count (and with record=True keep) the statements run inside the block."""
+    stats = QueryStats(record, label)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def check_budget(stats: QueryStats, max_statements: int, what: str = "block"):
+    if stats.count > max_statements:
+        raise QueryBudgetExceeded(
+            f"{what} ran {stats.count} SQL statements, budget is {max_statements}\n{stats.report()}"
+        )
+
+
+@contextmanager
+def query_budget(max_statements: int, what: str = "block") -> Iterator[QueryStats]:
+    """Assert the code inside runs at most `max_statements` statements."""
+    with track(record=True) as stats:
+        yield stats
+    check_budget(stats, max_statements, what)
+
+
+def _before(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _after(conn, cursor, statement, parameters, context, executemany):
+    if context is None:
+        return
+    elapsed = time.perf_counter() - getattr(context, "_query_start", time.perf_counter())
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+        if stats.statements is not None:
+            stats.statements.append(statement)
+    if Config.SLOW_QUERY_MS and elapsed * 1000 >= Config.SLOW_QUERY_MS:
+        logger.warning("slow query %.1f ms [%s]: %s", elapsed * 1000,
+                       stats.label if stats is not None and stats.label else "-",
+                       " ".join(statement.split())[:1000])
+
+
+def _checkout(dbapi_connection, connection_record, connection_proxy):
+    stats = _current.get()
+    if stats is not None:
+        stats.checkouts += 1
+
+
+def _commit(conn):
+    stats = _current.get()
+    if stats is not None:
+        stats.commits += 1
+
+
+def install():
+    """Attach the listeners to the Engine class (idempotent)."""
+    global _installed
+    if not _installed:
+        event.listen(Engine, "before_cursor_execute", _before)
+        event.listen(Engine, "after_cursor_execute", _after)
+        event.listen(Engine, "commit", _commit)
+        event.listen(Pool, "checkout", _checkout)
+        _installed = True
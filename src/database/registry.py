@@ -0,0 +1,71 @@
+# src/database/registry.py
+"""
+Process-wide registry of `Database` / `AsyncDatabaseManager` objects, one
+per database URL.
+
+Routers used to build a new `Database` (and therefore a new engine and
+pool) on every request.  The registry hands out the same instance for the
+lifetime of the app; `main.py` warms it on startup and disposes it on
+shutdown.
+"""
+import os
+import threading
+from typing import Dict
+from src.database.async_database import AsyncDatabaseManager
+from src.database.database import Database
+from src.database.pool import pool_stats
+
+
+class EngineRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._databases: Dict[str, Database] = {}
+        self._async_databases: Dict[str, AsyncDatabaseManager] = {}
+
+    def get(self, database_url: str = None) -> Database:
+        url = database_url or os.getenv("DATABASE_URL")
+        db = self._databases.get(url)
+        if db is None:
+            with self._lock:
+                db = self._databases.get(url)
+                if db is None:
+                    db = Database(url)
+                    self._databases[url] = db
+        return db
+
+    def get_async(self, database_url: str = None) -> AsyncDatabaseManager:
+        url = database_url or os.getenv("DATABASE_URL")
+        db = self._async_databases.get(url)
+        if db is None:
+            with self._lock:
+                db = self._async_databases.get(url)
+                if db is None:
+                    db = AsyncDatabaseManager(url)
+                    self._async_databases[url] = db
+        return db
+
+    def dispose_all(self):
+        with self._lock:
+            databases, self._databases = self._databases, {}
+        for db in databases.values():
+            db.db_manager.dispose()
+
+    async def dispose_all_async(self):
+        """Dispose sync and async engines – async pools must be awaited."""
+        self.dispose_all()
+        with self._lock:
+            databases, self._async_databases = self._async_databases, {}
+        for db in databases.values():
+            await db.dispose()
+
+    def stats(self) -> dict:
+        """Pool metrics per engine, keyed by URL with the password masked."""
+        engines = [db.db_manager.engine for db in list(self._databases.values())]
+        engines += [db.engine.sync_engine for db in list(self._async_databases.values())]
+        return {
+            engine.url.render_as_string(hide_password=True): pool_stats(engine)
+            for engine in engines
+        }
+
+
+registry = EngineRegistry()
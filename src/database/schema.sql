@@ -1,59 +1,143 @@
 -- src/database/schema.sql
 -- Run this file to create the database schema
+-- Ids are UUIDv7 in native uuid columns (src/models/ids.py); databases
+-- created with VARCHAR(36) ids: python -m src.database.migrate_uuid_keys
 
 -- Prompts table
 CREATE TABLE IF NOT EXISTS prompts (
-    id VARCHAR(36) PRIMARY KEY,
+    id UUID PRIMARY KEY,
     text TEXT NOT NULL,
     version INTEGER NOT NULL DEFAULT 1,
     description TEXT,
-    parent_id VARCHAR(36) REFERENCES prompts(id),
+    parent_id UUID REFERENCES prompts(id),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Immutable text of every prompt version (prompts holds the head);
+-- prompts created before this table: python -m src.services.versions
+CREATE TABLE IF NOT EXISTS prompt_versions (
+    id UUID PRIMARY KEY,
+    prompt_id UUID NOT NULL REFERENCES prompts(id) ON DELETE CASCADE,
+    version INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_prompt_versions_prompt_version UNIQUE (prompt_id, version)
+);
+
+-- Instance / response text, once per distinct value (src/services/blobs.py);
+-- databases with inline formatted_text / content: python -m src.database.migrate_text_blobs
+CREATE TABLE IF NOT EXISTS text_blobs (
+    hash VARCHAR(32) PRIMARY KEY,
+    codec VARCHAR(8) NOT NULL,
+    size INTEGER NOT NULL,
+    data BYTEA NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+-- zlib'ed already: keep TOAST from trying pglz on it again
+ALTER TABLE text_blobs ALTER COLUMN data SET STORAGE EXTERNAL;
+
 -- Prompt instances table
 CREATE TABLE IF NOT EXISTS prompt_instances (
-    id VARCHAR(36) PRIMARY KEY,
-    prompt_id VARCHAR(36) NOT NULL REFERENCES prompts(id) ON DELETE CASCADE,
-    formatted_text TEXT NOT NULL,
-    context TEXT,
+    id UUID PRIMARY KEY,
+    prompt_id UUID NOT NULL REFERENCES prompts(id) ON DELETE CASCADE,
+    prompt_version_id UUID REFERENCES prompt_versions(id),
+    formatted_text_hash VARCHAR(32) NOT NULL REFERENCES text_blobs(hash),
+    context JSONB,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Responses table
 CREATE TABLE IF NOT EXISTS responses (
-    id VARCHAR(36) PRIMARY KEY,
-    prompt_instance_id VARCHAR(36) NOT NULL REFERENCES prompt_instances(id) ON DELETE CASCADE,
-    content TEXT NOT NULL,
-    response_metadata TEXT,
+    id UUID PRIMARY KEY,
+    prompt_instance_id UUID NOT NULL REFERENCES prompt_instances(id) ON DELETE CASCADE,
+    content_hash VARCHAR(32) NOT NULL REFERENCES text_blobs(hash),
+    response_metadata JSONB,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Feedback table
 CREATE TABLE IF NOT EXISTS feedback (
-    id VARCHAR(36) PRIMARY KEY,
-    response_id VARCHAR(36) NOT NULL REFERENCES responses(id) ON DELETE CASCADE,
+    id UUID PRIMARY KEY,
+    response_id UUID NOT NULL REFERENCES responses(id) ON DELETE CASCADE,
     score DECIMAL(3,2) NOT NULL CHECK (score >= 0.0 AND score <= 1.0),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Per-prompt feedback rollup (kept in sync by the feedback writers,
+-- rebuild with `python -m src.services.stats_rollup`)
+CREATE TABLE IF NOT EXISTS prompt_feedback_stats (
+    prompt_id UUID PRIMARY KEY REFERENCES prompts(id) ON DELETE CASCADE,
+    count INTEGER NOT NULL DEFAULT 0,
+    score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    score_sum_sq DOUBLE PRECISION NOT NULL DEFAULT 0,
+    min_score DECIMAL(3,2),
+    max_score DECIMAL(3,2),
+    last_score DECIMAL(3,2),
+    last_scores TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Hourly feedback rollup (timeseries endpoint), maintained with the one above
+CREATE TABLE IF NOT EXISTS prompt_feedback_hourly (
+    prompt_id UUID NOT NULL REFERENCES prompts(id) ON DELETE CASCADE,
+    hour TIMESTAMP NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    min_score DECIMAL(3,2),
+    max_score DECIMAL(3,2),
+    histogram TEXT,
+    PRIMARY KEY (prompt_id, hour)
+);
+
 -- Optimization jobs table (for later)
 CREATE TABLE IF NOT EXISTS optimization_jobs (
-    id VARCHAR(36) PRIMARY KEY,
-    prompt_id VARCHAR(36) NOT NULL REFERENCES prompts(id),
+    id UUID PRIMARY KEY,
+    prompt_id UUID NOT NULL REFERENCES prompts(id),
     status VARCHAR(20) DEFAULT 'queued',
     strategy VARCHAR(50) DEFAULT 'simple_ai',
     progress INTEGER DEFAULT 0,
     result TEXT,
     error_message TEXT,
+    worker_id VARCHAR(100),
+    heartbeat_at TIMESTAMP,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     completed_at TIMESTAMP
 );
+-- columns added with the job worker (no-op on fresh databases)
+ALTER TABLE optimization_jobs ADD COLUMN IF NOT EXISTS worker_id VARCHAR(100);
+ALTER TABLE optimization_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP;
+-- version attribution; instances logged before it stay NULL (unattributed)
+ALTER TABLE prompt_instances ADD COLUMN IF NOT EXISTS prompt_version_id UUID REFERENCES prompt_versions(id);
+
+-- JSON documents were TEXT before; convert once (USING would rewrite the table every run)
+DO $$
+BEGIN
+    IF (SELECT data_type FROM information_schema.columns
+        WHERE table_name = 'prompt_instances' AND column_name = 'context') = 'text' THEN
+        ALTER TABLE prompt_instances ALTER COLUMN context TYPE JSONB USING context::jsonb;
+    END IF;
+    IF (SELECT data_type FROM information_schema.columns
+        WHERE table_name = 'responses' AND column_name = 'response_metadata') = 'text' THEN
+        ALTER TABLE responses ALTER COLUMN response_metadata TYPE JSONB USING response_metadata::jsonb;
+    END IF;
+END $$;
+
+-- Indexes (mirrors __table_args__ in src/models/models.py)
+CREATE INDEX IF NOT EXISTS idx_prompts_created_at ON prompts(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_prompt_instances_prompt_created ON prompt_instances(prompt_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_prompt_instances_version ON prompt_instances(prompt_version_id);
+CREATE INDEX IF NOT EXISTS idx_responses_instance_created ON responses(prompt_instance_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_feedback_response_created_score ON feedback(response_id, created_at, score);
+CREATE INDEX IF NOT EXISTS idx_feedback_created_at_id ON feedback(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_optimization_jobs_prompt_id ON optimization_jobs(prompt_id);
+CREATE INDEX IF NOT EXISTS idx_optimization_jobs_status_created ON optimization_jobs(status, created_at);
+-- GIN for the ?context= / ?metadata= filters (@> and jsonpath @@)
+CREATE INDEX IF NOT EXISTS idx_prompt_instances_context ON prompt_instances USING GIN (context jsonb_path_ops);
+CREATE INDEX IF NOT EXISTS idx_responses_metadata ON responses USING GIN (response_metadata jsonb_path_ops);
 
--- Essential indexes
-CREATE INDEX IF NOT EXISTS idx_prompt_instances_prompt_id ON prompt_instances(prompt_id);
-CREATE INDEX IF NOT EXISTS idx_responses_prompt_instance_id ON responses(prompt_instance_id);
-CREATE INDEX IF NOT EXISTS idx_feedback_response_id ON feedback(response_id);
-CREATE INDEX IF NOT EXISTS idx_feedback_created_at ON feedback(created_at);
-CREATE INDEX IF NOT EXISTS idx_optimization_jobs_prompt_id ON optimization_jobs(prompt_id);
\ No newline at end of file
+-- Superseded by the composite indexes above
+DROP INDEX IF EXISTS idx_prompt_instances_prompt_id;
+DROP INDEX IF EXISTS idx_responses_prompt_instance_id;
+DROP INDEX IF EXISTS idx_feedback_response_id;
+DROP INDEX IF EXISTS idx_feedback_created_at;
@@ -0,0 +1,97 @@
+# src/database/unit_of_work.py
+"""
+One session and one transaction per HTTP request.
+
+`get_async_db` opens a `UnitOfWork` for the request and puts it in a
+ContextVar.  Every async service call in that request then runs on the
+same AsyncSession (`AsyncBaseService.session_scope`), which is created –
+and a connection checked out – only when the first service needs it.
+`TimedRoute` commits once, right after the endpoint returns and before the
+response is sent, or rolls back if the endpoint raised.
+
+* A service scope flushes on exit, so constraint errors still surface in
+  the service call that caused them rather than at commit time.
+* An exception escaping a service scope rolls the request's transaction
+  back – earlier writes of the request included – and work continues on a
+  fresh one.
+* `after_commit()` callbacks (cache invalidation) run after the commit,
+  exactly as they did when every service committed on its own.
+
+Code outside a request (worker, feedback buffer, scripts, tests that call
+services directly) has no unit of work and keeps a session per call.
+"""
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.async_database import AsyncDatabaseManager
+
+
+class UnitOfWork:
+    def __init__(self, db: AsyncDatabaseManager):
+        self.db = db
+        self._session: Optional[AsyncSession] = None
+        self._after_commit: List[Callable[[], Awaitable]] = []
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self.db.SessionLocal()
+        return self._session
+
+    def after_commit(self, callback: Callable[[], Awaitable]):
+        self._after_commit.append(callback)
+
+    async def commit(self):
+        if self._session is not None:
+            await self._session.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            await callback()
+
+    async def rollback(self):
+        if self._session is not None:
+            await self._session.rollback()
+        self._after_commit = []
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()         # rolls back anything uncommitted
+            self._session = None
+
+
+_current: ContextVar[Optional[UnitOfWork]] = ContextVar("unit_of_work", default=None)
+
+
+def current(db: Optional[AsyncDatabaseManager] = None) -> Optional[UnitOfWork]:
+    """The active unit of work (for `db`, when given)."""
+    uow = _current.get()
+    if uow is not None and db is not None and uow.db is not db:
+        return None
+    return uow
+
+
+@asynccontextmanager
+async def unit_of_work(db: AsyncDatabaseManager) -> AsyncIterator[UnitOfWork]:
+    """Open a unit of work; the caller commits it.  Closing discards the rest."""
+    uow = UnitOfWork(db)
+    token = _current.set(uow)
+    try:
+        yield uow
+    finally:
+        _current.reset(token)
+        await uow.close()
+
+
+async def commit_current():
+    uow = _current.get()
+    if uow is not None:
+        await uow.commit()
+
+
+async def rollback_current():
+    uow = _current.get()
+    if uow is not None:
+        await uow.rollback()
@@ -6,6 +6,15 @@ from src.api.routes.prompts import router as prompts_router
 from src.api.error_handlers import add_error_handlers
 from src.api.routes.instances import router as instances_router
 from src.api.routes.feedback import router as feedback_router
+from src.api.routes.admin import router as admin_router
+from src.api.routes.jobs import router as jobs_router
+from src.api.routes.calls import router as calls_router
+from src.api.routes.metrics import router as metrics_router
+from src.api.timing import TimingMiddleware
+from src.database import query_stats
+from src.database.registry import registry
+from src.services.feedback_buffer import start_feedback_buffer, stop_feedback_buffer
+import os
 load_dotenv()          
 app = FastAPI(title="PromptCraft API", version="1.0.0")
 
@@ -13,6 +22,10 @@ app.include_router(health_router, prefix="/api/v1")
 app.include_router(prompts_router, prefix="/api/v1")
 app.include_router(instances_router, prefix="/api/v1")
 app.include_router(feedback_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/api/v1")
+app.include_router(jobs_router, prefix="/api/v1")
+app.include_router(calls_router, prefix="/api/v1")
+app.include_router(metrics_router)          # /metrics, where Prometheus expects it
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,7 +34,19 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+query_stats.install()
+app.add_middleware(TimingMiddleware)        # added last ⇒ outermost, times everything
 add_error_handlers(app)
 @app.on_event("startup")
-def startup_event():
+async def startup_event():
+    if os.getenv("DATABASE_URL"):
+        # build the app-lifetime engines/pools up front instead of on first request
+        registry.get()
+        adb = registry.get_async()
+        start_feedback_buffer(adb)
     print("✅ FastAPI app is running.")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await stop_feedback_buffer()        # drain queued feedback while the pool is still up
+    await registry.dispose_all_async()
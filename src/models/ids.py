@@ -0,0 +1,71 @@
+# src/models/ids.py
+"""
+Primary-key ids: time-ordered UUIDv7 values in a compact column.
+
+`new_id()` makes UUIDv7 strings (48-bit ms timestamp up front, so new
+rows land at the right-hand edge of every id index instead of at random
+pages).  `GUID` stores them as native 16-byte `uuid` on Postgres and as
+the usual 36-char text elsewhere; Python always sees the canonical
+lowercase string, so the API representation is unchanged.
+"""
+import os
+import threading
+import time
+import uuid
+from sqlalchemy import String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import TypeDecorator
+
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+_lock = threading.Lock()
+_last_ms = 0
+_seq = 0
+
+
+def uuid7() -> uuid.UUID:
+    """RFC 9562 UUIDv7; monotonic within a process (12-bit counter per ms)."""
+    global _last_ms, _seq
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _last_ms:
+            _last_ms, _seq = ms, int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _seq += 1
+            if _seq > 0xFFF:            # counter exhausted: borrow the next ms
+                _last_ms, _seq = _last_ms + 1, 0
+        ms, seq = _last_ms, _seq
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (ms << 80) | (0x7 << 76) | (seq << 64) | (0b10 << 62) | rand_b
+    return uuid.UUID(int=value)
+
+
+def new_id() -> str:
+    return str(uuid7())
+
+
+class GUID(TypeDecorator):
+    """UUID-as-string column: native `uuid` on Postgres, VARCHAR(36) elsewhere."""
+    impl = String(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(String(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return str(uuid.UUID(str(value)))
+        except ValueError:
+            # not a UUID ⇒ can't be an id; a native uuid column would reject
+            # the literal outright, so look up the nil UUID (never issued)
+            return NIL_UUID if dialect.name == "postgresql" else value
+
+    def process_literal_param(self, value, dialect):
+        return self.process_bind_param(value, dialect)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else str(value)
@@ -1,19 +1,34 @@
 # src/models/models.py
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, DECIMAL
+from sqlalchemy import (Column, String, Integer, DateTime, Text, ForeignKey, DECIMAL, Float, Index, JSON,
+                        LargeBinary, UniqueConstraint)
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import declarative_base
 from datetime import datetime
-import uuid
+from src.models.ids import GUID, new_id
 
 Base = declarative_base()
 
+# JSONB on Postgres (binary, GIN-indexable), JSON text elsewhere; either way
+# Python sees dicts.  none_as_null ⇒ a missing value is SQL NULL, not 'null'.
+JSONDocument = JSON(none_as_null=True).with_variant(postgresql.JSONB(none_as_null=True), "postgresql")
+
+
+def gin_index(name: str, column: str) -> Index:
+    """jsonb_path_ops GIN index (serves @> and @@ filters); Postgres only."""
+    return Index(name, column, postgresql_using="gin",
+                 postgresql_ops={column: "jsonb_path_ops"}).ddl_if(dialect="postgresql")
+
 class Prompt(Base):
     __tablename__ = "prompts"
+    __table_args__ = (
+        Index("idx_prompts_created_at", "created_at", "id"),      # newest-first listing
+    )
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=new_id)
     text = Column(Text, nullable=False)
     version = Column(Integer, nullable=False, default=1)
     description = Column(Text)
-    parent_id = Column(String(36), ForeignKey('prompts.id'))
+    parent_id = Column(GUID, ForeignKey('prompts.id'))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -28,47 +43,105 @@ class Prompt(Base):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+class PromptVersion(Base):
+    """Immutable snapshot of a prompt's text; `Prompt` holds the current head."""
+    __tablename__ = "prompt_versions"
+    __table_args__ = (
+        UniqueConstraint("prompt_id", "version", name="uq_prompt_versions_prompt_version"),
+    )
+
+    id = Column(GUID, primary_key=True, default=new_id)
+    prompt_id = Column(GUID, ForeignKey('prompts.id'), nullable=False)
+    version = Column(Integer, nullable=False)
+    text = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'prompt_id': self.prompt_id,
+            'version': self.version,
+            'text': self.text,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+class TextBlob(Base):
+    """Instance / response text, stored once per distinct value (src/services/blobs.py)."""
+    __tablename__ = "text_blobs"
+
+    hash = Column(String(32), primary_key=True)         # BLAKE2b-128 of the UTF-8 text, hex
+    codec = Column(String(8), nullable=False)           # raw | zlib
+    size = Column(Integer, nullable=False)              # UTF-8 bytes before compression
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'hash': self.hash,
+            'codec': self.codec,
+            'size': self.size,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
 class PromptInstance(Base):
     __tablename__ = "prompt_instances"
+    __table_args__ = (
+        # filter by prompt, page by created_at; also drives the feedback join
+        Index("idx_prompt_instances_prompt_created", "prompt_id", "created_at", "id"),
+        Index("idx_prompt_instances_version", "prompt_version_id"),  # per-version feedback
+        gin_index("idx_prompt_instances_context", "context"),
+    )
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    prompt_id = Column(String(36), ForeignKey('prompts.id'), nullable=False)
-    formatted_text = Column(Text, nullable=False)
-    context = Column(Text)  # JSON as string
+    id = Column(GUID, primary_key=True, default=new_id)
+    prompt_id = Column(GUID, ForeignKey('prompts.id'), nullable=False)
+    prompt_version_id = Column(GUID, ForeignKey('prompt_versions.id'))  # NULL: logged before versioning
+    formatted_text_hash = Column(String(32), ForeignKey('text_blobs.hash'), nullable=False)
+    context = Column(JSONDocument)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     def to_dict(self):
         return {
             'id': self.id,
             'prompt_id': self.prompt_id,
-            'formatted_text': self.formatted_text,
+            'prompt_version_id': self.prompt_version_id,
+            'formatted_text_hash': self.formatted_text_hash,
             'context': self.context,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
 class Response(Base):
     __tablename__ = "responses"
+    __table_args__ = (
+        Index("idx_responses_instance_created", "prompt_instance_id", "created_at", "id"),
+        gin_index("idx_responses_metadata", "response_metadata"),
+    )
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    prompt_instance_id = Column(String(36), ForeignKey('prompt_instances.id'), nullable=False)
-    content = Column(Text, nullable=False)
-    response_metadata = Column(Text)  # ✅ CHANGED: renamed from 'metadata' to 'response_metadata'
+    id = Column(GUID, primary_key=True, default=new_id)
+    prompt_instance_id = Column(GUID, ForeignKey('prompt_instances.id'), nullable=False)
+    content_hash = Column(String(32), ForeignKey('text_blobs.hash'), nullable=False)
+    response_metadata = Column(JSONDocument)  # ✅ CHANGED: renamed from 'metadata' to 'response_metadata'
     created_at = Column(DateTime, default=datetime.utcnow)
     
     def to_dict(self):
         return {
             'id': self.id,
             'prompt_instance_id': self.prompt_instance_id,
-            'content': self.content,
+            'content_hash': self.content_hash,
             'response_metadata': self.response_metadata,  # ✅ CHANGED: updated here too
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
 class Feedback(Base):
     __tablename__ = "feedback"
+    __table_args__ = (
+        # covering for "last N scores of a prompt": join on response_id,
+        # order by created_at, read score without touching the heap
+        Index("idx_feedback_response_created_score", "response_id", "created_at", "score"),
+        Index("idx_feedback_created_at_id", "created_at", "id"),  # global listing
+    )
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    response_id = Column(String(36), ForeignKey('responses.id'), nullable=False)
+    id = Column(GUID, primary_key=True, default=new_id)
+    response_id = Column(GUID, ForeignKey('responses.id'), nullable=False)
     score = Column(DECIMAL(3,2), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -80,16 +153,72 @@ class Feedback(Base):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+class PromptFeedbackStats(Base):
+    """Per-prompt feedback rollup, maintained on every feedback write."""
+    __tablename__ = "prompt_feedback_stats"
+
+    prompt_id = Column(GUID, ForeignKey('prompts.id'), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_sum_sq = Column(Float, nullable=False, default=0.0)
+    min_score = Column(DECIMAL(3,2))
+    max_score = Column(DECIMAL(3,2))
+    last_score = Column(DECIMAL(3,2))
+    last_scores = Column(Text)  # JSON list, newest first (ring of LAST_N)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'prompt_id': self.prompt_id,
+            'count': self.count,
+            'score_sum': self.score_sum,
+            'score_sum_sq': self.score_sum_sq,
+            'min_score': float(self.min_score) if self.min_score is not None else None,
+            'max_score': float(self.max_score) if self.max_score is not None else None,
+            'last_score': float(self.last_score) if self.last_score is not None else None,
+            'last_scores': self.last_scores,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class PromptFeedbackHourly(Base):
+    """Per-prompt, per-hour feedback rollup behind the stats timeseries."""
+    __tablename__ = "prompt_feedback_hourly"
+
+    prompt_id = Column(GUID, ForeignKey('prompts.id'), primary_key=True)
+    hour = Column(DateTime, primary_key=True)      # UTC, truncated to the hour
+    count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    min_score = Column(DECIMAL(3,2))
+    max_score = Column(DECIMAL(3,2))
+    histogram = Column(Text)  # JSON list of 101 counts, index = score in cents – exact quantiles
+
+    def to_dict(self):
+        return {
+            'prompt_id': self.prompt_id,
+            'hour': self.hour.isoformat() if self.hour else None,
+            'count': self.count,
+            'score_sum': self.score_sum,
+            'min_score': float(self.min_score) if self.min_score is not None else None,
+            'max_score': float(self.max_score) if self.max_score is not None else None,
+            'histogram': self.histogram,
+        }
+
 class OptimizationJob(Base):
     __tablename__ = "optimization_jobs"
+    __table_args__ = (
+        Index("idx_optimization_jobs_prompt_id", "prompt_id"),
+        Index("idx_optimization_jobs_status_created", "status", "created_at"),  # worker claim
+    )
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    prompt_id = Column(String(36), ForeignKey('prompts.id'), nullable=False)
+    id = Column(GUID, primary_key=True, default=new_id)
+    prompt_id = Column(GUID, ForeignKey('prompts.id'), nullable=False)
     status = Column(String(20), default='queued')
     strategy = Column(String(50), default='simple_ai')
     progress = Column(Integer, default=0)
     result = Column(Text)
     error_message = Column(Text)
+    worker_id = Column(String(100))        # who holds the lease while running
+    heartbeat_at = Column(DateTime)        # lease renewal; stale ⇒ job is re-claimable
     created_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime)
     
@@ -102,6 +231,8 @@ class OptimizationJob(Base):
             'progress': self.progress,
             'result': self.result,
             'error_message': self.error_message,
+            'worker_id': self.worker_id,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None
         }
\ No newline at end of file
@@ -0,0 +1,155 @@
+# src/services/ab_testing.py
+"""
+A/B comparison of two prompt versions.
+
+Scores have 0.01 resolution, so each version's feedback is read as a
+101-slot histogram (one GROUP BY over the version's instances) instead of
+raw rows; everything below works on those histograms:
+
+* `summarize`  – n / mean / stddev / p50 / p90 / min / max
+* `welch`      – Welch's unequal-variance t-test (two-sided p-value)
+* `bootstrap`  – percentile CI of mean(b) − mean(a) and P(mean(b) > mean(a)),
+                 resampling both histograms with one multinomial draw each
+
+The Student-t tail uses a continued-fraction incomplete beta, so no
+SciPy dependency.
+"""
+import math
+from typing import Iterable, Optional
+import numpy as np
+from src.services.stats_rollup import HIST_SLOTS, score_slot
+from src.services.timeseries import quantiles
+
+VALUES = np.arange(HIST_SLOTS) / 100
+DEFAULT_ALPHA = 0.05
+DEFAULT_BOOTSTRAP = 2_000
+MAX_BOOTSTRAP = 20_000
+
+
+def histogram(rows: Iterable) -> np.ndarray:
+    """(score, count) rows → 101-slot histogram."""
+    hist = np.zeros(HIST_SLOTS, dtype=np.int64)
+    for score, count in rows:
+        hist[score_slot(score)] += count
+    return hist
+
+
+def _moments(hist: np.ndarray) -> tuple[int, float, float]:
+    """(n, mean, sample variance) of a histogram."""
+    n = int(hist.sum())
+    if n == 0:
+        return 0, 0.0, 0.0
+    mean = float(hist @ VALUES) / n
+    var = float(hist @ (VALUES - mean) ** 2) / (n - 1) if n > 1 else 0.0
+    return n, mean, var
+
+
+def summarize(hist: np.ndarray) -> dict:
+    n, mean, var = _moments(hist)
+    if n == 0:
+        return {"count": 0, "avg_score": None, "stddev": None, "p50": None,
+                "p90": None, "min_score": None, "max_score": None}
+    present = np.flatnonzero(hist)
+    p50, p90 = quantiles(hist[None, :], (0.5, 0.9))[0]
+    return {
+        "count": n,
+        "avg_score": mean,
+        "stddev": math.sqrt(var) if n > 1 else None,
+        "p50": float(p50),
+        "p90": float(p90),
+        "min_score": float(VALUES[present[0]]),
+        "max_score": float(VALUES[present[-1]]),
+    }
+
+
+# ---------- Welch's t-test ---------- #
+def _betacf(a: float, b: float, x: float) -> float:
+    """Continued fraction for the incomplete beta (modified Lentz)."""
+    tiny, eps = 1e-300, 3e-16
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c, d = 1.0, 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        for num in (m * (b - m) * x / ((qam + m2) * (a + m2)),
+                    -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))):
+            d = 1.0 + num * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + num / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < eps:
+            break
+    return h
+
+
+def betainc(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta I_x(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                     + a * math.log(x) + b * math.log1p(-x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
+
+
+def t_two_sided(t: float, df: float) -> float:
+    """P(|T| ≥ |t|) for Student's t with `df` degrees of freedom."""
+    return betainc(df / 2.0, 0.5, df / (df + t * t))
+
+
+def welch(a: np.ndarray, b: np.ndarray) -> dict:
+    """Welch's t-test of mean(b) vs mean(a); None fields when a side has < 2 samples."""
+    (na, ma, va), (nb, mb, vb) = _moments(a), _moments(b)
+    if na < 2 or nb < 2:
+        return {"t": None, "df": None, "p_value": None}
+    sa, sb = va / na, vb / nb
+    if sa + sb == 0.0:                  # both constant: identical or trivially different
+        return {"t": None, "df": None, "p_value": 1.0 if ma == mb else 0.0}
+    t = (mb - ma) / math.sqrt(sa + sb)
+    df = (sa + sb) ** 2 / (sa * sa / (na - 1) + sb * sb / (nb - 1))
+    return {"t": t, "df": df, "p_value": t_two_sided(t, df)}
+
+
+# ---------- bootstrap ---------- #
+def _resampled_means(hist: np.ndarray, n: int, iterations: int, rng) -> np.ndarray:
+    return rng.multinomial(n, hist / n, size=iterations) @ VALUES / n
+
+
+def bootstrap(a: np.ndarray, b: np.ndarray, alpha: float = DEFAULT_ALPHA,
+              iterations: int = DEFAULT_BOOTSTRAP, seed: Optional[int] = None) -> dict:
+    na, nb = int(a.sum()), int(b.sum())
+    if na == 0 or nb == 0 or iterations <= 0:
+        return {"iterations": 0, "ci_low": None, "ci_high": None, "prob_b_better": None}
+    rng = np.random.default_rng(seed)
+    diff = _resampled_means(b, nb, iterations, rng) - _resampled_means(a, na, iterations, rng)
+    low, high = np.quantile(diff, (alpha / 2, 1 - alpha / 2))
+    return {
+        "iterations": iterations,
+        "ci_low": float(low),
+        "ci_high": float(high),
+        "prob_b_better": float((diff > 0).mean()),
+    }
+
+
+def compare(a: np.ndarray, b: np.ndarray, alpha: float = DEFAULT_ALPHA,
+            iterations: int = DEFAULT_BOOTSTRAP, seed: Optional[int] = None) -> dict:
+    """Summary of both sides, the tests, and a verdict at level `alpha`."""
+    sa, sb = summarize(a), summarize(b)
+    test = welch(a, b)
+    significant = test["p_value"] is not None and test["p_value"] < alpha
+    return {
+        "a": sa,
+        "b": sb,
+        "difference": (sb["avg_score"] - sa["avg_score"]
+                       if sa["count"] and sb["count"] else None),
+        "welch": test,
+        "bootstrap": bootstrap(a, b, alpha, iterations, seed),
+        "alpha": alpha,
+        "significant": significant,
+        "winner": (("b" if sb["avg_score"] > sa["avg_score"] else "a") if significant else None),
+    }
@@ -0,0 +1,190 @@
+# src/services/analytics.py
+"""
+Vectorised feedback analytics over raw score columns.
+
+`scores_stmt` selects just (prompt_id, score) – no ORM objects, the
+DECIMAL → float conversion done by the database – ordered by prompt and
+then time, so every prompt's scores form one contiguous run.  `columns`
+packs the rows into a `ScoreColumns` (one float64 array plus run
+offsets) and `describe` computes, for every prompt at once:
+
+* count / mean / variance / stddev / min / max / p50 / p90
+* EWMA of the scores in time order (the "trend")
+* a normal-approximation confidence interval of the mean
+* drift: mean of the last `window` scores vs everything before, as a z-score
+
+All of it is `np.add.reduceat`-style segment arithmetic, so analysing
+10k prompts costs one query and a handful of array passes.
+"""
+from datetime import datetime
+from operator import itemgetter
+from statistics import NormalDist
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+import numpy as np
+from sqlalchemy import Float, cast, select
+from src.models.models import Feedback, PromptInstance, Response
+
+DEFAULT_QUANTILES = (0.5, 0.9)
+DEFAULT_EWMA_ALPHA = 0.2      # weight of the newest score
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_WINDOW = 20           # "recent" scores for drift detection
+DEFAULT_DRIFT_Z = 3.0
+CHUNK_SIZE = 1000             # prompt ids per IN (...)
+
+
+class ScoreColumns(NamedTuple):
+    prompt_ids: np.ndarray    # one id per run
+    starts: np.ndarray        # run offsets into `scores`
+    scores: np.ndarray        # float64, grouped by prompt, oldest first
+
+
+def scores_stmt(prompt_ids: Optional[Sequence[str]] = None, since: Optional[datetime] = None):
+    """(prompt_id, score) for the given prompts (default: all), grouped and time-ordered."""
+    stmt = (
+        select(PromptInstance.prompt_id, cast(Feedback.score, Float))
+        .join(Response, Feedback.response_id == Response.id)
+        .join(PromptInstance, Response.prompt_instance_id == PromptInstance.id)
+        .order_by(PromptInstance.prompt_id, Feedback.created_at, Feedback.id)
+    )
+    if prompt_ids is not None:
+        stmt = stmt.where(PromptInstance.prompt_id.in_(prompt_ids))
+    if since is not None:
+        stmt = stmt.where(Feedback.created_at >= since)
+    return stmt
+
+
+def columns(rows: Iterable) -> ScoreColumns:
+    """Rows from `scores_stmt` (possibly several chunks, each sorted) → ScoreColumns."""
+    rows = list(rows)
+    # object array: ids are compared, never copied into fixed-width strings
+    ids = np.array(list(map(itemgetter(0), rows)), dtype=object)
+    scores = np.fromiter(map(itemgetter(1), rows), dtype=np.float64, count=len(rows))
+    starts = np.flatnonzero(np.concatenate(([True], ids[1:] != ids[:-1]))) if len(rows) else \
+        np.array([], dtype=np.int64)
+    return ScoreColumns(ids[starts], starts, scores)
+
+
+def _chunks(prompt_ids: Optional[Sequence[str]], size: int):
+    if prompt_ids is None:
+        yield None
+        return
+    ids = sorted(set(prompt_ids))       # sorted chunks keep runs contiguous across chunks
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def load_columns(session, prompt_ids: Optional[Sequence[str]] = None,
+                 since: Optional[datetime] = None, chunk_size: int = CHUNK_SIZE) -> ScoreColumns:
+    rows = []
+    for chunk in _chunks(prompt_ids, chunk_size):
+        rows.extend(session.execute(scores_stmt(chunk, since)).tuples())
+    return columns(rows)
+
+
+async def load_columns_async(session, prompt_ids: Optional[Sequence[str]] = None,
+                             since: Optional[datetime] = None,
+                             chunk_size: int = CHUNK_SIZE) -> ScoreColumns:
+    rows = []
+    for chunk in _chunks(prompt_ids, chunk_size):
+        rows.extend((await session.execute(scores_stmt(chunk, since))).tuples())
+    return columns(rows)
+
+
+def empty_stats() -> dict:
+    return {
+        "total_feedback": 0, "avg_score": 0.0, "variance": None, "stddev": None,
+        "min_score": None, "max_score": None, "p50": None, "p90": None,
+        "ewma": None, "ci_low": None, "ci_high": None,
+        "drift": {"recent_avg": None, "baseline_avg": None, "z": None, "drifting": False},
+    }
+
+
+def _segment_var(values: np.ndarray, starts: np.ndarray, n: np.ndarray, mean: np.ndarray):
+    """Sample variance per run (two-pass, NaN for runs of one)."""
+    dev = values - np.repeat(mean, n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 1, np.add.reduceat(dev * dev, starts) / (n - 1), np.nan)
+
+
+def describe(
+    cols: ScoreColumns,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    ewma_alpha: float = DEFAULT_EWMA_ALPHA,
+    confidence: float = DEFAULT_CONFIDENCE,
+    window: int = DEFAULT_WINDOW,
+    drift_z: float = DEFAULT_DRIFT_Z,
+) -> dict:
+    """prompt id → stats dict (shape of `empty_stats`) for every run in `cols`."""
+    x, starts = cols.scores, cols.starts
+    if not len(x):
+        return {}
+    n = np.diff(np.append(starts, len(x)))
+    group = np.repeat(np.arange(len(n)), n)
+    mean = np.add.reduceat(x, starts) / n
+    var = _segment_var(x, starts, n, mean)
+
+    # nearest-rank quantiles: sort by (run, score), then index into each run
+    ordered = x[np.lexsort((x, group))]
+    qs = {q: ordered[starts + np.maximum(np.ceil(q * n - 1e-9).astype(np.int64) - 1, 0)]
+          for q in quantiles}
+
+    # position counted from the newest score of the run (0 = newest)
+    from_end = np.repeat(starts + n, n) - np.arange(len(x)) - 1
+    weights = (1.0 - ewma_alpha) ** from_end
+    ewma = np.add.reduceat(weights * x, starts) / np.add.reduceat(weights, starts)
+
+    half = NormalDist().inv_cdf(0.5 + confidence / 2) * np.sqrt(var / n)
+
+    # drift: last `window` scores vs the rest; needs a full window on each side
+    recent = from_end < window
+    n_recent = np.minimum(n, window)
+    n_base = n - n_recent
+    with np.errstate(invalid="ignore", divide="ignore"):
+        recent_mean = np.add.reduceat(np.where(recent, x, 0.0), starts) / n_recent
+        base_mean = np.add.reduceat(np.where(recent, 0.0, x), starts) / n_base
+        dev = x - np.where(recent, np.repeat(recent_mean, n), np.repeat(base_mean, n))
+        sq = dev * dev
+        recent_var = np.add.reduceat(np.where(recent, sq, 0.0), starts) / (n_recent - 1)
+        base_var = np.add.reduceat(np.where(recent, 0.0, sq), starts) / (n_base - 1)
+        se = np.sqrt(recent_var / n_recent + base_var / n_base)
+        z = np.where(se > 0, (recent_mean - base_mean) / se,
+                     np.where(recent_mean == base_mean, 0.0, np.sign(recent_mean - base_mean) * np.inf))
+    has_drift = n_base >= window
+
+    # undefined → None once per column, then plain Python values per prompt
+    def col(values, valid):
+        values = values.astype(object)
+        values[~valid] = None
+        return values.tolist()
+
+    spread = n > 1
+    fields = {
+        "total_feedback": n.tolist(),
+        "avg_score": mean.tolist(),
+        "variance": col(var, spread),
+        "stddev": col(np.sqrt(var), spread),
+        "min_score": np.minimum.reduceat(x, starts).tolist(),
+        "max_score": np.maximum.reduceat(x, starts).tolist(),
+        **{f"p{round(q * 100)}": v.tolist() for q, v in qs.items()},
+        "ewma": ewma.tolist(),
+        "ci_low": col(mean - half, spread),
+        "ci_high": col(mean + half, spread),
+    }
+    drift = {
+        "recent_avg": col(recent_mean, has_drift),
+        "baseline_avg": col(base_mean, has_drift),
+        "z": col(np.clip(z, -1e6, 1e6), has_drift),      # JSON has no inf
+        "drifting": (has_drift & (np.abs(z) > drift_z)).tolist(),
+    }
+    names, values = list(fields), list(zip(*fields.values()))
+    drift_names, drift_values = list(drift), list(zip(*drift.values()))
+    return {
+        prompt_id: {**dict(zip(names, row)), "drift": dict(zip(drift_names, d))}
+        for prompt_id, row, d in zip(cols.prompt_ids.tolist(), values, drift_values)
+    }
+
+
+def describe_all(prompt_ids: Sequence[str], cols: ScoreColumns, **options) -> List[dict]:
+    """`describe`, in `prompt_ids` order, with empty stats for prompts without feedback."""
+    found = describe(cols, **options)
+    return [{"prompt_id": pid, **found.get(pid, empty_stats())} for pid in prompt_ids]
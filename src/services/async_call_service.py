@@ -0,0 +1,134 @@
+# src/services/async_call_service.py
+"""
+Composite "log an LLM call" writes: PromptInstance → Response → Feedback
+for a whole batch of calls in one transaction.
+
+Ids are generated here (or taken from the client), so nothing has to be
+flushed and refreshed per row – each table gets one executemany INSERT
+per chunk, and the stats rollup is updated once per prompt.  The batch's
+texts go to text_blobs (src/services/blobs.py) first, in one INSERT.
+"""
+from datetime import datetime
+from typing import List, Sequence
+from sqlalchemy import insert, select
+from src.models.ids import new_id
+from src.models.models import Feedback, Prompt, PromptInstance, PromptVersion, Response
+from src.services import blobs
+from src.services.async_feedback_service import BATCH_CHUNK_SIZE
+from src.services.base_service import AsyncBaseService
+from src.services.cache import stats_key
+from src.services.stats_rollup import record_scores_async
+
+
+def _new_id(client_id) -> str:
+    return str(client_id) if client_id else new_id()
+
+
+class AsyncCallService(AsyncBaseService):
+    async def _logged(self, s, instance_ids: list) -> dict:
+        """instance id → (response id, feedback id) as stored, for the instances that exist."""
+        found = {}
+        for start in range(0, len(instance_ids), BATCH_CHUNK_SIZE):
+            rows = await s.execute(
+                select(PromptInstance.id, Response.id, Feedback.id)
+                .outerjoin(Response, Response.prompt_instance_id == PromptInstance.id)
+                .outerjoin(Feedback, Feedback.response_id == Response.id)
+                .where(PromptInstance.id.in_(instance_ids[start:start + BATCH_CHUNK_SIZE]))
+            )
+            for inst_id, resp_id, fb_id in rows:
+                found.setdefault(inst_id, (resp_id, fb_id))
+        return found
+
+    async def _versions(self, s, prompt_ids: list) -> dict:
+        """prompt id → {version: version id, None: head version id} for the known prompts."""
+        found = {}
+        for start in range(0, len(prompt_ids), BATCH_CHUNK_SIZE):
+            rows = await s.execute(
+                select(Prompt.id, Prompt.version, PromptVersion.version, PromptVersion.id)
+                .outerjoin(PromptVersion, PromptVersion.prompt_id == Prompt.id)
+                .where(Prompt.id.in_(prompt_ids[start:start + BATCH_CHUNK_SIZE]))
+            )
+            for prompt_id, head, version, version_id in rows:
+                versions = found.setdefault(prompt_id, {None: None})
+                if version is not None:
+                    versions[version] = version_id
+                    if version == head:
+                        versions[None] = version_id
+        return found
+
+    async def log_calls(self, calls: Sequence[dict]) -> List[dict]:
+        """
+        `calls` are `CallCreate`-shaped dicts.  Unknown prompts or versions,
+        bad scores and ids repeated inside the batch are reported per item and skipped;
+        a call whose instance_id already exists is reported as a duplicate
+        (ok, nothing written) with the response / feedback ids stored the
+        first time.  Returns one result dict per call, in order.
+        """
+        results = [{"index": i, "ok": False, "duplicate": False, "instance_id": None,
+                    "response_id": None, "feedback_id": None, "error": None}
+                   for i in range(len(calls))]
+        async with self.session_scope() as s:
+            prompts = await self._versions(s, list({c["prompt_id"] for c in calls}))
+            client_ids = [str(c["instance_id"]) for c in calls if c.get("instance_id")]
+            logged = await self._logged(s, client_ids) if client_ids else {}
+
+            now = datetime.utcnow()
+            instances, responses, feedback, per_prompt = [], [], [], {}
+            seen = set()
+            for result, call in zip(results, calls):
+                score = call.get("score")
+                if call["prompt_id"] not in prompts:
+                    result["error"] = "Prompt not found"
+                    continue
+                if call.get("version") not in prompts[call["prompt_id"]]:
+                    result["error"] = "Prompt version not found"
+                    continue
+                if score is not None and not (0.0 <= score <= 1.0):
+                    result["error"] = "Score must be between 0.0 and 1.0"
+                    continue
+                inst_id = _new_id(call.get("instance_id"))
+                if inst_id in logged:
+                    resp_id, fb_id = logged[inst_id]
+                    result.update(instance_id=inst_id, response_id=resp_id, feedback_id=fb_id,
+                                  ok=True, duplicate=True)
+                    continue
+                resp_id = _new_id(call.get("response_id"))
+                fb_id = _new_id(call.get("feedback_id")) if score is not None else None
+                result.update(instance_id=inst_id, response_id=resp_id, feedback_id=fb_id)
+                if {inst_id, resp_id, fb_id} & seen:
+                    result["error"] = "Duplicate id in batch"
+                    continue
+                seen.update(i for i in (inst_id, resp_id, fb_id) if i)
+                result["ok"] = True
+
+                instances.append({
+                    "id": inst_id, "prompt_id": call["prompt_id"],
+                    "prompt_version_id": prompts[call["prompt_id"]][call.get("version")],
+                    "formatted_text": call["formatted_text"],
+                    "context": call.get("context"),
+                    "created_at": now,
+                })
+                responses.append({
+                    "id": resp_id, "prompt_instance_id": inst_id, "content": call["content"],
+                    "response_metadata": call.get("metadata") or None,
+                    "created_at": now,
+                })
+                if fb_id:
+                    feedback.append({"id": fb_id, "response_id": resp_id, "score": score,
+                                     "created_at": now})
+                    per_prompt.setdefault(call["prompt_id"], []).append(score)
+
+            # texts → blob hashes, each distinct text stored once
+            hashes = iter(await blobs.store_async(
+                s, [r.pop("formatted_text") for r in instances] + [r.pop("content") for r in responses]))
+            for rows, key in ((instances, "formatted_text_hash"), (responses, "content_hash")):
+                for row in rows:
+                    row[key] = next(hashes)
+            # parents first so the FKs hold; one executemany per table and chunk
+            for model, rows in ((PromptInstance, instances), (Response, responses), (Feedback, feedback)):
+                for start in range(0, len(rows), BATCH_CHUNK_SIZE):
+                    await s.execute(insert(model), rows[start:start + BATCH_CHUNK_SIZE])
+            for prompt_id in sorted(per_prompt):
+                await record_scores_async(s, prompt_id, per_prompt[prompt_id])
+        await self.after_commit(self.cache.delete, *(stats_key(pid) for pid in per_prompt))
+        return results
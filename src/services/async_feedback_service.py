@@ -0,0 +1,206 @@
+# src/services/async_feedback_service.py
+"""
+asyncio twin of `FeedbackService` used by the async routers.
+"""
+from datetime import datetime, timedelta
+from typing import AbstractSet, List, Sequence, Tuple
+from sqlalchemy import insert, select
+from src.models.ids import new_id
+from src.models.models import Feedback, Response, PromptFeedbackHourly, PromptFeedbackStats
+from src.services import blobs, reads
+from src.services.async_prompt_service import _for_prompt
+from src.services.base_service import AsyncBaseService
+from src.services.cache import stats_key
+from src.services.json_filters import JSONFilter, apply_json_filters
+from src.services.pagination import Page, count_rows, keyset, split_page
+from src.services.timeseries import bucket_start, fold
+from src.services.stats_rollup import (
+    prompt_id_for_response_stmt, prompt_ids_for_responses_stmt,
+    record_score_async, record_scores_async, stats_from_row,
+)
+
+BATCH_CHUNK_SIZE = 1000  # rows per multi-row INSERT / IN (...) lookup
+
+
+class AsyncFeedbackService(AsyncBaseService):
+    # ---------- submit ---------- #
+    async def add_score(self, response_id: str, score: float) -> Feedback:
+        if not (0.0 <= score <= 1.0):
+            raise ValueError("Score must be between 0.0 and 1.0")
+        async with self.session_scope() as s:
+            prompt_id = await s.scalar(prompt_id_for_response_stmt(response_id))
+            if prompt_id is None:
+                raise LookupError("Response not found")
+            fb = Feedback(response_id=response_id, score=score)
+            s.add(fb)
+            await s.flush()
+            await record_score_async(s, prompt_id, score)
+        await self.after_commit(self.cache.delete, stats_key(prompt_id))
+        return fb
+
+    async def add_feedback(self, response_id: str, score: float) -> Feedback:
+        return await self.add_score(response_id, score)
+
+    async def response_exists(self, response_id: str) -> bool:
+        async with self.session_scope() as s:
+            return await s.scalar(prompt_id_for_response_stmt(response_id)) is not None
+
+    async def add_scores_batch(
+        self, items: Sequence[Tuple[str, float]],
+        ids: Sequence[str] | None = None, created_at: Sequence[datetime] | None = None,
+        skip_existing: bool = False,
+    ) -> List[dict]:
+        """
+        Bulk submit of (response_id, score) pairs in one transaction.
+
+        Unknown responses / out-of-range scores are reported per item and
+        skipped; valid rows go in with one multi-row INSERT per chunk and the
+        rollup is updated once per prompt.  Returns one result dict per item,
+        in input order.  `ids` / `created_at` (parallel to `items`) keep the
+        id and timestamp handed out when the score was accepted – see
+        src/services/feedback_buffer.py.  With `skip_existing`, items whose
+        id is already stored count as ok and aren't inserted again, so a
+        replayed batch can't double-count.
+        """
+        results = [
+            {"index": i, "response_id": rid, "id": None, "ok": False, "error": None}
+            for i, (rid, _) in enumerate(items)
+        ]
+        async with self.session_scope() as s:
+            unique_ids = list({rid for rid, _ in items})
+            prompt_of: dict[str, str] = {}
+            for start in range(0, len(unique_ids), BATCH_CHUNK_SIZE):
+                chunk = unique_ids[start:start + BATCH_CHUNK_SIZE]
+                prompt_of.update((await s.execute(prompt_ids_for_responses_stmt(chunk))).all())
+            stored = set()
+            if skip_existing and ids:
+                for start in range(0, len(ids), BATCH_CHUNK_SIZE):
+                    chunk = ids[start:start + BATCH_CHUNK_SIZE]
+                    stored.update(await s.scalars(select(Feedback.id).where(Feedback.id.in_(chunk))))
+
+            now = datetime.utcnow()
+            rows, per_prompt = [], {}
+            for i, (result, (rid, score)) in enumerate(zip(results, items)):
+                if not (0.0 <= score <= 1.0):
+                    result["error"] = "Score must be between 0.0 and 1.0"
+                elif rid not in prompt_of:
+                    result["error"] = "Response not found"
+                elif ids and ids[i] in stored:
+                    result["id"], result["ok"] = ids[i], True
+                else:
+                    result["id"], result["ok"] = ids[i] if ids else new_id(), True
+                    at = created_at[i] if created_at else now
+                    rows.append({"id": result["id"], "response_id": rid, "score": score,
+                                 "created_at": at})
+                    per_prompt.setdefault(prompt_of[rid], []).append((at, score))
+
+            # executemany → SQLAlchemy's "insertmanyvalues" renders one
+            # multi-row INSERT per chunk with a cached compiled statement
+            for start in range(0, len(rows), BATCH_CHUNK_SIZE):
+                await s.execute(insert(Feedback), rows[start:start + BATCH_CHUNK_SIZE])
+            # sorted ⇒ concurrent batches lock rollup rows in the same order
+            for prompt_id in sorted(per_prompt):
+                # oldest first, each into the hour it was accepted in (a buffered
+                # or replayed score can be flushed in a later hour)
+                timed = sorted(per_prompt[prompt_id], key=lambda pair: pair[0])
+                await record_scores_async(s, prompt_id, [score for _, score in timed],
+                                          at=[at for at, _ in timed])
+        await self.after_commit(self.cache.delete, *(stats_key(pid) for pid in per_prompt))
+        return results
+
+    # ---------- queries ---------- #
+    async def list_for_prompt(
+        self, prompt_id: str, offset: int, limit: int,
+        cursor: str | None = None, total: str = "exact",
+        metadata: Sequence[JSONFilter] = (),
+    ) -> Page:
+        """`metadata` filters slice by the scored response's metadata (e.g. model=gpt-4)."""
+        async with self.session_scope() as s:
+            q = _for_prompt(reads.select_rows(reads.FeedbackRow)[0], prompt_id)
+            q = apply_json_filters(q, Response.response_metadata, metadata, s.get_bind().dialect.name)
+            result = await s.execute(keyset(q, Feedback.created_at, Feedback.id, cursor, offset, limit))
+            items, next_cursor = split_page(reads.rows(result, reads.FeedbackRow), limit)
+            if total == "estimate" and not metadata:
+                # the rollup count is O(1) and only drifts until the next rebuild
+                count = stats_from_row(await s.get(PromptFeedbackStats, prompt_id))["total_feedback"]
+            else:
+                count = await count_rows(s, q, total)
+            return Page(items, count, next_cursor)
+
+    async def list_by_prompt(self, prompt_id: str, offset: int, limit: int, **kwargs) -> Page:
+        return await self.list_for_prompt(prompt_id, offset, limit, **kwargs)
+
+    async def list_all(
+        self, offset: int, limit: int, cursor: str | None = None, total: str = "exact"
+    ) -> Page:
+        async with self.session_scope() as s:
+            q = reads.select_rows(reads.FeedbackRow)[0]
+            result = await s.execute(keyset(q, Feedback.created_at, Feedback.id, cursor, offset, limit))
+            items, next_cursor = split_page(reads.rows(result, reads.FeedbackRow), limit)
+            return Page(items, await count_rows(s, q, total), next_cursor)
+
+    # ---------- responses ---------- #
+    async def add_response(
+        self,
+        instance_id: str,
+        content: str,
+        metadata: dict | None = None,
+    ) -> reads.ResponseRow:
+        async with self.session_scope() as s:
+            [content_hash] = await blobs.store_async(s, [content])
+            resp = Response(
+                prompt_instance_id=instance_id,
+                content_hash=content_hash,
+                response_metadata=metadata or None,
+            )
+            s.add(resp)
+            await s.flush()
+            return reads.response_row(resp, content)
+
+    async def list_responses(
+        self, instance_id: str, offset: int, limit: int,
+        cursor: str | None = None, total: str = "exact",
+        metadata: Sequence[JSONFilter] = (),
+        fields: AbstractSet[str] | None = None,
+    ) -> Page:
+        async with self.session_scope() as s:
+            q, row_type = reads.select_rows(reads.ResponseRow, fields)
+            q = q.where(Response.prompt_instance_id == instance_id)
+            q = apply_json_filters(q, Response.response_metadata, metadata, s.get_bind().dialect.name)
+            result = await s.execute(keyset(q, Response.created_at, Response.id, cursor, offset, limit))
+            items, next_cursor = split_page(reads.rows(result, row_type), limit)
+            await reads.resolve_async(s, items)
+            return Page(items, await count_rows(s, q, total), next_cursor)
+
+    async def get_response(self, response_id: str, fields: AbstractSet[str] | None = None):
+        """One response as a row (src/services/reads.py), or None."""
+        async with self.session_scope() as s:
+            q, row_type = reads.select_rows(reads.ResponseRow, fields)
+            found = reads.rows(await s.execute(q.where(Response.id == response_id)), row_type)
+            return (await reads.resolve_async(s, found))[0] if found else None
+
+    async def stats(self, prompt_id: str) -> dict:
+        """O(1) read of the prompt_feedback_stats rollup (read-through cached)."""
+        stats = await self.cache.get(stats_key(prompt_id))
+        if stats is None:
+            generation = await self.cache.generation(stats_key(prompt_id))
+            async with self.session_scope() as s:
+                stats = stats_from_row(await s.get(PromptFeedbackStats, prompt_id))
+            await self.after_commit(self.cache.set, stats_key(prompt_id), stats,
+                                    generation=generation)
+        return {"prompt_id": prompt_id, **stats}
+
+    async def timeseries(
+        self, prompt_id: str, size: timedelta, start: datetime, end: datetime
+    ) -> List[dict]:
+        """Per-bucket count / avg / p50 / p90 / min / max over [start, end)."""
+        async with self.session_scope() as s:
+            h = PromptFeedbackHourly
+            rows = await s.execute(
+                select(h.hour, h.count, h.score_sum, h.min_score, h.max_score, h.histogram)
+                .where(h.prompt_id == prompt_id,
+                       h.hour >= bucket_start(start, size),
+                       h.hour < end)
+                .order_by(h.hour)
+            )
+            return fold(rows.all(), size)
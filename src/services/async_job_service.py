@@ -0,0 +1,29 @@
+# src/services/async_job_service.py
+"""
+asyncio side of the optimization job queue – what the API needs
+(enqueue, poll).  Claiming and running jobs is the worker's job, see
+`JobService` / `src.services.job_worker`.
+"""
+from src.models.models import OptimizationJob, Prompt
+from src.services.base_service import AsyncBaseService
+from src.services.job_service import QUEUED
+from src.services.optimization import STRATEGIES
+
+
+class AsyncJobService(AsyncBaseService):
+    async def enqueue(self, prompt_id: str, strategy: str) -> OptimizationJob:
+        """Raises LookupError for an unknown prompt, ValueError for an unknown strategy."""
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown optimization strategy {strategy!r}")
+        async with self.session_scope() as s:
+            if await s.get(Prompt, prompt_id) is None:
+                raise LookupError(prompt_id)
+            job = OptimizationJob(prompt_id=prompt_id, strategy=strategy,
+                                  status=QUEUED, progress=0)
+            s.add(job)
+            await s.flush()
+            return job
+
+    async def get(self, job_id: str) -> OptimizationJob | None:
+        async with self.session_scope() as s:
+            return await s.get(OptimizationJob, job_id)
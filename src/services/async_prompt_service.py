@@ -0,0 +1,295 @@
+# src/services/async_prompt_service.py
+"""
+asyncio twin of `PromptService` used by the async routers.
+Same method names and return shapes; every DB call is awaited.
+"""
+from datetime import datetime
+from typing import AbstractSet, Sequence
+import math
+from sqlalchemy import func, literal, select
+from src.models.models import Prompt, PromptInstance, PromptVersion, Response, Feedback, PromptFeedbackStats
+from src.services import ab_testing, analytics, blobs, reads
+from src.services.base_service import AsyncBaseService
+from src.services.cache import prompt_key, stats_key
+from src.services.json_filters import JSONFilter, apply_json_filters
+from src.services.pagination import Page, count_rows, keyset, split_page
+from src.services.prompt_service import MIN_AVG_SCORE, MIN_FEEDBACK_SAMPLES, readiness_from_stats
+from src.services.stats_rollup import record_score_async, stats_from_row
+from src.services.versions import head_version_id, new_version, snapshot, version_id_stmt
+
+
+def _for_prompt(stmt, prompt_id: str):
+    """Join Feedback → Response → PromptInstance and filter by prompt."""
+    return (
+        stmt.join(Response, Feedback.response_id == Response.id)
+        .join(PromptInstance, Response.prompt_instance_id == PromptInstance.id)
+        .where(PromptInstance.prompt_id == prompt_id)
+    )
+
+
+def _prompt_from_cache(data: dict) -> Prompt:
+    """Rebuild a detached Prompt from its cached `to_dict()`."""
+    fields = dict(data)
+    for name in ("created_at", "updated_at"):
+        if fields[name]:
+            fields[name] = datetime.fromisoformat(fields[name])
+    return Prompt(**fields)
+
+
+def _candidate(prompt_id, count, score_sum, score_sum_sq, low, high, last, gain) -> dict:
+    mean = score_sum / count
+    return {
+        "prompt_id": prompt_id,
+        "total_feedback": count,
+        "avg_score": mean,
+        "stddev": math.sqrt(max(score_sum_sq / count - mean * mean, 0.0)),
+        "min_score": float(low) if low is not None else None,
+        "max_score": float(high) if high is not None else None,
+        "last_score": float(last) if last is not None else None,
+        "expected_gain": float(gain),
+    }
+
+
+class AsyncPromptService(AsyncBaseService):
+    # ---------- CRUD ---------- #
+    async def create(self, text: str, description: str = "") -> str:
+        return (await self.create_prompt(text, description)).id
+
+    async def create_prompt(self, text: str, description: str = "") -> Prompt:
+        # every column has a Python-side default, so the flushed object is
+        # complete – no refresh / re-get round trip
+        async with self.session_scope() as s:
+            p = Prompt(text=text, description=description)
+            s.add(p)
+            await s.flush()
+            s.add(snapshot(p))
+            return p
+
+    async def get(self, prompt_id: str) -> Prompt | None:
+        cached = await self.cache.get(prompt_key(prompt_id))
+        if cached is not None:
+            return _prompt_from_cache(cached)
+        generation = await self.cache.generation(prompt_key(prompt_id))
+        async with self.session_scope() as s:
+            p = await s.get(Prompt, prompt_id)
+        if p is not None:
+            await self.after_commit(self.cache.set, prompt_key(prompt_id), p.to_dict(),
+                                    generation=generation)
+        return p
+
+    async def list_paginated(
+        self, offset: int, limit: int, cursor: str | None = None, total: str = "exact",
+        fields: AbstractSet[str] | None = None,
+    ) -> Page:
+        async with self.session_scope() as s:
+            q, row_type = reads.select_rows(reads.PromptRow, fields)
+            result = await s.execute(keyset(q, Prompt.created_at, Prompt.id, cursor, offset, limit))
+            items, next_cursor = split_page(reads.rows(result, row_type), limit)
+            return Page(items, await count_rows(s, q, total), next_cursor)
+
+    async def update(self, prompt_id: str, **fields) -> Prompt | None:
+        async with self.session_scope() as s:
+            p: Prompt | None = await s.get(Prompt, prompt_id)
+            if not p:
+                return None
+            fields = {k: v for k, v in fields.items() if v is not None}
+            version = new_version(p, fields.pop("text")) if "text" in fields else None
+            for k, v in fields.items():
+                setattr(p, k, v)
+            p.updated_at = datetime.utcnow()
+            if version is not None:
+                s.add(version)
+        # after commit, so later reads miss and see the new row; a read already
+        # in flight holds the older generation, so its set() is dropped
+        await self.after_commit(self.cache.delete, prompt_key(prompt_id))
+        return p
+
+    # ---------- instances ---------- #
+    async def add_instance(
+        self,
+        prompt_id: str,
+        formatted_text: str,
+        context: dict | None = None,
+        version: int | None = None,
+    ) -> reads.InstanceRow:
+        async with self.session_scope() as s:
+            if version is None:
+                version_id = head_version_id(prompt_id)
+            else:
+                version_id = await s.scalar(version_id_stmt(prompt_id, version))
+                if version_id is None:
+                    raise LookupError(f"Prompt {prompt_id} has no version {version}")
+            [text_hash] = await blobs.store_async(s, [formatted_text])
+            inst = PromptInstance(
+                prompt_id=prompt_id,
+                prompt_version_id=version_id,
+                formatted_text_hash=text_hash,
+                context=context,
+            )
+            s.add(inst)
+            await s.flush()
+            await s.refresh(inst)     # prompt_version_id may be a subquery – read back its value
+            return reads.instance_row(inst, formatted_text)
+
+    async def list_instances(
+        self, prompt_id: str, offset: int, limit: int,
+        cursor: str | None = None, total: str = "exact",
+        context: Sequence[JSONFilter] = (),
+        fields: AbstractSet[str] | None = None,
+    ) -> Page:
+        async with self.session_scope() as s:
+            q, row_type = reads.select_rows(reads.InstanceRow, fields)
+            q = q.where(PromptInstance.prompt_id == prompt_id)
+            q = apply_json_filters(q, PromptInstance.context, context, s.get_bind().dialect.name)
+            result = await s.execute(
+                keyset(q, PromptInstance.created_at, PromptInstance.id, cursor, offset, limit)
+            )
+            items, next_cursor = split_page(reads.rows(result, row_type), limit)
+            await reads.resolve_async(s, items)
+            return Page(items, await count_rows(s, q, total), next_cursor)
+
+    async def get_instance(self, instance_id: str, fields: AbstractSet[str] | None = None):
+        """One instance as a row (src/services/reads.py), or None."""
+        async with self.session_scope() as s:
+            q, row_type = reads.select_rows(reads.InstanceRow, fields)
+            found = reads.rows(await s.execute(q.where(PromptInstance.id == instance_id)), row_type)
+            return (await reads.resolve_async(s, found))[0] if found else None
+
+    # ---------- versions ---------- #
+    async def list_versions(self, prompt_id: str) -> list[dict]:
+        """Every recorded version, oldest first, with its attributed feedback count."""
+        async with self.session_scope() as s:
+            feedback = (
+                select(PromptInstance.prompt_version_id, func.count(Feedback.id).label("n"))
+                .join(Response, Response.prompt_instance_id == PromptInstance.id)
+                .join(Feedback, Feedback.response_id == Response.id)
+                .where(PromptInstance.prompt_id == prompt_id)
+                .group_by(PromptInstance.prompt_version_id)
+                .subquery()
+            )
+            rows = await s.execute(
+                select(PromptVersion, func.coalesce(feedback.c.n, 0))
+                .outerjoin(feedback, feedback.c.prompt_version_id == PromptVersion.id)
+                .where(PromptVersion.prompt_id == prompt_id)
+                .order_by(PromptVersion.version)
+            )
+            return [{**v.to_dict(), "feedback_count": n} for v, n in rows]
+
+    async def _version_histogram(self, s, version_id: str):
+        rows = await s.execute(
+            select(Feedback.score, func.count())
+            .join(Response, Feedback.response_id == Response.id)
+            .join(PromptInstance, Response.prompt_instance_id == PromptInstance.id)
+            .where(PromptInstance.prompt_version_id == version_id)
+            .group_by(Feedback.score)
+        )
+        return ab_testing.histogram(rows)
+
+    async def compare_versions(
+        self, prompt_id: str, a: int | None = None, b: int | None = None,
+        alpha: float = ab_testing.DEFAULT_ALPHA,
+        iterations: int = ab_testing.DEFAULT_BOOTSTRAP, seed: int | None = None,
+    ) -> dict:
+        """
+        A/B test version `b` (default: head) against `a` (default: b - 1) on
+        the feedback attributed to each.  Raises LookupError for an unknown
+        prompt or version, ValueError when a == b.
+        """
+        async with self.session_scope() as s:
+            head = await s.scalar(select(Prompt.version).where(Prompt.id == prompt_id))
+            if head is None:
+                raise LookupError(f"Prompt {prompt_id} not found")
+            b = head if b is None else b
+            a = b - 1 if a is None else a
+            if a < 1:
+                raise ValueError("Prompt has a single version, nothing to compare")
+            if a == b:
+                raise ValueError("Versions a and b must differ")
+            ids = dict((await s.execute(
+                select(PromptVersion.version, PromptVersion.id)
+                .where(PromptVersion.prompt_id == prompt_id, PromptVersion.version.in_((a, b)))
+            )).all())
+            missing = [v for v in (a, b) if v not in ids]
+            if missing:
+                raise LookupError(f"Prompt {prompt_id} has no version {missing[0]}")
+            hist_a = await self._version_histogram(s, ids[a])
+            hist_b = await self._version_histogram(s, ids[b])
+        result = ab_testing.compare(hist_a, hist_b, alpha, iterations, seed)
+        result["a"] = {"version": a, "version_id": ids[a], **result["a"]}
+        result["b"] = {"version": b, "version_id": ids[b], **result["b"]}
+        return result
+
+    # ---------- analytics ---------- #
+    async def feedback_stats(self, prompt_id: str) -> dict:
+        cached = await self.cache.get(stats_key(prompt_id))
+        if cached is not None:
+            return cached
+        generation = await self.cache.generation(stats_key(prompt_id))
+        async with self.session_scope() as s:
+            stats = stats_from_row(await s.get(PromptFeedbackStats, prompt_id))
+        await self.after_commit(self.cache.set, stats_key(prompt_id), stats, generation=generation)
+        return stats
+
+    async def ready_for_optimization(self, prompt_id: str) -> dict:
+        return readiness_from_stats(await self.feedback_stats(prompt_id))
+
+    async def optimization_candidates(
+        self, min_samples: int = MIN_FEEDBACK_SAMPLES, max_avg_score: float = MIN_AVG_SCORE,
+        offset: int = 0, limit: int = 100, total: str = "exact",
+    ) -> Page:
+        """
+        Every prompt with >= `min_samples` feedback and an average below
+        `max_avg_score`, best expected gain first.  One range scan of the
+        rollup table; gain = (max_avg_score - avg) * count, i.e. the total
+        score the prompt is short of the bar, computed without division.
+        """
+        st = PromptFeedbackStats
+        gain = (literal(max_avg_score) * st.count - st.score_sum).label("expected_gain")
+        q = (
+            select(st.prompt_id, st.count, st.score_sum, st.score_sum_sq,
+                   st.min_score, st.max_score, st.last_score, gain)
+            .where(st.count >= min_samples, st.score_sum < max_avg_score * st.count)
+        )
+        async with self.session_scope() as s:
+            rows = await s.execute(
+                q.order_by(gain.desc(), st.prompt_id).offset(offset).limit(limit)
+            )
+            items = [_candidate(*row) for row in rows]
+            return Page(items, await count_rows(s, q, total), None)
+
+    async def analytics(
+        self, prompt_ids: Sequence[str], since: datetime | None = None, **options
+    ) -> list[dict]:
+        """`analytics.describe` for many prompts from one column-only scan (input order)."""
+        async with self.session_scope() as s:
+            cols = await analytics.load_columns_async(s, prompt_ids, since)
+        return analytics.describe_all(prompt_ids, cols, **options)
+
+    async def ready_for_optimization_many(
+        self, prompt_ids: Sequence[str], since: datetime | None = None, **options
+    ) -> list[dict]:
+        """Readiness verdicts for many prompts at once, with the full analytics as `stats`."""
+        return [
+            {"prompt_id": stats["prompt_id"], **readiness_from_stats(stats)}
+            for stats in await self.analytics(prompt_ids, since, **options)
+        ]
+
+    async def add_feedback(self, prompt_id: str, score: float) -> Feedback:
+        """Create auto-instance + response + feedback in one shot."""
+        async with self.session_scope() as s:
+            [auto] = await blobs.store_async(s, ["auto"])
+            inst = PromptInstance(prompt_id=prompt_id, prompt_version_id=head_version_id(prompt_id),
+                                  formatted_text_hash=auto)
+            s.add(inst)
+            await s.flush()
+
+            resp = Response(prompt_instance_id=inst.id, content_hash=auto)
+            s.add(resp)
+            await s.flush()
+
+            fb = Feedback(response_id=resp.id, score=score)
+            s.add(fb)
+            await s.flush()
+            await record_score_async(s, prompt_id, score)
+        await self.after_commit(self.cache.delete, stats_key(prompt_id))
+        return fb
@@ -4,22 +4,60 @@ Common functionality shared by all service classes.
 Keeps an internal DB session-scope context-manager so callers don’t
 have to juggle sessions manually.
 """
-from contextlib import contextmanager
-from typing import Generator
+from contextlib import contextmanager, asynccontextmanager
+from typing import AsyncGenerator, Generator
+from src.database import unit_of_work
+from src.database.async_database import AsyncDatabaseManager
 from src.database.database import Database
+from src.services.cache import get_cache
 
 class BaseService:
-    def __init__(self, db: Database):
+    """
+    Sync services (job worker, scripts, tests).  `session_scope` commits on
+    exit, so writers invalidate `cache` with `delete_sync` after the block.
+    """
+    def __init__(self, db: Database, cache=None):
         self.db = db
+        self.cache = cache if cache is not None else get_cache()
 
     @contextmanager
     def session_scope(self) -> Generator:
+        # get_session commits / rolls back / closes – once
         with self.db.db_manager.get_session() as session:
-            try:
+            yield session
+
+
+class AsyncBaseService:
+    """
+    Same idea for the async services.  Inside an HTTP request every scope
+    shares the request's session and the request commits once (see
+    src/database/unit_of_work.py); elsewhere AsyncDatabaseManager.get_session
+    gives each scope its own transaction.
+    `cache` defaults to the process-wide read-through cache.
+    """
+    def __init__(self, db: AsyncDatabaseManager, cache=None):
+        self.db = db
+        self.cache = cache if cache is not None else get_cache()
+
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncGenerator:
+        uow = unit_of_work.current(self.db)
+        if uow is None:
+            async with self.db.get_session() as session:
                 yield session
-                session.commit()
-            except Exception:
-                session.rollback()
-                raise
-            finally:
-                session.close()
+            return
+        session = uow.session
+        try:
+            yield session
+            await session.flush()
+        except Exception:
+            await uow.rollback()
+            raise
+
+    async def after_commit(self, fn, *args, **kwargs):
+        """Run `fn(*args, **kwargs)` once this call's writes are committed (cache upkeep)."""
+        uow = unit_of_work.current(self.db)
+        if uow is None:
+            await fn(*args, **kwargs)
+        else:
+            uow.after_commit(lambda: fn(*args, **kwargs))
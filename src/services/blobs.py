@@ -0,0 +1,201 @@
+# src/services/blobs.py
+"""
+Content-addressed storage for instance and response text.
+
+Instances are mostly a handful of templates filled with a handful of
+values, and responses repeat just as much, so `formatted_text` and
+`content` used to be the same few strings stored over and over – most of
+the bytes of both tables.  Now each distinct text is one `text_blobs` row
+keyed by its BLAKE2b-128 hash, and `prompt_instances.formatted_text_hash` /
+`responses.content_hash` point at it:
+
+* writes – `store()` hashes the texts and inserts their blobs in one
+  INSERT … ON CONFLICT DO NOTHING, so a text seen before costs an index
+  probe and no space.  Texts from BLOB_COMPRESS_MIN_BYTES up are zlib'ed
+  when that makes them smaller.
+* reads – `load()` maps hashes to text: hot blobs come decoded from a
+  per-process LRU (BLOB_CACHE_BYTES), the rest in one SELECT … WHERE hash IN.
+  `reads.resolve()` does this for a page of rows.
+
+Each has an `_async` twin for AsyncSession, as in src/services/stats_rollup.py.
+"""
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.config import Config
+from src.models.models import TextBlob
+
+RAW, ZLIB = "raw", "zlib"
+ZLIB_LEVEL = 6
+LOAD_CHUNK_SIZE = 500          # hashes per SELECT … IN
+
+
+# ---------- encoding ---------- #
+def _digest(raw: bytes) -> str:
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def digest(text: str) -> str:
+    return _digest(text.encode())
+
+
+def _row(raw: bytes, key: str) -> dict:
+    codec, data = RAW, raw
+    if len(raw) >= Config.BLOB_COMPRESS_MIN_BYTES:
+        packed = zlib.compress(raw, ZLIB_LEVEL)
+        if len(packed) < len(raw):
+            codec, data = ZLIB, packed
+    return {"hash": key, "codec": codec, "size": len(raw), "data": data}
+
+
+def encode(text: str) -> dict:
+    """The text_blobs row for `text`."""
+    raw = text.encode()
+    return _row(raw, _digest(raw))
+
+
+def decode(codec: str, data: bytes) -> str:
+    if codec == ZLIB:
+        return zlib.decompress(data).decode()
+    return bytes(data).decode()
+
+
+# ---------- hot blobs ---------- #
+class BlobCache:
+    """Decoded text by hash, LRU within `max_bytes` of UTF-8 text (a blob's
+    `size`).  A hash always means the same text, so entries never go stale."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, text: str, size: Optional[int] = None):
+        """`size`: the text's UTF-8 length, when the caller already knows it."""
+        size = len(text.encode()) if size is None else size
+        if size > self.max_bytes // 8:           # one huge text shouldn't flush the rest
+            return
+        with self._lock:
+            if key in self._data:
+                return
+            self._data[key] = (text, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, old_size) = self._data.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._data), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+cache = BlobCache(Config.BLOB_CACHE_BYTES)
+
+
+# ---------- statements ---------- #
+def _blob_rows(texts: Sequence[str]) -> Tuple[List[str], List[dict]]:
+    """(hash per text, one blob row per distinct text)"""
+    hashes, rows = [], {}
+    for text in texts:
+        raw = text.encode()
+        key = _digest(raw)
+        hashes.append(key)
+        if key not in rows:
+            rows[key] = _row(raw, key)
+    return hashes, list(rows.values())
+
+
+def insert_stmt(dialect_name: str):
+    """INSERT for text_blobs rows that skips the ones already there."""
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    return insert(TextBlob).on_conflict_do_nothing(index_elements=["hash"])
+
+
+def _cached(hashes: Iterable[str]) -> Tuple[Dict[str, str], List[str]]:
+    """(texts found in the LRU, hashes still to fetch)"""
+    found, missing = {}, []
+    for key in set(hashes):
+        text = cache.get(key)
+        if text is None:
+            missing.append(key)
+        else:
+            found[key] = text
+    return found, missing
+
+
+def _select_stmts(missing: List[str]):
+    for start in range(0, len(missing), LOAD_CHUNK_SIZE):
+        chunk = missing[start:start + LOAD_CHUNK_SIZE]
+        yield (select(TextBlob.hash, TextBlob.codec, TextBlob.size, TextBlob.data)
+               .where(TextBlob.hash.in_(chunk)))
+
+
+def _decode_into(found: Dict[str, str], rows) -> None:
+    for key, codec, size, data in rows:
+        found[key] = text = decode(codec, data)
+        cache.put(key, text, size)
+
+
+def _check(found: Dict[str, str], missing: List[str]) -> Dict[str, str]:
+    lost = [key for key in missing if key not in found]
+    if lost:                            # the FKs make this a corrupt database, not a bad request
+        raise LookupError(f"text_blobs missing {len(lost)} hash(es), e.g. {lost[0]}")
+    return found
+
+
+# ---------- sync ---------- #
+def store(session, texts: Sequence[str]) -> List[str]:
+    """Hash of each text, its blob inserted first if needed (call before the
+    rows that reference it, so the foreign keys hold)."""
+    hashes, rows = _blob_rows(texts)
+    if rows:
+        session.execute(insert_stmt(session.get_bind().dialect.name), rows)
+    return hashes
+
+
+def load(session, hashes: Iterable[str]) -> Dict[str, str]:
+    """hash → text for every hash given."""
+    found, missing = _cached(hashes)
+    for stmt in _select_stmts(missing):
+        _decode_into(found, session.execute(stmt))
+    return _check(found, missing)
+
+
+# ---------- async ---------- #
+async def store_async(session, texts: Sequence[str]) -> List[str]:
+    hashes, rows = _blob_rows(texts)
+    if rows:
+        await session.execute(insert_stmt(session.get_bind().dialect.name), rows)
+    return hashes
+
+
+async def load_async(session, hashes: Iterable[str]) -> Dict[str, str]:
+    found, missing = _cached(hashes)
+    for stmt in _select_stmts(missing):
+        _decode_into(found, await session.execute(stmt))
+    return _check(found, missing)
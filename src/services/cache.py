@@ -0,0 +1,246 @@
+# src/services/cache.py
+"""
+Read-through cache used by the async services for the hottest reads
+(prompt by id, prompt stats).
+
+Two backends share one small async API – get / set / delete / stats, plus
+generation() and a blocking delete_sync() for the sync services:
+  * MemoryCache – in-process LRU with a TTL per entry
+  * RedisCache  – shared between workers, JSON values, TTL via SET … PX
+
+Writers – async and sync – invalidate by key after their transaction
+commits.  That alone still races a read-through that fetched the old row
+just before the commit and caches it just after the delete, so every
+delete also bumps the key's generation: a reader takes `generation(key)`
+before it reads the database and passes it to `set(…, generation=…)`,
+which is skipped if the key was invalidated in between.
+
+A MemoryCache only sees its own process's writes: the job worker's
+invalidations don't reach the API processes' caches, where the TTL bounds
+staleness (as for scripts and manual SQL).  Use redis to share them.
+Cached values are plain JSON-friendly dicts and must be treated read-only.
+"""
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from src.config import Config
+
+GENERATION_TTL = 24 * 3600   # redis: how long a key's generation counter is kept after a delete
+
+
+def prompt_key(prompt_id: str) -> str:
+    return f"prompt:{prompt_id}"
+
+
+def stats_key(prompt_id: str) -> str:
+    return f"stats:{prompt_id}"
+
+
+class NullCache:
+    """CACHE_BACKEND=none – every read is a miss, nothing is stored."""
+
+    async def get(self, key: str) -> Optional[Any]:
+        return None
+
+    async def generation(self, key: str) -> int:
+        return 0
+
+    async def set(self, key: str, value: Any, ttl: float | None = None, generation: int | None = None):
+        pass
+
+    async def delete(self, *keys: str):
+        pass
+
+    def delete_sync(self, *keys: str):
+        pass
+
+    async def stats(self) -> dict:
+        return {"backend": "none"}
+
+
+class MemoryCache:
+    def __init__(self, max_entries: int = 10_000, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        # key → tick of its last delete; ticks never repeat, so a generation
+        # dropped from this bounded map can't come back equal
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._ticks = itertools.count(1)
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self.stale_sets = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    async def generation(self, key: str) -> int:
+        with self._lock:
+            return self._generations.get(key, 0)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None, generation: int | None = None):
+        with self._lock:
+            if generation is not None and self._generations.get(key, 0) != generation:
+                self.stale_sets += 1           # invalidated since the caller read it
+                return
+            self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    async def delete(self, *keys: str):
+        self.delete_sync(*keys)
+
+    def delete_sync(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+                self._generations[key] = next(self._ticks)
+                self._generations.move_to_end(key)
+            while len(self._generations) > self.max_entries:
+                self._generations.popitem(last=False)
+
+    async def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "stale_sets": self.stale_sets,
+            }
+
+
+class RedisCache:
+    """
+    `client` is a `redis.asyncio.Redis` (or fakeredis' drop-in in tests);
+    `sync_client`, a `redis.Redis` on the same server, serves delete_sync().
+    A key's generation is the counter at `<prefix>gen:<key>`.
+    """
+
+    def __init__(self, client, ttl: float = 30.0, prefix: str = "promptcraft:", sync_client=None):
+        self.client = client
+        self.sync_client = sync_client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = self.misses = self.stale_sets = 0
+
+    def _gen_key(self, key: str) -> str:
+        return f"{self.prefix}gen:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def generation(self, key: str) -> int:
+        return int(await self.client.get(self._gen_key(key)) or 0)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None, generation: int | None = None):
+        px = int((ttl or self.ttl) * 1000)
+        if generation is None:
+            await self.client.set(self.prefix + key, json.dumps(value), px=px)
+            return
+        from redis.exceptions import WatchError
+        # WATCH the generation: a delete between our check and EXEC aborts the SET
+        async with self.client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(self._gen_key(key))
+                if int(await pipe.get(self._gen_key(key)) or 0) != generation:
+                    self.stale_sets += 1
+                    return
+                pipe.multi()
+                pipe.set(self.prefix + key, json.dumps(value), px=px)
+                await pipe.execute()
+            except WatchError:
+                self.stale_sets += 1
+
+    def _delete_commands(self, pipe, keys):
+        pipe.delete(*(self.prefix + k for k in keys))
+        for key in keys:
+            pipe.incr(self._gen_key(key))
+            pipe.expire(self._gen_key(key), GENERATION_TTL)
+
+    async def delete(self, *keys: str):
+        if keys:
+            async with self.client.pipeline(transaction=True) as pipe:
+                self._delete_commands(pipe, keys)
+                await pipe.execute()
+
+    def delete_sync(self, *keys: str):
+        if not keys:
+            return
+        if self.sync_client is None:
+            raise RuntimeError("RedisCache.delete_sync needs a sync_client")
+        with self.sync_client.pipeline(transaction=True) as pipe:
+            self._delete_commands(pipe, keys)
+            pipe.execute()
+
+    async def stats(self) -> dict:
+        from redis.exceptions import RedisError
+        try:
+            info = await self.client.info("stats")
+        except RedisError:          # INFO disabled / not supported (e.g. fakeredis)
+            info = {}
+        return {
+            "backend": "redis",
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": info.get("evicted_keys"),   # server-wide
+            "expirations": info.get("expired_keys"),
+            "stale_sets": self.stale_sets,
+        }
+
+
+_cache = None
+
+
+def build_cache():
+    backend = Config.CACHE_BACKEND
+    if backend == "memory":
+        return MemoryCache(max_entries=Config.CACHE_MAX_ENTRIES, ttl=Config.CACHE_TTL)
+    if backend == "redis":
+        import redis
+        import redis.asyncio as aioredis
+        return RedisCache(aioredis.from_url(Config.REDIS_URL), ttl=Config.CACHE_TTL,
+                          sync_client=redis.Redis.from_url(Config.REDIS_URL))
+    if backend == "none":
+        return NullCache()
+    raise ValueError(f"Unknown CACHE_BACKEND {backend!r}")
+
+
+def get_cache():
+    """Process-wide cache instance, built from Config on first use."""
+    global _cache
+    if _cache is None:
+        _cache = build_cache()
+    return _cache
+
+
+def set_cache(cache):
+    """Swap the process-wide cache (tests, custom backends)."""
+    global _cache
+    _cache = cache
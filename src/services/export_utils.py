@@ -1,32 +1,188 @@
 # src/services/export_utils.py
 """
-Tiny helper to dump whole tables to CSV / JSON for admins.
+Streaming table dumps (CSV / NDJSON / JSON) for admins.
+
+Rows are read with `yield_per` (server-side cursor on Postgres) as plain
+Core rows and encoded one batch at a time, so memory stays flat no matter
+how big a table is.  The same encoders feed files (sync session) and the
+admin download endpoint (async session → StreamingResponse).  Instance and
+response text is looked up in text_blobs a batch at a time and exported
+under its old column name, so dumps look as they did before blobs.
 """
-import csv, json
+import csv, io, json, zlib
+from datetime import datetime
+from decimal import Decimal
 from pathlib import Path
-from typing import Sequence
+from typing import AsyncIterator, Iterable, Iterator, Sequence
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from src.models import models
+from src.services import blobs
 
-def _rows(query) -> Sequence[dict]:
-    return [row.to_dict() for row in query]
+YIELD_PER = 1000
 
-def export_table_csv(session: Session, model, dst: Path):
+# export name → model (same keys the old JSON dump used)
+EXPORT_TABLES = {
+    "prompts": models.Prompt,
+    "instances": models.PromptInstance,
+    "responses": models.Response,
+    "feedback": models.Feedback,
+}
+FORMATS = ("csv", "ndjson", "json")
+# text_blobs hash column → exported as the text under this name
+BLOB_TEXT = {"formatted_text_hash": "formatted_text", "content_hash": "content"}
+
+
+# ---------- encoding ---------- #
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _cell(value):
+    """CSV cell: JSON document columns are written as JSON text."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return _plain(value)
+
+
+def _columns(model) -> list[str]:
+    return [BLOB_TEXT.get(c.name, c.name) for c in model.__table__.columns]
+
+
+def _blob_positions(model) -> list[int]:
+    return [i for i, c in enumerate(model.__table__.columns) if c.name in BLOB_TEXT]
+
+
+def _hashes(rows, positions: list[int]) -> set:
+    return {row[i] for row in rows for i in positions}
+
+
+def _with_text(rows, positions: list[int], texts: dict) -> list:
+    return [tuple(texts[v] if i in positions else v for i, v in enumerate(row)) for row in rows]
+
+
+def _select(model):
+    return select(model.__table__).execution_options(yield_per=YIELD_PER)
+
+
+def _encode_batch(fmt: str, table: str, columns: Sequence[str], rows, first: bool) -> str:
+    if fmt == "csv":
+        buf = io.StringIO()
+        csv.writer(buf).writerows([[_cell(v) for v in row] for row in rows])
+        return buf.getvalue()
+    dicts = (dict(zip(columns, map(_plain, row))) for row in rows)
+    if fmt == "ndjson":
+        return "".join(json.dumps({"table": table, **d}) + "\n" for d in dicts)
+    # json: rows of one array, comma-separated across batches
+    body = ",\n".join(json.dumps(d) for d in dicts)
+    return body if first or not body else ",\n" + body
+
+
+def _table_open(fmt: str, table: str, columns: Sequence[str], index: int) -> str:
+    if fmt == "csv":
+        buf = io.StringIO()
+        csv.writer(buf).writerow(columns)
+        return buf.getvalue()
+    if fmt == "json":
+        return ("{" if index == 0 else ",") + f"\n{json.dumps(table)}: [\n"
+    return ""
+
+
+def _table_close(fmt: str) -> str:
+    return "\n]" if fmt == "json" else ""
+
+
+def check_export(fmt: str, tables: Sequence[str]):
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}")
+    unknown = [t for t in tables if t not in EXPORT_TABLES]
+    if unknown:
+        raise ValueError(f"Unknown tables: {', '.join(unknown)}")
+    if fmt == "csv" and len(tables) != 1:
+        raise ValueError("CSV export takes exactly one table")
+
+
+# ---------- sync (files / scripts) ---------- #
+def iter_export(session: Session, tables: Sequence[str], fmt: str = "ndjson") -> Iterator[str]:
+    check_export(fmt, tables)
+    for index, table in enumerate(tables):
+        model = EXPORT_TABLES[table]
+        columns, positions = _columns(model), _blob_positions(model)
+        yield _table_open(fmt, table, columns, index)
+        first = True
+        for rows in session.execute(_select(model)).partitions():
+            if positions:
+                rows = _with_text(rows, positions, blobs.load(session, _hashes(rows, positions)))
+            yield _encode_batch(fmt, table, columns, rows, first)
+            first = False
+        yield _table_close(fmt)
+    if fmt == "json":
+        yield "{}" if not tables else "\n}\n"
+
+
+# ---------- async (StreamingResponse) ---------- #
+async def aiter_export(db, tables: Sequence[str], fmt: str = "ndjson") -> AsyncIterator[str]:
+    """`db` is an AsyncDatabaseManager; the session lives as long as the stream."""
+    check_export(fmt, tables)
+    async with db.get_session() as session:
+        for index, table in enumerate(tables):
+            model = EXPORT_TABLES[table]
+            columns, positions = _columns(model), _blob_positions(model)
+            yield _table_open(fmt, table, columns, index)
+            first = True
+            result = await session.stream(_select(model))
+            async for rows in result.partitions():
+                if positions:
+                    texts = await blobs.load_async(session, _hashes(rows, positions))
+                    rows = _with_text(rows, positions, texts)
+                yield _encode_batch(fmt, table, columns, rows, first)
+                first = False
+            yield _table_close(fmt)
+    if fmt == "json":
+        yield "{}" if not tables else "\n}\n"
+
+
+# ---------- gzip ---------- #
+def gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    gz = zlib.compressobj(wbits=31)          # 31 ⇒ gzip container
+    for chunk in chunks:
+        data = gz.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield gz.flush()
+
+
+async def agzip_chunks(chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    gz = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        data = gz.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield gz.flush()
+
+
+# ---------- file helpers (old names kept) ---------- #
+def export_to_file(session: Session, tables: Sequence[str], dst: Path,
+                   fmt: str = "ndjson", compress: bool = False):
     dst.parent.mkdir(parents=True, exist_ok=True)
-    rows = _rows(session.query(model))
-    if not rows:
-        return
-    with dst.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, rows[0].keys())
-        writer.writeheader()
-        writer.writerows(rows)
+    chunks = iter_export(session, tables, fmt)
+    with dst.open("wb") as f:
+        for data in (gzip_chunks(chunks) if compress else (c.encode("utf-8") for c in chunks)):
+            f.write(data)
+
+
+def export_table_csv(session: Session, model, dst: Path):
+    table = next(name for name, m in EXPORT_TABLES.items() if m is model)
+    export_to_file(session, [table], dst, fmt="csv")
+
 
 def export_all_json(session: Session, dst: Path):
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    data = {
-        "prompts": _rows(session.query(models.Prompt)),
-        "instances": _rows(session.query(models.PromptInstance)),
-        "responses": _rows(session.query(models.Response)),
-        "feedback": _rows(session.query(models.Feedback)),
-    }
-    dst.write_text(json.dumps(data, indent=2))
+    export_to_file(session, list(EXPORT_TABLES), dst, fmt="json")
+
+
+def export_all_ndjson(session: Session, dst: Path, compress: bool = False):
+    export_to_file(session, list(EXPORT_TABLES), dst, fmt="ndjson", compress=compress)
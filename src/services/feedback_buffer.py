@@ -0,0 +1,334 @@
+# src/services/feedback_buffer.py
+"""
+Write-behind buffer for feedback scores (FEEDBACK_WRITE_MODE).
+
+    sync      – every POST /responses/{id}/feedback commits on its own (default)
+    group     – requests queue up and are committed together; each request
+                still waits for its group's commit, so a 201 stays durable –
+                many submits share one fsync
+    buffered  – the request returns 202 as soon as the score is queued; a
+                crash loses at most FEEDBACK_FLUSH_INTERVAL_MS of scores
+
+Queued scores are flushed by one background task whenever
+FEEDBACK_FLUSH_MAX_ROWS have arrived or FEEDBACK_FLUSH_INTERVAL_MS has
+passed since the oldest one, through `AsyncFeedbackService.add_scores_batch`
+(one multi-row INSERT plus one rollup update per prompt).  The queue is
+bounded: when it's full a submit waits up to FEEDBACK_ENQUEUE_TIMEOUT for
+room and then fails with `BufferFull` (HTTP 503).  `close()` stops
+accepting and drains everything that was queued – main.py calls it on
+shutdown before the engines are disposed.
+
+A flush that raises (database down, failover, …) is retried
+FEEDBACK_FLUSH_RETRIES times, backing off from FEEDBACK_RETRY_BACKOFF_MS
+and doubling; meanwhile the queue fills and submits get 503s instead of
+piling up.  If it still fails, group-mode requests get the error (nothing
+was promised yet), while buffered scores – already answered 202 – are
+fsync'ed to a JSONL file in FEEDBACK_SPILL_DIR.  Spilled files are
+replayed on start and after the next successful flush (ids already stored
+are skipped, so a replay can be repeated), then deleted.
+
+The queue lives in this process, so each worker process has its own.
+"""
+import asyncio
+import glob
+import json
+import logging
+import os
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+from src.config import Config
+from src.models.ids import new_id
+from src.services.async_feedback_service import AsyncFeedbackService
+
+logger = logging.getLogger(__name__)
+
+WRITE_MODES = ("sync", "group", "buffered")
+MAX_BACKOFF = 5.0                       # seconds between flush retries, at most
+
+
+class BufferFull(Exception):
+    """The queue stayed full for the whole enqueue timeout."""
+
+
+class BufferClosed(Exception):
+    """The buffer is shutting down; write synchronously instead."""
+
+
+@dataclass
+class PendingScore:
+    response_id: str
+    score: float
+    id: str = field(default_factory=new_id)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    done: Optional[asyncio.Future] = None      # set in group mode
+
+
+# ---------- spill files ---------- #
+def _spill(spill_dir: str, batch: List[PendingScore]) -> str:
+    """Write the batch to a new JSONL file, durably (fsync + atomic rename)."""
+    os.makedirs(spill_dir, exist_ok=True)
+    path = os.path.join(spill_dir, f"{uuid.uuid4().hex}.jsonl")
+    with open(path + ".tmp", "w") as f:
+        for item in batch:
+            f.write(json.dumps({"id": item.id, "response_id": item.response_id, "score": item.score,
+                                "created_at": item.created_at.isoformat()}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def _spilled_files(spill_dir: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(spill_dir, "*.jsonl")), key=os.path.getmtime)
+
+
+def _read_spill(path: str) -> List[PendingScore]:
+    with open(path) as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [PendingScore(r["response_id"], r["score"], id=r["id"],
+                         created_at=datetime.fromisoformat(r["created_at"])) for r in rows]
+
+
+class FeedbackBuffer:
+    def __init__(
+        self,
+        db,
+        mode: str = "buffered",
+        max_rows: int = 500,
+        interval: float = 0.05,
+        queue_size: int = 10_000,
+        enqueue_timeout: float = 0.1,
+        retries: int = 5,
+        backoff: float = 0.1,
+        spill_dir: Optional[str] = None,
+    ):
+        if mode not in ("group", "buffered"):
+            raise ValueError(f"FeedbackBuffer mode must be 'group' or 'buffered', not {mode!r}")
+        self.db = db
+        self.mode = mode
+        self.max_rows = max_rows
+        self.interval = interval
+        self.enqueue_timeout = enqueue_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.spill_dir = spill_dir or Config.FEEDBACK_SPILL_DIR
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()           # new item queued, or closing
+        self._closing = False
+        self._spill_pending = False            # spill files may be waiting for a replay
+        self.flushes = self.flushed = self.failed = self.rejected = 0
+        self.retried = self.spilled = self.replayed = 0
+
+    @property
+    def wait_for_commit(self) -> bool:
+        return self.mode == "group"
+
+    # ---------- lifecycle ---------- #
+    def start(self):
+        if self._task is None:
+            self._spill_pending = bool(_spilled_files(self.spill_dir))
+            self._task = asyncio.create_task(self._run(), name="feedback-buffer")
+
+    async def close(self):
+        """Stop accepting, flush everything queued, stop the task."""
+        self._closing = True
+        self._wake.set()
+        if self._task is not None:
+            await self._queue.join()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ---------- producer side ---------- #
+    async def submit(self, response_id: str, score: float) -> PendingScore:
+        """
+        Queue one (already validated) score.  In group mode this returns
+        once the row is committed and raises if its flush failed.
+        """
+        if self._closing:
+            raise BufferClosed()
+        item = PendingScore(response_id, score)
+        if self.wait_for_commit:
+            item.done = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(self._queue.put(item), self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise BufferFull() from None
+        self._wake.set()
+        if item.done is not None:
+            await item.done
+        return item
+
+    # ---------- consumer side ---------- #
+    async def _take_batch(self) -> List[PendingScore]:
+        """Block for one item, then gather more until max_rows, the interval, or close()."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.interval
+        while len(batch) < self.max_rows:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0 or self._closing:
+                break
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        if self._spill_pending:
+            await self._replay()
+        while True:
+            batch = await self._take_batch()
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[PendingScore], skip_existing: bool = False) -> List[dict]:
+        return await AsyncFeedbackService(self.db).add_scores_batch(
+            [(i.response_id, i.score) for i in batch],
+            ids=[i.id for i in batch],
+            created_at=[i.created_at for i in batch],
+            skip_existing=skip_existing,
+        )
+
+    async def _write(self, batch: List[PendingScore]):
+        for attempt in range(self.retries + 1):
+            try:
+                results = await self._flush(batch)
+                break
+            except Exception as exc:
+                if attempt < self.retries:
+                    self.retried += 1
+                    logger.warning("feedback flush of %d scores failed (attempt %d of %d): %s",
+                                   len(batch), attempt + 1, self.retries + 1, exc)
+                    await asyncio.sleep(min(self.backoff * 2 ** attempt, MAX_BACKOFF))
+                    continue
+                logger.exception("feedback flush of %d scores failed, giving up", len(batch))
+                await self._give_up(batch, exc)
+                return
+        self.flushes += 1
+        for item, result in zip(batch, results):
+            if result["ok"]:
+                self.flushed += 1
+            else:                      # e.g. the response was deleted meanwhile
+                self.failed += 1
+                logger.warning("dropped buffered feedback %s: %s", item.id, result["error"])
+            if item.done is not None and not item.done.done():
+                if result["ok"]:
+                    item.done.set_result(None)
+                else:
+                    item.done.set_exception(LookupError(result["error"]))
+        if self._spill_pending:        # the database is back
+            await self._replay()
+
+    async def _give_up(self, batch: List[PendingScore], exc: Exception):
+        waiting = [i for i in batch if i.done is not None]
+        for item in waiting:
+            if not item.done.done():
+                item.done.set_exception(exc)
+        accepted = [i for i in batch if i.done is None]
+        if not accepted:
+            return
+        try:
+            path = await asyncio.to_thread(_spill, self.spill_dir, accepted)
+        except OSError:
+            self.failed += len(accepted)
+            logger.exception("could not spill %d buffered scores – they are lost", len(accepted))
+            return
+        self.spilled += len(accepted)
+        self._spill_pending = True
+        logger.error("spilled %d buffered scores to %s", len(accepted), path)
+
+    async def _replay(self):
+        """Write spilled scores back; a file is deleted only once it's committed."""
+        for path in _spilled_files(self.spill_dir):
+            try:
+                batch = await asyncio.to_thread(_read_spill, path)
+                results = await self._flush(batch, skip_existing=True)
+            except FileNotFoundError:  # another worker replayed it first
+                continue
+            except Exception:
+                logger.warning("replay of %s failed, keeping it for later", path, exc_info=True)
+                return
+            self.replayed += sum(r["ok"] for r in results)
+            for item, result in zip(batch, results):
+                if not result["ok"]:
+                    self.failed += 1
+                    logger.warning("dropped spilled feedback %s: %s", item.id, result["error"])
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._spill_pending = False
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "queued": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+            "max_rows": self.max_rows,
+            "interval_ms": self.interval * 1000,
+            "flushes": self.flushes,
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "retried": self.retried,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+        }
+
+
+# ---------- process-wide instance (like the cache) ---------- #
+_buffer: Optional[FeedbackBuffer] = None
+
+
+def get_feedback_buffer() -> Optional[FeedbackBuffer]:
+    """The running buffer, or None in sync mode."""
+    return _buffer
+
+
+def start_feedback_buffer(db) -> Optional[FeedbackBuffer]:
+    """Build and start the buffer from Config (no-op in sync mode). Needs a running loop."""
+    global _buffer
+    mode = Config.FEEDBACK_WRITE_MODE
+    if mode not in WRITE_MODES:
+        raise ValueError(f"Unknown FEEDBACK_WRITE_MODE {mode!r}")
+    if mode == "sync" or _buffer is not None:
+        return _buffer
+    _buffer = FeedbackBuffer(
+        db,
+        mode=mode,
+        max_rows=Config.FEEDBACK_FLUSH_MAX_ROWS,
+        interval=Config.FEEDBACK_FLUSH_INTERVAL_MS / 1000,
+        queue_size=Config.FEEDBACK_QUEUE_SIZE,
+        enqueue_timeout=Config.FEEDBACK_ENQUEUE_TIMEOUT,
+        retries=Config.FEEDBACK_FLUSH_RETRIES,
+        backoff=Config.FEEDBACK_RETRY_BACKOFF_MS / 1000,
+        spill_dir=Config.FEEDBACK_SPILL_DIR,
+    )
+    _buffer.start()
+    return _buffer
+
+
+async def stop_feedback_buffer():
+    """Drain and stop the buffer (shutdown)."""
+    global _buffer
+    buffer, _buffer = _buffer, None
+    if buffer is not None:
+        await buffer.close()
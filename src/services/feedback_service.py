@@ -1,8 +1,11 @@
 # src/services/feedback_service.py
-from typing import List, Tuple
-from src.models.models import Feedback, Response
+from datetime import datetime
+from typing import List, Sequence, Tuple
+from src.models.models import Feedback, Response, PromptFeedbackStats
+from src.services import analytics, blobs, reads
 from src.services.base_service import BaseService
-import json
+from src.services.cache import stats_key
+from src.services.stats_rollup import prompt_id_for_response_stmt, record_score, stats_from_row
 
 class FeedbackService(BaseService):
     # ---------- submit ---------- #
@@ -10,11 +13,15 @@ class FeedbackService(BaseService):
         if not (0.0 <= score <= 1.0):
             raise ValueError("Score must be between 0.0 and 1.0")
         with self.session_scope() as s:
+            prompt_id = s.scalar(prompt_id_for_response_stmt(response_id))
+            if prompt_id is None:
+                raise LookupError("Response not found")
             fb = Feedback(response_id=response_id, score=score)
             s.add(fb)
             s.flush()
-            s.refresh(fb)
-            return fb
+            record_score(s, prompt_id, score)
+        self.cache.delete_sync(stats_key(prompt_id))      # committed
+        return fb
         
     def add_feedback(self, response_id: str, score: float) -> Feedback:
         """
@@ -44,30 +51,35 @@ class FeedbackService(BaseService):
         instance_id: str,
         content: str,
         metadata: dict | None = None,
-    ) -> Response:
+    ) -> reads.ResponseRow:
         """
-        Creates a Response row for the given PromptInstance and returns it.
+        Creates a Response row for the given PromptInstance and returns it
+        as a row with its content.
         """
         with self.session_scope() as s:
+            [content_hash] = blobs.store(s, [content])
             resp = Response(
                 prompt_instance_id=instance_id,
-                content=content,
-                response_metadata=json.dumps(metadata) if metadata else None,
+                content_hash=content_hash,
+                response_metadata=metadata or None,
             )
             s.add(resp)
             s.flush()
-            s.refresh(resp)
-            return resp
+            return reads.response_row(resp, content)
 
     def list_by_prompt(self, prompt_id: str, offset: int, limit: int):
         return self.list_for_prompt(prompt_id, offset, limit)
 
     def stats(self, prompt_id: str) -> dict:
+        """O(1) read of the prompt_feedback_stats rollup."""
+        with self.session_scope() as s:
+            stats = stats_from_row(s.get(PromptFeedbackStats, prompt_id))
+        return {"prompt_id": prompt_id, **stats}
 
-        items, total = self.list_for_prompt(prompt_id, 0, 10_000_000)
-        avg = float(sum(f.score for f in items) / total) if total else 0.0
-        return {
-            "prompt_id": prompt_id,
-            "total_feedback": total,
-            "avg_score": avg,
-        }
\ No newline at end of file
+    def analytics(
+        self, prompt_ids: Sequence[str], since: datetime | None = None, **options
+    ) -> List[dict]:
+        """`analytics.describe` for many prompts from one column-only scan (input order)."""
+        with self.session_scope() as s:
+            cols = analytics.load_columns(s, prompt_ids, since)
+        return analytics.describe_all(prompt_ids, cols, **options)
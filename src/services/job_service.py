@@ -0,0 +1,126 @@
+# src/services/job_service.py
+"""
+OptimizationJob queue operations used by the worker processes.
+
+Claiming is the only contended step:
+  * Postgres – SELECT … FOR UPDATE SKIP LOCKED, so N workers each grab a
+    different queued row without waiting on each other;
+  * elsewhere – pick a candidate, then a conditional UPDATE
+    (… WHERE status = <what we saw>) that only one claimer can win.
+A running job whose heartbeat is older than the lease is claimable again,
+so a crashed worker's job is retried instead of stuck.
+"""
+import json
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import and_, or_, select, update
+from src.config import Config
+from src.models.models import OptimizationJob, Prompt
+from src.services.base_service import BaseService
+from src.services.cache import prompt_key
+from src.services.versions import new_version
+
+QUEUED, RUNNING, COMPLETED, FAILED = "queued", "running", "completed", "failed"
+
+
+class JobService(BaseService):
+    # ---------- producer side ---------- #
+    def enqueue(self, prompt_id: str, strategy: str) -> OptimizationJob:
+        with self.session_scope() as s:
+            job = OptimizationJob(prompt_id=prompt_id, strategy=strategy,
+                                  status=QUEUED, progress=0)
+            s.add(job)
+            s.flush()
+            return job
+
+    def get(self, job_id: str) -> OptimizationJob | None:
+        with self.session_scope() as s:
+            return s.get(OptimizationJob, job_id)
+
+    # ---------- worker side ---------- #
+    def _claimable(self, now: datetime):
+        stale = now - timedelta(seconds=Config.JOB_LEASE_SECONDS)
+        return or_(
+            OptimizationJob.status == QUEUED,
+            and_(OptimizationJob.status == RUNNING, OptimizationJob.heartbeat_at < stale),
+        )
+
+    def claim_next(self, worker_id: str) -> Optional[OptimizationJob]:
+        """Atomically take the oldest claimable job, or None if there is none."""
+        now = datetime.utcnow()
+        with self.session_scope() as s:
+            q = (
+                select(OptimizationJob)
+                .where(self._claimable(now))
+                .order_by(OptimizationJob.created_at)
+                .limit(1)
+            )
+            if s.get_bind().dialect.name == "postgresql":
+                job = s.scalars(q.with_for_update(skip_locked=True)).first()
+                if job is None:
+                    return None
+            else:
+                job = s.scalars(q).first()
+                if job is None:
+                    return None
+                won = s.execute(
+                    update(OptimizationJob)
+                    .where(OptimizationJob.id == job.id,
+                           OptimizationJob.status == job.status,
+                           OptimizationJob.heartbeat_at.is_not_distinct_from(job.heartbeat_at))
+                    .values(status=RUNNING, worker_id=worker_id, heartbeat_at=now)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if not won:
+                    return None
+            job.status, job.worker_id, job.heartbeat_at = RUNNING, worker_id, now
+            return job
+
+    def report_progress(self, job_id: str, worker_id: str, progress: int) -> bool:
+        """Store progress and renew the lease; False if we no longer own the job."""
+        with self.session_scope() as s:
+            return bool(s.execute(
+                update(OptimizationJob)
+                .where(OptimizationJob.id == job_id,
+                       OptimizationJob.worker_id == worker_id,
+                       OptimizationJob.status == RUNNING)
+                .values(progress=max(0, min(100, int(progress))),
+                        heartbeat_at=datetime.utcnow())
+            ).rowcount)
+
+    def complete(self, job_id: str, worker_id: str, new_text: str) -> Optional[str]:
+        """
+        Write `new_text` as the next version of the job's prompt – the same
+        path as a text update – and finish the job in one transaction.
+        Returns the prompt id, or None if the lease was lost to another
+        worker meanwhile.
+        """
+        with self.session_scope() as s:
+            job = s.scalars(
+                select(OptimizationJob)
+                .where(OptimizationJob.id == job_id,
+                       OptimizationJob.worker_id == worker_id,
+                       OptimizationJob.status == RUNNING)
+                .with_for_update()
+            ).first()
+            if job is None:
+                return None
+            # locked, so a concurrent update can't take the same version number
+            prompt = s.get(Prompt, job.prompt_id, with_for_update=True)
+            version = new_version(prompt, new_text)
+            if version is not None:
+                s.add(version)
+            job.status, job.progress = COMPLETED, 100
+            job.result = json.dumps({"prompt_id": prompt.id, "version": prompt.version})
+            job.completed_at = datetime.utcnow()
+        self.cache.delete_sync(prompt_key(prompt.id))     # committed
+        return prompt.id
+
+    def fail(self, job_id: str, worker_id: str, error: str):
+        with self.session_scope() as s:
+            s.execute(
+                update(OptimizationJob)
+                .where(OptimizationJob.id == job_id, OptimizationJob.worker_id == worker_id)
+                .values(status=FAILED, error_message=error[:2000],
+                        completed_at=datetime.utcnow())
+            )
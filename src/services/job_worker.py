@@ -0,0 +1,112 @@
+# src/services/job_worker.py
+"""
+Optimization job worker.
+
+    python -m src.services.job_worker                 # one worker process
+    python -m src.services.job_worker --processes 4   # a local pool
+    python -m src.services.job_worker --once          # drain the queue and exit
+
+Workers only talk to each other through the optimization_jobs table
+(see JobService.claim_next), so any number of them – on one machine or
+many – can run against the same database without double-processing.
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import traceback
+import uuid
+from src.config import Config
+from src.database.database import Database
+from src.models.models import OptimizationJob
+from src.services.job_service import JobService
+from src.services.optimization import get_strategy
+from src.services.prompt_service import PromptService
+
+
+def new_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def process_job(db: Database, job: OptimizationJob, worker_id: str) -> str | None:
+    """Run one claimed job to completion. Returns the prompt id (None on failure)."""
+    jobs = JobService(db)
+    try:
+        prompts = PromptService(db)
+        prompt = prompts.get(job.prompt_id)
+        stats = prompts.feedback_stats(job.prompt_id)
+        strategy = get_strategy(job.strategy)
+        new_text = strategy.optimize(
+            prompt.text, stats, lambda pct: jobs.report_progress(job.id, worker_id, pct)
+        )
+        return jobs.complete(job.id, worker_id, new_text)
+    except Exception as exc:
+        jobs.fail(job.id, worker_id, f"{exc}\n{traceback.format_exc()}")
+        return None
+
+
+def run_worker(
+    db: Database,
+    worker_id: str | None = None,
+    poll_interval: float | None = None,
+    stop: threading.Event | None = None,
+    once: bool = False,
+) -> int:
+    """Claim and run jobs until `stop` is set (or the queue is empty with once=True)."""
+    worker_id = worker_id or new_worker_id()
+    poll_interval = Config.JOB_POLL_INTERVAL if poll_interval is None else poll_interval
+    stop = stop or threading.Event()
+    jobs = JobService(db)
+    done = 0
+    while not stop.is_set():
+        job = jobs.claim_next(worker_id)
+        if job is None:
+            if once:
+                break
+            stop.wait(poll_interval)
+            continue
+        process_job(db, job, worker_id)
+        done += 1
+    return done
+
+
+def _worker_main(database_url: str | None, once: bool):
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    db = Database(database_url)
+    try:
+        n = run_worker(db, stop=stop, once=once)
+        print(f"✅ worker {os.getpid()} processed {n} jobs")
+    finally:
+        db.db_manager.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run optimization job workers")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--once", action="store_true", help="exit when the queue is empty")
+    args = parser.parse_args()
+
+    if args.processes == 1:
+        _worker_main(args.database_url, args.once)
+        return
+    procs = [
+        multiprocessing.Process(target=_worker_main, args=(args.database_url, args.once))
+        for _ in range(args.processes)
+    ]
+    for p in procs:
+        p.start()
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
+
+
+if __name__ == "__main__":
+    main()
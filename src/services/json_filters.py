@@ -0,0 +1,99 @@
+# src/services/json_filters.py
+"""
+`key<op>value` filters over JSON document columns (instance context,
+response metadata):
+
+    model=gpt-4        latency_ms>2000        usage.total_tokens<=512
+    cached=true        region!=eu
+
+Values are parsed as JSON when they can be (numbers, true/false, null,
+"quoted strings"), otherwise taken as plain strings.  Dots address nested
+keys.  On Postgres `=` becomes `@>` containment and the rest a jsonpath
+`@@` predicate – both served by the jsonb_path_ops GIN indexes.
+Elsewhere it falls back to json_extract comparisons.
+"""
+import json
+import re
+from typing import NamedTuple, Sequence
+from sqlalchemy import and_, func, literal, or_
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH
+
+_FILTER = re.compile(r"^\s*([A-Za-z0-9_\-]+(?:\.[A-Za-z0-9_\-]+)*)\s*(!=|>=|<=|=|>|<)\s*(.*?)\s*$")
+_COMPARE = {
+    "=": lambda a, b: a == b, "!=": lambda a, b: a != b,
+    ">": lambda a, b: a > b, ">=": lambda a, b: a >= b,
+    "<": lambda a, b: a < b, "<=": lambda a, b: a <= b,
+}
+
+
+class JSONFilter(NamedTuple):
+    path: tuple
+    op: str
+    value: object
+
+
+def parse_filter(expr: str) -> JSONFilter:
+    """Raises ValueError for anything that isn't `key<op>value`."""
+    m = _FILTER.match(expr)
+    if not m or not m.group(3):
+        raise ValueError(f"Invalid filter {expr!r}, expected key<op>value (e.g. model=gpt-4)")
+    key, op, raw = m.groups()
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    if isinstance(value, (dict, list)):
+        raise ValueError(f"Invalid filter {expr!r}: only scalar values are supported")
+    if op not in ("=", "!=") and (value is None or isinstance(value, bool)):
+        raise ValueError(f"Invalid filter {expr!r}: {op} needs a number or string")
+    return JSONFilter(tuple(key.split(".")), op, value)
+
+
+def parse_filters(exprs: Sequence[str] | None) -> list[JSONFilter]:
+    return [parse_filter(e) for e in exprs or ()]
+
+
+def _nested(path: tuple, value) -> dict:
+    doc = value
+    for key in reversed(path):
+        doc = {key: doc}
+    return doc
+
+
+def _path(f: JSONFilter) -> str:
+    return "$" + "".join(f'."{k}"' for k in f.path)
+
+
+def _jsonpath(f: JSONFilter) -> str:
+    op = "==" if f.op == "=" else f.op
+    return f"{_path(f)} {op} {json.dumps(f.value)}"
+
+
+def _postgres_clause(column, f: JSONFilter):
+    if f.op == "=":
+        return column.op("@>")(literal(_nested(f.path, f.value), JSONB))
+    clause = column.op("@@")(literal(_jsonpath(f), JSONPATH))
+    if f.op == "!=":
+        # jsonpath `!=` is unknown (not true) when the key is missing; SQL
+        # semantics elsewhere treat "missing" as "not equal" – match that
+        clause = or_(clause, ~column.op("@?")(literal(_path(f), JSONPATH)), column.is_(None))
+    return clause
+
+
+def _generic_clause(column, f: JSONFilter):
+    extracted = func.json_extract(column, _path(f))
+    value = f.value
+    if isinstance(value, bool):
+        value = int(value)                 # SQLite's json_extract returns 1/0
+    if value is None:
+        return extracted.is_(None) if f.op == "=" else extracted.is_not(None)
+    if f.op == "!=":
+        return or_(extracted != value, extracted.is_(None))
+    return _COMPARE[f.op](extracted, value)
+
+
+def apply_json_filters(stmt, column, filters: Sequence[JSONFilter], dialect_name: str):
+    if not filters:
+        return stmt
+    build = _postgres_clause if dialect_name == "postgresql" else _generic_clause
+    return stmt.where(and_(*(build(column, f) for f in filters)))
@@ -0,0 +1,95 @@
+# src/services/metrics.py
+"""
+In-process request metrics, rendered in the Prometheus text format at
+GET /metrics.
+
+Per route template (not raw path, so ids don't blow up the label set):
+
+    http_request_duration_seconds      histogram {method, route, status}
+    http_request_sql_statements        histogram {method, route}
+    http_request_sql_seconds           histogram {method, route}
+    http_request_serialize_seconds     histogram {method, route}
+
+Values are recorded by src/api/timing.py.  Each worker process keeps its
+own registry; Prometheus sums them when scraping every worker.
+"""
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels → [per-bucket counts (last = +Inf), sum]
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, labels))
+            sep = "," if base else ""
+            cumulative = 0
+            for le, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le_text = "+Inf" if le == float("inf") else _format(le)
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{le_text}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {_format(total[0])}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.duration = Histogram("http_request_duration_seconds", "Request latency.",
+                                  ("method", "route", "status"), DURATION_BUCKETS)
+        self.sql_statements = Histogram("http_request_sql_statements", "SQL statements per request.",
+                                        ("method", "route"), COUNT_BUCKETS)
+        self.sql_seconds = Histogram("http_request_sql_seconds", "Time in SQL per request.",
+                                     ("method", "route"), DURATION_BUCKETS)
+        self.serialize_seconds = Histogram("http_request_serialize_seconds",
+                                           "Response validation + encoding time per request.",
+                                           ("method", "route"), DURATION_BUCKETS)
+
+    def observe_request(self, method: str, route: str, status: int, duration: float,
+                        sql_statements: int, sql_seconds: float, serialize_seconds: float):
+        with self._lock:
+            self.duration.observe((method, route, str(status)), duration)
+            self.sql_statements.observe((method, route), sql_statements)
+            self.sql_seconds.observe((method, route), sql_seconds)
+            self.serialize_seconds.observe((method, route), serialize_seconds)
+
+    def render(self) -> str:
+        with self._lock:
+            lines = []
+            for histogram in (self.duration, self.sql_statements, self.sql_seconds, self.serialize_seconds):
+                lines += histogram.render()
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        self.__init__()
+
+
+metrics = MetricsRegistry()
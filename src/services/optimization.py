@@ -0,0 +1,80 @@
+# src/services/optimization.py
+"""
+Pluggable prompt-optimization strategies run by the job worker.
+
+A strategy gets the current prompt text plus its feedback stats and
+returns the improved text, calling `progress(pct)` as it goes.  Register
+new ones with `register_strategy`; `OptimizationJob.strategy` holds the
+name.
+"""
+from typing import Callable, Dict
+from src.config import Config
+
+ProgressFn = Callable[[int], None]
+
+
+class Strategy:
+    name = "base"
+
+    def optimize(self, text: str, stats: dict, progress: ProgressFn) -> str:
+        raise NotImplementedError
+
+
+class StubStrategy(Strategy):
+    """Deterministic, offline – for local runs and tests."""
+    name = "stub"
+
+    def optimize(self, text: str, stats: dict, progress: ProgressFn) -> str:
+        progress(50)
+        avg = stats.get("avg_score") or 0.0
+        return f"{text}\n\n(Be precise and concise. Previous avg score: {avg:.2f})"
+
+
+class SimpleAIStrategy(Strategy):
+    """One LLM call asking for a rewrite of the prompt."""
+    name = "simple_ai"
+
+    def __init__(self, client=None, model: str | None = None):
+        self._client = client
+        self.model = model or Config.OPENAI_MODEL
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        return self._client
+
+    def optimize(self, text: str, stats: dict, progress: ProgressFn) -> str:
+        progress(10)
+        completion = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": "You improve LLM prompts. Reply with the new prompt only."},
+                {"role": "user", "content": (
+                    f"Prompt:\n{text}\n\n"
+                    f"It scored {stats.get('avg_score', 0):.2f} on average over "
+                    f"{stats.get('total_feedback', 0)} rated responses "
+                    f"(last scores: {stats.get('last_scores', [])}). Rewrite it to score higher."
+                )},
+            ],
+        )
+        progress(90)
+        return completion.choices[0].message.content.strip()
+
+
+STRATEGIES: Dict[str, Callable[[], Strategy]] = {
+    StubStrategy.name: StubStrategy,
+    SimpleAIStrategy.name: SimpleAIStrategy,
+}
+
+
+def register_strategy(name: str, factory: Callable[[], Strategy]):
+    STRATEGIES[name] = factory
+
+
+def get_strategy(name: str) -> Strategy:
+    try:
+        return STRATEGIES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown optimization strategy {name!r}")
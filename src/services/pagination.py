@@ -0,0 +1,82 @@
+# src/services/pagination.py
+"""
+Keyset (cursor) pagination shared by every list query.
+
+Lists are ordered newest-first by (created_at, id).  `next_cursor` is an
+opaque token of the last row's key; the next page is
+`WHERE (created_at, id) < cursor`, which the (…, created_at, id) indexes
+answer directly – page 10,000 costs the same as page 1.
+
+Totals are optional: "exact" runs a COUNT, "estimate" asks the planner
+(Postgres; falls back to exact elsewhere), "none" skips it.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional
+from sqlalchemy import func, literal, select, tuple_
+
+TOTAL_MODES = ("exact", "estimate", "none")
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[datetime, str]:
+    """Raises ValueError for anything that isn't one of our tokens."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(row_id)
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def keyset(stmt, created_col, id_col, cursor: str | None, offset: int, limit: int):
+    """Newest-first page of `stmt`, fetching one extra row to detect more."""
+    stmt = stmt.order_by(created_col.desc(), id_col.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        # bind with the columns' own types (tuple_ would fall back to
+        # VARCHAR, which a native uuid id column won't compare against)
+        stmt = stmt.where(tuple_(created_col, id_col)
+                          < tuple_(literal(created_at, created_col.type), literal(row_id, id_col.type)))
+    elif offset:
+        stmt = stmt.offset(offset)   # legacy offset paging, still supported
+    return stmt.limit(limit + 1)
+
+
+def split_page(rows: list, limit: int) -> tuple[list, Optional[str]]:
+    """Trim the look-ahead row and build next_cursor from the last item."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def check_total_mode(mode: str):
+    if mode not in TOTAL_MODES:
+        raise ValueError(f"total must be one of {', '.join(TOTAL_MODES)}")
+
+
+async def count_rows(session, stmt, mode: str = "exact") -> Optional[int]:
+    """Total for the (unordered, unlimited) `stmt` according to `mode`."""
+    check_total_mode(mode)
+    if mode == "none":
+        return None
+    dialect = session.get_bind().dialect
+    if mode == "estimate" and dialect.name == "postgresql":
+        sql = stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+        conn = await session.connection()
+        doc = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        doc = json.loads(doc) if isinstance(doc, str) else doc
+        return int(doc[0]["Plan"]["Plan Rows"])
+    return await session.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
@@ -1,14 +1,36 @@
 # src/services/prompt_service.py
 from datetime import datetime
 from typing import List, Tuple
-from sqlalchemy import func
-from src.models.models import Prompt, PromptInstance, Response, Feedback
+from src.models.models import Prompt, PromptInstance, Response, Feedback, PromptFeedbackStats
+from src.services import blobs, reads
 from src.services.base_service import BaseService
+from src.services.cache import prompt_key, stats_key
+from src.services.stats_rollup import record_score, stats_from_row
+from src.services.versions import head_version_id, new_version, snapshot, version_id_stmt
 
 # Thresholds used elsewhere (could be moved to settings)
 MIN_FEEDBACK_SAMPLES = 5
 MIN_AVG_SCORE = 0.7
 
+def readiness_from_stats(stats: dict) -> dict:
+    """Readiness verdict for a `feedback_stats` dict (shared with the async service)."""
+    ready = stats["total_feedback"] >= MIN_FEEDBACK_SAMPLES
+    return {
+        "ready": ready,
+        "reason": (
+            "Not enough feedback yet"
+            if stats["total_feedback"] < MIN_FEEDBACK_SAMPLES
+            else "Average score already high"
+            if stats["avg_score"] >= MIN_AVG_SCORE
+            else "Meets criteria"
+        ),
+        "stats": stats,
+        "thresholds": {
+            "min_samples": MIN_FEEDBACK_SAMPLES,
+            "max_avg_score": MIN_AVG_SCORE,
+        },
+    }
+
 class PromptService(BaseService):
     # ---------- CRUD ---------- #
     def create(self, text: str, description: str = "") -> str:
@@ -16,7 +38,7 @@ class PromptService(BaseService):
             p = Prompt(text=text, description=description)
             s.add(p)
             s.flush()
-            s.refresh(p)
+            s.add(snapshot(p))
             return p.id
 
     def get(self, prompt_id: str) -> Prompt | None:
@@ -34,91 +56,73 @@ class PromptService(BaseService):
             p: Prompt | None = s.get(Prompt, prompt_id)
             if not p:
                 return None
-            # business rule: bump version on *any* text change
             fields = {k: v for k, v in fields.items() if v is not None}
-            # business rule: bump version on *any* text change
-            if "text" in fields and fields["text"] != p.text:
-                p.version += 1
+            version = new_version(p, fields.pop("text")) if "text" in fields else None
             for k, v in fields.items():
                 setattr(p, k, v)
             p.updated_at = datetime.utcnow()
-            return p
+            if version is not None:
+                s.add(version)
+        self.cache.delete_sync(prompt_key(prompt_id))     # committed
+        return p
         
     # ---------- instances / responses ---------- #
     def add_instance(
         self,
         prompt_id: str,
         formatted_text: str,
-        context: str | None = None,
-    ) -> PromptInstance:
+        context: dict | None = None,
+        version: int | None = None,
+    ) -> reads.InstanceRow:
         """
-        Creates a PromptInstance for the given prompt and returns the ORM
-        object (already persistent).
+        Creates a PromptInstance for the given prompt, pinned to `version`
+        (default: the current head), and returns it as a row with its text.
+        Raises LookupError for an unknown version.
         """
         with self.session_scope() as s:
+            if version is None:
+                version_id = head_version_id(prompt_id)
+            else:
+                version_id = s.scalar(version_id_stmt(prompt_id, version))
+                if version_id is None:
+                    raise LookupError(f"Prompt {prompt_id} has no version {version}")
+            [text_hash] = blobs.store(s, [formatted_text])
             inst = PromptInstance(
                 prompt_id=prompt_id,
-                formatted_text=formatted_text,
+                prompt_version_id=version_id,
+                formatted_text_hash=text_hash,
                 context=context,
             )
             s.add(inst)
             s.flush()
-            s.refresh(inst)
-            return inst
+            s.refresh(inst)     # prompt_version_id may be a subquery – read back its value
+            return reads.instance_row(inst, formatted_text)
         
     # ---------- analytics ---------- #
     def feedback_stats(self, prompt_id: str) -> dict:
         """
-        Returns total feedback, avg score, last_score and last_5 trend list.
+        Returns total feedback, avg score, last_score and last_5 trend list
+        (plus min / max / stddev) from the prompt_feedback_stats rollup.
         """
         with self.session_scope() as s:
-            # join Feedback → Response → PromptInstance to filter by prompt
-            q = (
-                s.query(Feedback.score)
-                .join(Response, Feedback.response_id == Response.id)
-                .join(PromptInstance, Response.prompt_instance_id == PromptInstance.id)
-                .filter(PromptInstance.prompt_id == prompt_id)
-                .order_by(Feedback.created_at.desc())
-            )
-            total = q.count()
-            avg_score = q.with_entities(func.avg(Feedback.score)).scalar() or 0
-            last_scores = [float(row[0]) for row in q.limit(5).all()]
-            return {
-                "total_feedback": total,
-                "avg_score": float(avg_score),
-                "last_scores": last_scores,
-                "last_score": last_scores[0] if last_scores else None,
-            }
+            return stats_from_row(s.get(PromptFeedbackStats, prompt_id))
 
     def ready_for_optimization(self, prompt_id: str) -> dict:
-        stats = self.feedback_stats(prompt_id)
-        ready = stats["total_feedback"] >= MIN_FEEDBACK_SAMPLES
-        return {
-            "ready": ready,
-            "reason": (
-                "Not enough feedback yet"
-                if stats["total_feedback"] < MIN_FEEDBACK_SAMPLES
-                else "Average score already high"
-                if stats["avg_score"] >= MIN_AVG_SCORE
-                else "Meets criteria"
-            ),
-            "stats": stats,
-            "thresholds": {
-                "min_samples": MIN_FEEDBACK_SAMPLES,
-                "max_avg_score": MIN_AVG_SCORE,
-            },
-        }
+        return readiness_from_stats(self.feedback_stats(prompt_id))
     def add_feedback(self, prompt_id: str, score: float) -> Feedback:
         """Create auto-instance + response + feedback in one shot."""
         with self.session_scope() as s:
+            [auto] = blobs.store(s, ["auto"])
             inst = PromptInstance(prompt_id=prompt_id,
-                                  formatted_text="auto")
+                                  prompt_version_id=head_version_id(prompt_id),
+                                  formatted_text_hash=auto)
             s.add(inst); s.flush()
 
-            resp = Response(prompt_instance_id=inst.id, content="auto")
+            resp = Response(prompt_instance_id=inst.id, content_hash=auto)
             s.add(resp); s.flush()
 
             fb   = Feedback(response_id=resp.id, score=score)
             s.add(fb); s.flush()
-            s.refresh(fb)
-            return fb
+            record_score(s, prompt_id, score)
+        self.cache.delete_sync(stats_key(prompt_id))      # committed
+        return fb
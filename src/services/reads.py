@@ -0,0 +1,167 @@
+# src/services/reads.py
+"""
+ORM-free read path for the list endpoints.
+
+`select(Prompt)` + `scalars()` builds a full ORM object per row – instance
+state, identity-map entry, attribute instrumentation – which the route then
+copies into a DTO with `model_validate(from_attributes=True)` and throws
+away.  Here a Core `select()` of just the columns the API returns is turned
+into `__slots__` dataclass rows that go straight into the response:
+orjson serializes slotted dataclasses natively (src/api/responses.py), so
+there is no DTO pass either.
+
+Each `*Row` mirrors its `*Out` schema field for field and `*_COLUMNS` lists
+the matching columns in the same order; `rows(result, Row)` builds them.
+`benchmarks/read_path.py` compares CPU and memory per row with the ORM path.
+
+Sparse fieldsets (`?fields=`): `select_rows(Row, fields)` selects only the
+requested columns – `id` and `created_at` always, they are the keyset
+cursor – into a slotted subset class, so a dashboard listing instances by
+context never reads `formatted_text` (up to 50k chars) off the table.
+
+`formatted_text` and `content` live in text_blobs (src/services/blobs.py):
+they are selected as the blob hash and `resolve()` / `resolve_async()`
+swap in the text for the rows actually returned.
+"""
+from dataclasses import dataclass, fields as dataclass_fields, make_dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import AbstractSet, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Float, cast, select
+
+from src.models.models import Feedback, Prompt, PromptInstance, Response
+from src.services import blobs
+
+
+@dataclass(slots=True)
+class PromptRow:
+    id: str
+    text: str
+    version: int
+    parent_id: Optional[str]
+    description: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(slots=True)
+class InstanceRow:
+    id: str
+    prompt_id: str
+    prompt_version_id: Optional[str]
+    formatted_text: str
+    context: Optional[dict]
+    created_at: datetime
+
+
+@dataclass(slots=True)
+class ResponseRow:
+    id: str
+    prompt_instance_id: str
+    content: str
+    response_metadata: dict          # {} for none, as ResponseOut has always returned
+    created_at: datetime
+
+
+@dataclass(slots=True)
+class FeedbackRow:
+    id: str
+    response_id: str
+    score: float
+    created_at: datetime
+
+
+PROMPT_COLUMNS = (Prompt.id, Prompt.text, Prompt.version, Prompt.parent_id,
+                  Prompt.description, Prompt.created_at, Prompt.updated_at)
+INSTANCE_COLUMNS = (PromptInstance.id, PromptInstance.prompt_id, PromptInstance.prompt_version_id,
+                    PromptInstance.formatted_text_hash.label("formatted_text"), PromptInstance.context,
+                    PromptInstance.created_at)
+RESPONSE_COLUMNS = (Response.id, Response.prompt_instance_id, Response.content_hash.label("content"),
+                    Response.response_metadata, Response.created_at)
+# DECIMAL(3,2) would come back as Decimal; the API has always sent floats
+FEEDBACK_COLUMNS = (Feedback.id, Feedback.response_id, cast(Feedback.score, Float).label("score"),
+                    Feedback.created_at)
+
+
+_TABLES = {
+    PromptRow: (Prompt, PROMPT_COLUMNS),
+    InstanceRow: (PromptInstance, INSTANCE_COLUMNS),
+    ResponseRow: (Response, RESPONSE_COLUMNS),
+    FeedbackRow: (Feedback, FEEDBACK_COLUMNS),
+}
+ALWAYS = ("id", "created_at")
+
+
+def field_names(row_type) -> Tuple[str, ...]:
+    return tuple(f.name for f in dataclass_fields(row_type))
+
+
+@lru_cache(maxsize=None)
+def _subset(row_type, names: frozenset):
+    keep = [f.name in names or f.name in ALWAYS for f in dataclass_fields(row_type)]
+    subset = make_dataclass(
+        row_type.__name__,
+        [(f.name, f.type) for f, k in zip(dataclass_fields(row_type), keep) if k],
+        slots=True,
+    )
+    return subset, tuple(c for c, k in zip(_TABLES[row_type][1], keep) if k)
+
+
+def select_rows(row_type, names: Optional[AbstractSet[str]] = None):
+    """(statement, row class) for all of `row_type`'s fields, or only `names`
+    (plus ALWAYS).  Unknown names are the caller's to reject."""
+    table, columns = _TABLES[row_type]
+    if names is not None:
+        row_type, columns = _subset(row_type, frozenset(names))
+    return select(*columns).select_from(table), row_type
+
+
+def rows(result: Iterable[tuple], row_type) -> List:
+    """Build `row_type` instances from a Core result (or any iterable of tuples)."""
+    names = list(row_type.__dataclass_fields__)
+    if "response_metadata" in names:
+        i = names.index("response_metadata")
+        return [row_type(*row[:i], row[i] or {}, *row[i + 1:]) for row in result]
+    return [row_type(*row) for row in result]
+
+
+# selected as text_blobs hashes until resolved
+BLOB_FIELDS = ("formatted_text", "content")
+
+
+def _blob_fields(items: List) -> List[str]:
+    return [name for name in BLOB_FIELDS if items and hasattr(items[0], name)]
+
+
+def _swap(items: List, names: List[str], texts: dict) -> List:
+    for item in items:
+        for name in names:
+            setattr(item, name, texts[getattr(item, name)])
+    return items
+
+
+def resolve(session, items: List) -> List:
+    """Replace blob hashes with their text, in place; returns `items`."""
+    names = _blob_fields(items)
+    if not names:
+        return items
+    return _swap(items, names, blobs.load(session, {getattr(i, n) for i in items for n in names}))
+
+
+async def resolve_async(session, items: List) -> List:
+    names = _blob_fields(items)
+    if not names:
+        return items
+    return _swap(items, names, await blobs.load_async(session, {getattr(i, n) for i in items for n in names}))
+
+
+def instance_row(inst: PromptInstance, formatted_text: str) -> InstanceRow:
+    """The row for an instance just written, whose text the caller has."""
+    return InstanceRow(inst.id, inst.prompt_id, inst.prompt_version_id, formatted_text,
+                       inst.context, inst.created_at)
+
+
+def response_row(resp: Response, content: str) -> ResponseRow:
+    return ResponseRow(resp.id, resp.prompt_instance_id, content, resp.response_metadata or {},
+                       resp.created_at)
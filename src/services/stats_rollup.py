@@ -0,0 +1,304 @@
+# src/services/stats_rollup.py
+"""
+Incrementally maintained per-prompt feedback rollup (`prompt_feedback_stats`).
+
+Every feedback writer calls `record_score` / `record_score_async` in the
+same transaction as the Feedback insert, so stats and readiness become a
+primary-key read instead of a join over all feedback.  The same call
+bumps the prompt's `prompt_feedback_hourly` row (count / sum / min / max
+and a 0.01-resolution score histogram) that the timeseries endpoint reads.  If the table ever
+drifts (manual SQL, restored backup, first deploy) rebuild it from raw
+feedback:
+
+    python -m src.services.stats_rollup [--database-url URL]
+"""
+import argparse
+import json
+import math
+from collections import Counter
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Sequence
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from src.models.models import (
+    Feedback, PromptFeedbackHourly, PromptFeedbackStats, PromptInstance, Response,
+)
+
+LAST_N = 5  # size of the last-scores ring
+HIST_SLOTS = 101  # hourly histogram: one slot per 0.01 of score
+SCORE_STEP = Decimal("0.01")  # feedback.score is NUMERIC(3,2)
+
+
+# ---------- pure helpers ---------- #
+def quantize_score(score) -> Decimal:
+    """A score as the database stores it: rounded half-up to 0.01, so a float
+    like 0.555 folds into the rollups exactly as the stored row will read back."""
+    return Decimal(str(score)).quantize(SCORE_STEP, ROUND_HALF_UP)
+
+
+def score_slot(score) -> int:
+    """Histogram slot (0 … HIST_SLOTS - 1) of a score."""
+    return int(quantize_score(score) / SCORE_STEP)
+
+
+def apply_scores(row: PromptFeedbackStats, scores: Sequence) -> None:
+    """Fold scores (oldest first) into a rollup row (in place)."""
+    decimals = [quantize_score(score) for score in scores]
+    values = [float(score) for score in decimals]
+    row.count = (row.count or 0) + len(values)
+    row.score_sum = (row.score_sum or 0.0) + sum(values)
+    row.score_sum_sq = (row.score_sum_sq or 0.0) + sum(v * v for v in values)
+    lo, hi = min(decimals), max(decimals)
+    row.min_score = lo if row.min_score is None else min(row.min_score, lo)
+    row.max_score = hi if row.max_score is None else max(row.max_score, hi)
+    row.last_score = decimals[-1]
+    ring = json.loads(row.last_scores) if row.last_scores else []
+    row.last_scores = json.dumps((values[::-1] + ring)[:LAST_N])
+    row.updated_at = datetime.utcnow()
+
+
+def hour_of(at: datetime) -> datetime:
+    return at.replace(minute=0, second=0, microsecond=0)
+
+
+def by_hour(scores: Sequence, at: datetime | Sequence[datetime] | None = None) -> dict:
+    """hour → its scores; `at` is one time for all of them (default: now) or one per score."""
+    if at is None or isinstance(at, datetime):
+        return {hour_of(at or datetime.utcnow()): list(scores)}
+    hours: dict = {}
+    for score, when in zip(scores, at):
+        hours.setdefault(hour_of(when), []).append(score)
+    return hours
+
+
+def apply_hourly_counts(row: PromptFeedbackHourly, counts: dict) -> None:
+    """Fold {score: occurrences} into an hourly row's count / sum / min / max / histogram."""
+    quantized: Counter = Counter()
+    for score, n in counts.items():
+        quantized[quantize_score(score)] += n
+    hist = json.loads(row.histogram) if row.histogram else [0] * HIST_SLOTS
+    for score, n in quantized.items():
+        hist[score_slot(score)] += n
+    row.count = (row.count or 0) + sum(quantized.values())
+    row.score_sum = (row.score_sum or 0.0) + float(sum(score * n for score, n in quantized.items()))
+    lo, hi = min(quantized), max(quantized)
+    row.min_score = lo if row.min_score is None else min(row.min_score, lo)
+    row.max_score = hi if row.max_score is None else max(row.max_score, hi)
+    row.histogram = json.dumps(hist, separators=(",", ":"))
+
+
+def apply_hourly(row: PromptFeedbackHourly, scores: Sequence) -> None:
+    apply_hourly_counts(row, Counter(scores))
+
+
+def apply_score(row: PromptFeedbackStats, score) -> None:
+    """Fold one score into a rollup row (in place)."""
+    apply_scores(row, [score])
+
+
+def stats_from_row(row: PromptFeedbackStats | None) -> dict:
+    """Shape a rollup row like the old `feedback_stats` dict (plus spread)."""
+    if row is None or not row.count:
+        return {
+            "total_feedback": 0,
+            "avg_score": 0.0,
+            "last_scores": [],
+            "last_score": None,
+            "min_score": None,
+            "max_score": None,
+            "stddev": None,
+        }
+    mean = row.score_sum / row.count
+    variance = max(row.score_sum_sq / row.count - mean * mean, 0.0)
+    return {
+        "total_feedback": row.count,
+        "avg_score": mean,
+        "last_scores": json.loads(row.last_scores) if row.last_scores else [],
+        "last_score": float(row.last_score) if row.last_score is not None else None,
+        "min_score": float(row.min_score),
+        "max_score": float(row.max_score),
+        "stddev": math.sqrt(variance),
+    }
+
+
+# ---------- statements shared by the sync / async writers ---------- #
+def prompt_id_for_response_stmt(response_id: str):
+    return (
+        select(PromptInstance.prompt_id)
+        .join(Response, Response.prompt_instance_id == PromptInstance.id)
+        .where(Response.id == response_id)
+    )
+
+
+def prompt_ids_for_responses_stmt(response_ids: Sequence[str]):
+    """(response_id, prompt_id) for every existing response in the list."""
+    return (
+        select(Response.id, PromptInstance.prompt_id)
+        .join(PromptInstance, Response.prompt_instance_id == PromptInstance.id)
+        .where(Response.id.in_(response_ids))
+    )
+
+
+def _insert_ignore(dialect_name: str, model, keys: list, **values):
+    """INSERT … ON CONFLICT DO NOTHING so concurrent first writers don't collide."""
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    return insert(model).values(**values).on_conflict_do_nothing(index_elements=keys)
+
+
+def _ensure_row_stmt(dialect_name: str, prompt_id: str):
+    return _insert_ignore(dialect_name, PromptFeedbackStats, ["prompt_id"],
+                          prompt_id=prompt_id, count=0, score_sum=0.0, score_sum_sq=0.0)
+
+
+def _ensure_hour_stmt(dialect_name: str, prompt_id: str, hour: datetime):
+    return _insert_ignore(dialect_name, PromptFeedbackHourly, ["prompt_id", "hour"],
+                          prompt_id=prompt_id, hour=hour, count=0, score_sum=0.0)
+
+
+def _locked_row_stmt(prompt_id: str):
+    return (
+        select(PromptFeedbackStats)
+        .where(PromptFeedbackStats.prompt_id == prompt_id)
+        .with_for_update()
+    )
+
+
+def _hour_row_stmt(prompt_id: str, hour: datetime):
+    # no FOR UPDATE needed: the caller already holds the prompt's stats row lock
+    return select(PromptFeedbackHourly).where(
+        PromptFeedbackHourly.prompt_id == prompt_id, PromptFeedbackHourly.hour == hour
+    )
+
+
+# ---------- writers ---------- #
+def record_scores(session: Session, prompt_id: str, scores: Sequence,
+                  at: datetime | Sequence[datetime] | None = None) -> PromptFeedbackStats:
+    """Fold scores (oldest first) into the prompt's rollup and the hourly rows
+    of `at` – one time for all, or each score's own (see `by_hour`)."""
+    dialect_name = session.get_bind().dialect.name
+    session.execute(_ensure_row_stmt(dialect_name, prompt_id))
+    row = session.scalars(_locked_row_stmt(prompt_id)).one()
+    apply_scores(row, scores)
+    for hour, in_hour in sorted(by_hour(scores, at).items()):
+        session.execute(_ensure_hour_stmt(dialect_name, prompt_id, hour))
+        apply_hourly(session.scalars(_hour_row_stmt(prompt_id, hour)).one(), in_hour)
+    return row
+
+
+def record_score(session: Session, prompt_id: str, score) -> PromptFeedbackStats:
+    return record_scores(session, prompt_id, [score])
+
+
+async def record_scores_async(session, prompt_id: str, scores: Sequence,
+                              at: datetime | Sequence[datetime] | None = None) -> PromptFeedbackStats:
+    dialect_name = session.get_bind().dialect.name
+    await session.execute(_ensure_row_stmt(dialect_name, prompt_id))
+    row = (await session.scalars(_locked_row_stmt(prompt_id))).one()
+    apply_scores(row, scores)
+    for hour, in_hour in sorted(by_hour(scores, at).items()):
+        await session.execute(_ensure_hour_stmt(dialect_name, prompt_id, hour))
+        apply_hourly((await session.scalars(_hour_row_stmt(prompt_id, hour))).one(), in_hour)
+    return row
+
+
+async def record_score_async(session, prompt_id: str, score) -> PromptFeedbackStats:
+    return await record_scores_async(session, prompt_id, [score])
+
+
+# ---------- rebuild ---------- #
+def rebuild(session: Session) -> int:
+    """Recompute the whole rollup from raw feedback. Returns #prompts."""
+    chain = (
+        select(PromptInstance.prompt_id.label("prompt_id"), Feedback.score, Feedback.created_at)
+        .join(Response, Feedback.response_id == Response.id)
+        .join(PromptInstance, Response.prompt_instance_id == PromptInstance.id)
+        .subquery()
+    )
+    totals = session.execute(
+        select(
+            chain.c.prompt_id,
+            func.count(),
+            func.sum(chain.c.score),
+            func.sum(chain.c.score * chain.c.score),
+            func.min(chain.c.score),
+            func.max(chain.c.score),
+        ).group_by(chain.c.prompt_id)
+    ).all()
+
+    ranked = select(
+        chain.c.prompt_id,
+        chain.c.score,
+        func.row_number()
+        .over(partition_by=chain.c.prompt_id, order_by=chain.c.created_at.desc())
+        .label("rn"),
+    ).subquery()
+    rings: dict[str, list] = {}
+    for prompt_id, score, _ in session.execute(
+        select(ranked).where(ranked.c.rn <= LAST_N).order_by(ranked.c.prompt_id, ranked.c.rn)
+    ):
+        rings.setdefault(prompt_id, []).append(float(score))
+
+    session.execute(delete(PromptFeedbackStats))
+    now = datetime.utcnow()
+    session.add_all(
+        PromptFeedbackStats(
+            prompt_id=prompt_id,
+            count=count,
+            score_sum=float(total),
+            score_sum_sq=float(total_sq),
+            min_score=lo,
+            max_score=hi,
+            last_score=rings[prompt_id][0],
+            last_scores=json.dumps(rings[prompt_id]),
+            updated_at=now,
+        )
+        for prompt_id, count, total, total_sq, lo, hi in totals
+    )
+    rebuild_hourly(session, chain)
+    return len(totals)
+
+
+def _hour_expr(dialect_name: str, column):
+    if dialect_name == "postgresql":
+        return func.date_trunc("hour", column)
+    return func.strftime("%Y-%m-%d %H:00:00", column)
+
+
+def rebuild_hourly(session: Session, chain) -> int:
+    """Recompute prompt_feedback_hourly from the (prompt_id, score, created_at) chain."""
+    hour = _hour_expr(session.get_bind().dialect.name, chain.c.created_at).label("hour")
+    rows: dict[tuple, PromptFeedbackHourly] = {}
+    for prompt_id, at, score, n in session.execute(
+        select(chain.c.prompt_id, hour, chain.c.score, func.count())
+        .group_by(chain.c.prompt_id, hour, chain.c.score)
+        .order_by(chain.c.prompt_id, hour)
+    ):
+        at = datetime.fromisoformat(at) if isinstance(at, str) else at
+        row = rows.get((prompt_id, at))
+        if row is None:
+            row = rows[(prompt_id, at)] = PromptFeedbackHourly(
+                prompt_id=prompt_id, hour=at, count=0, score_sum=0.0)
+        apply_hourly_counts(row, {score: n})
+    session.execute(delete(PromptFeedbackHourly))
+    session.add_all(rows.values())
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rebuild prompt_feedback_stats / prompt_feedback_hourly from raw feedback")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    from src.database.database import Database
+    db = Database(args.database_url)
+    db.initialize()
+    with db.db_manager.get_session() as session:
+        n = rebuild(session)
+    print(f"✅ Rebuilt feedback stats for {n} prompts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# src/services/versions.py
+"""
+Prompt version history.
+
+Every prompt write (create, text update, optimization job) records an
+immutable `prompt_versions` row, and every new instance is pinned to the
+version that was head when it was logged, so feedback can be attributed
+to the exact text that produced it (see src/services/ab_testing.py).
+
+    python -m src.services.versions [--database-url URL]
+
+backfills a head version row for prompts created before versioning.
+Instances logged before then keep prompt_version_id NULL: which text
+they saw is unknown, so they are left out of version comparisons.
+"""
+import argparse
+from datetime import datetime
+from sqlalchemy import and_, exists, insert, select
+from src.models.ids import new_id
+from src.models.models import Prompt, PromptVersion
+
+
+def snapshot(prompt: Prompt) -> PromptVersion:
+    """Version row for the prompt's current text (prompt must have id + version)."""
+    return PromptVersion(prompt_id=prompt.id, version=prompt.version, text=prompt.text)
+
+
+def new_version(prompt: Prompt, text: str) -> PromptVersion | None:
+    """
+    Make `text` the prompt's head: bump its version and return the version
+    row to add.  Business rule: *any* text change is a new version; the same
+    text is none (returns None).  Shared by the update endpoint and
+    optimization jobs, so both leave the same history.
+    """
+    if text == prompt.text:
+        return None
+    prompt.version += 1
+    prompt.text = text
+    prompt.updated_at = datetime.utcnow()
+    return snapshot(prompt)
+
+
+def head_version_id(prompt_id: str):
+    """Scalar subquery → id of the prompt's current version (NULL if never recorded)."""
+    return (
+        select(PromptVersion.id)
+        .join(Prompt, and_(Prompt.id == PromptVersion.prompt_id,
+                           Prompt.version == PromptVersion.version))
+        .where(Prompt.id == prompt_id)
+        .scalar_subquery()
+    )
+
+
+def version_id_stmt(prompt_id: str, version: int):
+    return select(PromptVersion.id).where(
+        PromptVersion.prompt_id == prompt_id, PromptVersion.version == version
+    )
+
+
+def backfill(session) -> int:
+    """Insert the missing head version row of every prompt. Returns rows added."""
+    missing = session.execute(
+        select(Prompt.id, Prompt.version, Prompt.text, Prompt.updated_at).where(
+            ~exists().where(PromptVersion.prompt_id == Prompt.id,
+                            PromptVersion.version == Prompt.version)
+        )
+    ).all()
+    if missing:
+        session.execute(insert(PromptVersion), [
+            {"id": new_id(), "prompt_id": pid, "version": version, "text": text,
+             "created_at": updated_at}
+            for pid, version, text, updated_at in missing
+        ])
+    return len(missing)
+
+
+def main():
+    from src.database.database import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Backfill prompt_versions head rows")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+    manager = DatabaseManager(args.database_url)
+    try:
+        manager.create_tables()
+        with manager.get_session() as session:
+            added = backfill(session)
+            session.commit()
+        print(f"✅ backfilled {added} prompt version(s)")
+    finally:
+        manager.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,14 @@
 import os
 import tempfile
 import uuid
+from contextlib import contextmanager
 
 import pytest
 from fastapi.testclient import TestClient
 
 from src.main import app
+from src.api.timing import observe_requests
+from src.database.query_stats import QueryBudgetExceeded, check_budget
 from src.database.database import Database  # Person A’s class
 
 
@@ -32,7 +35,40 @@ def db(test_db_url):
 def client(db, monkeypatch):
     """
     Overrides DATABASE_URL env var so the app uses the test DB.
-    Then returns FastAPI TestClient.
+    Then yields FastAPI TestClient.
     """
     monkeypatch.setenv("DATABASE_URL", db.db_manager.engine.url.render_as_string(hide_password=False))
-    return TestClient(app)
+    # context manager ⇒ startup/shutdown run and all requests share one event loop
+    with TestClient(app) as c:
+        yield c
+
+
+# ---------- QUERY BUDGETS ---------- #
+@pytest.fixture()
+def query_budget():
+    """
+    with query_budget(3):
+        client.get(...)
+
+    fails if a request made inside the block ran more than 3 SQL statements;
+    the message lists them, most repeated first, so an N+1 stands out.
+    Pass {"GET /api/v1/prompts/{prompt_id}": 1, ...} to budget per route –
+    then a request to a route without a budget fails too.
+    """
+    @contextmanager
+    def budget(max_statements):
+        seen = []
+        stop = observe_requests(lambda method, route, status, sql: seen.append((f"{method} {route}", sql)))
+        try:
+            yield seen
+        finally:
+            stop()
+        for what, sql in seen:
+            if isinstance(max_statements, int):
+                check_budget(sql, max_statements, what)
+            elif what not in max_statements:
+                raise QueryBudgetExceeded(f"no query budget for {what}")
+            else:
+                check_budget(sql, max_statements[what], what)
+
+    return budget
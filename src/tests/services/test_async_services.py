@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+from src.database.async_database import AsyncDatabaseManager, to_async_url
+from src.services.async_feedback_service import AsyncFeedbackService
+from src.services.async_prompt_service import AsyncPromptService
+
+
+def test_to_async_url():
+    assert to_async_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert to_async_url("sqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+    assert to_async_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+def test_async_prompt_stats_under_concurrency(db, test_db_url):
+    async def run():
+        adb = AsyncDatabaseManager(test_db_url)
+        try:
+            psvc, fsvc = AsyncPromptService(adb), AsyncFeedbackService(adb)
+            pid = await psvc.create("Ping", "")
+            fb = await psvc.add_feedback(pid, 0.8)
+            await asyncio.gather(*(fsvc.add_score(fb.response_id, 0.6) for _ in range(20)))
+            return pid, await psvc.feedback_stats(pid), await fsvc.stats(pid)
+        finally:
+            await adb.dispose()
+
+    pid, stats, fstats = asyncio.run(run())
+    assert stats["total_feedback"] == 21
+    assert stats["avg_score"] == pytest.approx((0.8 + 20 * 0.6) / 21)
+    assert len(stats["last_scores"]) == 5
+    assert fstats["total_feedback"] == 21
@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.config import Config
+from src.database.async_database import AsyncDatabaseManager
+from src.main import app
+from src.services.async_feedback_service import AsyncFeedbackService
+from src.services.async_prompt_service import AsyncPromptService
+from src.services.feedback_buffer import BufferClosed, BufferFull, FeedbackBuffer, get_feedback_buffer
+
+
+def test_group_commit_and_drain_on_close(db, test_db_url):
+    async def run():
+        adb = AsyncDatabaseManager(test_db_url)
+        try:
+            psvc = AsyncPromptService(adb)
+            pid = await psvc.create("Buffered", "")
+            fb = await psvc.add_feedback(pid, 0.5)
+            group = FeedbackBuffer(adb, mode="group", max_rows=100, interval=0.05)
+            group.start()
+            await asyncio.gather(*(group.submit(fb.response_id, 0.7) for _ in range(30)))
+            group_stats = group.stats()
+            await group.close()
+
+            behind = FeedbackBuffer(adb, mode="buffered", interval=10)   # only close() flushes
+            behind.start()
+            items = [await behind.submit(fb.response_id, 0.9) for _ in range(10)]
+            await behind.close()
+            with pytest.raises(BufferClosed):
+                await behind.submit(fb.response_id, 0.9)
+            return group_stats, behind.stats(), items, await AsyncFeedbackService(adb).stats(pid)
+        finally:
+            await adb.dispose()
+
+    group_stats, behind_stats, items, stats = asyncio.run(run())
+    assert group_stats["flushed"] == 30 and group_stats["flushes"] < 30
+    assert behind_stats["flushed"] == 10 and behind_stats["flushes"] == 1
+    assert len({i.id for i in items}) == 10
+    assert stats["total_feedback"] == 41
+
+
+def test_backpressure_when_queue_is_full(db, test_db_url):
+    async def run():
+        buffer = FeedbackBuffer(None, queue_size=1, enqueue_timeout=0.01)   # never started
+        await buffer.submit("r1", 0.5)
+        with pytest.raises(BufferFull):
+            await buffer.submit("r2", 0.5)
+        return buffer.stats()
+
+    assert asyncio.run(run())["rejected"] == 1
+
+
+def test_buffered_endpoint_returns_202(db, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", db.db_manager.engine.url.render_as_string(hide_password=False))
+    monkeypatch.setattr(Config, "FEEDBACK_WRITE_MODE", "buffered")
+    with TestClient(app) as c:
+        p_id = c.post("/api/v1/prompts", json={"text": "buffered endpoint"}).json()["data"]["id"]
+        inst = c.post(f"/api/v1/prompts/{p_id}/instances", json={"formatted_text": "x"}).json()["data"]
+        resp = c.post(f"/api/v1/instances/{inst['id']}/responses", json={"content": "y"}).json()["data"]
+        r = c.post(f"/api/v1/responses/{resp['id']}/feedback", json={"score": 0.4})
+        assert r.status_code == 202 and r.json()["data"]["id"]
+        assert c.post("/api/v1/responses/nope/feedback", json={"score": 0.4}).status_code == 404
+        assert c.get("/api/v1/health/feedback-buffer").json()["data"]["mode"] == "buffered"
+    assert get_feedback_buffer() is None              # shutdown drained and stopped it
+    monkeypatch.setattr(Config, "FEEDBACK_WRITE_MODE", "sync")
+    with TestClient(app) as c:
+        assert c.get(f"/api/v1/prompts/{p_id}/stats").json()["data"]["total_feedback"] == 1
+
+
+def _failing_flushes(monkeypatch, failures: int):
+    """Make the next `failures` add_scores_batch calls raise, as if the database were down."""
+    real = AsyncFeedbackService.add_scores_batch
+    left = {"n": failures}
+
+    async def flaky(self, *args, **kwargs):
+        if left["n"]:
+            left["n"] -= 1
+            raise ConnectionError("database is down")
+        return await real(self, *args, **kwargs)
+
+    monkeypatch.setattr(AsyncFeedbackService, "add_scores_batch", flaky)
+
+
+def test_failed_flush_is_retried(db, test_db_url, monkeypatch, tmp_path):
+    _failing_flushes(monkeypatch, 2)
+
+    async def run():
+        adb = AsyncDatabaseManager(test_db_url)
+        try:
+            psvc = AsyncPromptService(adb)
+            pid = await psvc.create("Retried", "")
+            fb = await psvc.add_feedback(pid, 0.5)
+            buffer = FeedbackBuffer(adb, mode="buffered", interval=0.01, backoff=0.01,
+                                    spill_dir=str(tmp_path))
+            buffer.start()
+            for _ in range(5):
+                await buffer.submit(fb.response_id, 0.8)
+            await buffer.close()
+            return buffer.stats(), await AsyncFeedbackService(adb).stats(pid)
+        finally:
+            await adb.dispose()
+
+    buffer_stats, stats = asyncio.run(run())
+    assert buffer_stats["retried"] == 2 and buffer_stats["flushed"] == 5
+    assert buffer_stats["spilled"] == 0 and buffer_stats["failed"] == 0
+    assert stats["total_feedback"] == 6
+
+
+def test_unwritable_batch_is_spilled_and_replayed(db, test_db_url, monkeypatch, tmp_path):
+    _failing_flushes(monkeypatch, 3)
+
+    async def run():
+        adb = AsyncDatabaseManager(test_db_url)
+        try:
+            psvc = AsyncPromptService(adb)
+            pid = await psvc.create("Spilled", "")
+            fb = await psvc.add_feedback(pid, 0.5)
+            down = FeedbackBuffer(adb, mode="buffered", interval=10, retries=2, backoff=0.01,
+                                  spill_dir=str(tmp_path))
+            down.start()
+            for _ in range(4):
+                await down.submit(fb.response_id, 0.3)
+            await down.close()                       # every attempt fails → spill
+            [spilled] = list(tmp_path.glob("*.jsonl"))
+            saved = spilled.read_text()
+
+            up = FeedbackBuffer(adb, mode="buffered", interval=0.01, spill_dir=str(tmp_path))
+            up.start()                               # replays the spill file
+            await up.submit(fb.response_id, 0.9)
+            await up.close()
+
+            spilled.write_text(saved)                # a replay that already committed …
+            again = FeedbackBuffer(adb, mode="buffered", spill_dir=str(tmp_path))
+            again.start()
+            await asyncio.sleep(0.05)
+            await again.close()                      # … is skipped, not double-counted
+            return (down.stats(), up.stats(), again.stats(), list(tmp_path.iterdir()),
+                    await AsyncFeedbackService(adb).stats(pid))
+        finally:
+            await adb.dispose()
+
+    down_stats, up_stats, again_stats, left, stats = asyncio.run(run())
+    assert down_stats["spilled"] == 4 and down_stats["flushed"] == 0
+    assert up_stats["replayed"] == 4 and up_stats["flushed"] == 1
+    assert again_stats["replayed"] == 4
+    assert left == []
+    assert stats["total_feedback"] == 1 + 4 + 1
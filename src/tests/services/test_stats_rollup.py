@@ -0,0 +1,111 @@
+import pytest
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import select
+from src.database.async_database import AsyncDatabaseManager
+from src.models.models import PromptFeedbackHourly, PromptFeedbackStats
+from src.services.async_feedback_service import AsyncFeedbackService
+from src.services.feedback_service import FeedbackService
+from src.services.prompt_service import PromptService
+from src.services.stats_rollup import apply_hourly, apply_scores, rebuild
+
+
+def test_rollup_matches_rebuild(db):
+    psvc, fsvc = PromptService(db), FeedbackService(db)
+    pid = psvc.create("Rollup", "")
+    fb = psvc.add_feedback(pid, 0.2)
+    for score in (0.4, 1.0, 0.6, 0.8, 0.5):
+        fsvc.add_score(fb.response_id, score)
+
+    incremental = psvc.feedback_stats(pid)
+    assert incremental["total_feedback"] == 6
+    assert incremental["avg_score"] == pytest.approx(3.5 / 6)
+    assert incremental["min_score"] == 0.2
+    assert incremental["max_score"] == 1.0
+    assert incremental["last_score"] == 0.5
+    assert incremental["last_scores"] == [0.5, 0.8, 0.6, 1.0, 0.4]
+
+    with db.db_manager.get_session() as s:
+        s.get(PromptFeedbackStats, pid).count = 999   # simulate drift
+    with db.db_manager.get_session() as s:
+        rebuild(s)
+    rebuilt = psvc.feedback_stats(pid)
+    assert rebuilt["total_feedback"] == 6
+    assert rebuilt["avg_score"] == pytest.approx(incremental["avg_score"])
+    assert rebuilt["stddev"] == pytest.approx(incremental["stddev"])
+
+
+
+def test_hourly_rollup_matches_rebuild(db):
+    psvc, fsvc = PromptService(db), FeedbackService(db)
+    pid = psvc.create("Hourly", "")
+    fb = psvc.add_feedback(pid, 0.25)
+    for score in (0.25, 0.75):
+        fsvc.add_score(fb.response_id, score)
+
+    def hourly():
+        with db.db_manager.get_session() as s:
+            rows = s.scalars(select(PromptFeedbackHourly).where(PromptFeedbackHourly.prompt_id == pid)).all()
+            return [(r.hour, r.count, r.score_sum, float(r.min_score), float(r.max_score),
+                     json.loads(r.histogram)) for r in rows]
+
+    [(hour, count, total, lo, hi, hist)] = incremental = hourly()
+    assert (hour.minute, count, total, lo, hi) == (0, 3, 1.25, 0.25, 0.75)
+    assert hist[25] == 2 and hist[75] == 1 and sum(hist) == 3
+    with db.db_manager.get_session() as s:
+        rebuild(s)
+    assert hourly() == incremental
+
+
+def test_batch_rollup_uses_each_scores_own_hour(db, test_db_url):
+    psvc = PromptService(db)
+    pid = psvc.create("Late flush", "")
+    fb = psvc.add_feedback(pid, 0.5)
+    now = datetime.utcnow()
+    earlier = now - timedelta(hours=2)
+
+    async def run():
+        adb = AsyncDatabaseManager(test_db_url)
+        try:
+            await AsyncFeedbackService(adb).add_scores_batch(
+                [(fb.response_id, 0.3), (fb.response_id, 0.9), (fb.response_id, 0.7)],
+                created_at=[earlier, now, earlier],
+            )
+        finally:
+            await adb.dispose()
+
+    asyncio.run(run())
+
+    def hourly():
+        with db.db_manager.get_session() as s:
+            rows = s.scalars(select(PromptFeedbackHourly)
+                             .where(PromptFeedbackHourly.prompt_id == pid)
+                             .order_by(PromptFeedbackHourly.hour)).all()
+            return [(r.hour, r.count, float(r.min_score), float(r.max_score)) for r in rows]
+
+    incremental = hourly()
+    assert incremental[0] == (earlier.replace(minute=0, second=0, microsecond=0), 2, 0.3, 0.7)
+    assert sum(count for _, count, _, _ in incremental) == 4
+    with db.db_manager.get_session() as s:
+        rebuild(s)
+    assert hourly() == incremental
+
+
+def test_feedback_for_unknown_response_is_404(client):
+    r = client.post("/api/v1/responses/does-not-exist/feedback", json={"score": 0.5})
+    assert r.status_code == 404
+
+
+def test_rollups_round_scores_like_the_column():
+    stats, hourly = PromptFeedbackStats(), PromptFeedbackHourly()
+    apply_scores(stats, [0.555, 0.125])
+    apply_hourly(hourly, [0.555, 0.125, 0.4449])
+    assert (stats.min_score, stats.max_score, stats.last_score) == (
+        Decimal("0.13"), Decimal("0.56"), Decimal("0.13"))
+    assert stats.score_sum == pytest.approx(0.69)
+    assert (hourly.min_score, hourly.max_score) == (Decimal("0.13"), Decimal("0.56"))
+    hist = json.loads(hourly.histogram)
+    assert hist[13] == hist[44] == hist[56] == 1
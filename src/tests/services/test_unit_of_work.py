@@ -0,0 +1,56 @@
+import asyncio
+import uuid
+
+import pytest
+
+from src.api.timing import observe_requests
+from src.database.async_database import AsyncDatabaseManager
+from src.database.unit_of_work import unit_of_work
+from src.services.async_prompt_service import AsyncPromptService
+from src.services.cache import MemoryCache, prompt_key
+
+
+def test_services_share_one_transaction(db, test_db_url):
+    async def run():
+        adb = AsyncDatabaseManager(test_db_url)
+        cache = MemoryCache()
+        svc = AsyncPromptService(adb, cache=cache)
+        try:
+            async with unit_of_work(adb) as uow:
+                pid = await svc.create("UoW", "")
+                await svc.get(pid)                       # reads its own uncommitted write
+                assert await cache.get(prompt_key(pid)) is None    # cached only after commit
+                await uow.commit()
+            committed = await cache.get(prompt_key(pid))
+
+            async with unit_of_work(adb) as uow:
+                doomed = await svc.create("UoW rollback", "")
+                with pytest.raises(LookupError):         # a failing call rolls the request back
+                    await svc.add_instance(doomed, "x", version=7)
+                await uow.commit()
+            return committed, await AsyncPromptService(adb, cache=MemoryCache()).get(doomed)
+        finally:
+            await adb.dispose()
+
+    committed, doomed = asyncio.run(run())
+    assert committed["text"] == "UoW"
+    assert doomed is None
+
+
+def test_one_checkout_and_commit_per_request(client):
+    seen = []
+    stop = observe_requests(lambda method, route, status, sql: seen.append((route, sql.checkouts, sql.commits)))
+    try:
+        p_id = client.post("/api/v1/prompts", json={"text": f"U {uuid.uuid4()}"}).json()["data"]["id"]
+        client.put(f"/api/v1/prompts/{p_id}", json={"text": f"U2 {uuid.uuid4()}"})
+        client.post("/api/v1/calls", json={"prompt_id": p_id, "formatted_text": "x", "content": "y",
+                                           "score": 0.5})
+        client.get(f"/api/v1/prompts/{p_id}/stats")
+        client.get("/api/v1/prompts")
+        assert client.post(f"/api/v1/prompts/{p_id}/instances",
+                           json={"formatted_text": "x", "version": 9}).status_code == 404
+    finally:
+        stop()
+    assert len(seen) == 6
+    assert all(checkouts <= 1 and commits <= 1 for _, checkouts, commits in seen), seen
+    assert seen[-1][2] == 0                              # the 404 rolled back
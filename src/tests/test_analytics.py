@@ -0,0 +1,54 @@
+# src/tests/test_analytics.py
+import uuid
+import numpy as np
+from src.services.analytics import columns, describe, describe_all
+
+
+def test_describe_matches_per_prompt_numpy():
+    rng = np.random.default_rng(3)
+    scores = {"a": np.round(rng.random(50), 2), "b": np.round(rng.random(7), 2), "c": np.array([0.5])}
+    rows = [(pid, float(s)) for pid, values in scores.items() for s in values]
+    stats = describe(columns(rows), window=20)
+    for pid, x in scores.items():
+        got = stats[pid]
+        assert got["total_feedback"] == len(x)
+        assert abs(got["avg_score"] - x.mean()) < 1e-12
+        assert (got["min_score"], got["max_score"]) == (x.min(), x.max())
+        assert got["p50"] == np.sort(x)[int(np.ceil(0.5 * len(x))) - 1]
+        if len(x) > 1:
+            assert abs(got["variance"] - x.var(ddof=1)) < 1e-12
+            assert got["ci_low"] < got["avg_score"] < got["ci_high"]
+    assert stats["c"]["stddev"] is None and stats["c"]["ewma"] == 0.5
+    assert stats["a"]["drift"]["z"] is not None and stats["b"]["drift"]["z"] is None
+
+
+def test_ewma_and_drift_follow_recent_scores():
+    rows = [("p", 0.9)] * 40 + [("p", 0.2)] * 20
+    got = describe(columns(rows), window=20)["p"]
+    assert got["ewma"] < 0.21
+    assert got["drift"]["drifting"] and got["drift"]["z"] < 0
+    assert abs(got["drift"]["recent_avg"] - 0.2) < 1e-9 and abs(got["drift"]["baseline_avg"] - 0.9) < 1e-9
+    steady = describe(columns([("p", 0.5), ("p", 0.6)] * 30), window=20)["p"]
+    assert not steady["drift"]["drifting"]
+    [missing] = describe_all(["nope"], columns([]))
+    assert missing["total_feedback"] == 0 and missing["prompt_id"] == "nope"
+
+
+def test_analytics_and_batch_readiness_endpoints(client):
+    ids = []
+    for scores in ([0.2, 0.3, 0.4, 0.3, 0.2, 0.3], [0.9]):
+        p_id = client.post("/api/v1/prompts", json={"text": f"A {uuid.uuid4()}"}).json()["data"]["id"]
+        client.post("/api/v1/calls:batch", json={"items": [
+            {"prompt_id": p_id, "formatted_text": "x", "content": "y", "score": s} for s in scores]})
+        ids.append(p_id)
+
+    data = client.get(f"/api/v1/prompts/{ids[0]}/stats/analytics").json()["data"]
+    assert data["total_feedback"] == 6 and abs(data["avg_score"] - 0.2833333) < 1e-6
+    assert data["p90"] == 0.4 and data["drift"]["drifting"] is False
+
+    r = client.post("/api/v1/optimization/readiness:batch",
+                    json={"prompt_ids": ids + [str(uuid.uuid4())]})
+    assert r.status_code == 200
+    items = r.json()["data"]
+    assert [i["ready"] for i in items] == [True, False, False]
+    assert items[0]["reason"] == "Meets criteria" and items[1]["stats"]["total_feedback"] == 1
@@ -0,0 +1,28 @@
+# src/tests/test_benchmarks.py
+from benchmarks.common import percentile, summarize
+from benchmarks.compare import compare
+from benchmarks.seed import load_ids, seed
+from src.database.database import Database
+
+
+def test_seed_volumes(tmp_path):
+    db = Database(f"sqlite:///{tmp_path}/seed.sqlite3")
+    db.initialize()
+    r = seed(db, prompts=3, instances=2, responses=2, feedback=3)
+    assert (len(r.prompt_ids), len(r.instance_ids), len(r.response_ids), r.feedback) == (3, 6, 12, 36)
+
+    again = load_ids(db)
+    assert sorted(again.response_ids) == sorted(r.response_ids) and again.feedback == 36
+    from src.services.feedback_service import FeedbackService
+    assert FeedbackService(db).stats(r.prompt_ids[0])["total_feedback"] == 12
+
+
+def test_summary_and_compare():
+    assert percentile([1, 2, 3, 4], 50) in (2, 3)
+    s = summarize([0.001 * i for i in range(1, 101)], errors=0, elapsed=1.0)
+    assert s["rps"] == 100 and s["p99_ms"] >= s["p95_ms"] >= s["p50_ms"]
+
+    base = {"results": {"stats": s}}
+    slower = {"results": {"stats": dict(s, p95_ms=s["p95_ms"] * 1.5)}}
+    assert compare(base, base, 10)[1] is False
+    assert compare(base, slower, 10)[1] is True
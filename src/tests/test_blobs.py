@@ -0,0 +1,73 @@
+# src/tests/test_blobs.py
+import sqlite3
+import uuid
+
+from sqlalchemy import create_engine, func, select
+
+from src.database import migrate_text_blobs
+from src.models.models import TextBlob
+from src.services import blobs
+
+
+def test_encoding_round_trip():
+    short, long = "hi", "Rule: be concise. " * 100
+    assert blobs.encode(short)["codec"] == blobs.RAW
+    packed = blobs.encode(long)
+    assert packed["codec"] == blobs.ZLIB and len(packed["data"]) < packed["size"] == len(long.encode())
+    for text in (short, long, "ünïcode ✓"):
+        row = blobs.encode(text)
+        assert row["hash"] == blobs.digest(text) and blobs.decode(row["codec"], row["data"]) == text
+
+
+def test_blob_cache_budget_is_utf8_bytes():
+    cache = blobs.BlobCache(max_bytes=240)
+    wide = "✓" * 10                            # 10 characters, 30 bytes
+    for key in range(9):                       # 270 bytes > 240 → evicts the oldest
+        cache.put(str(key), wide)
+    assert cache.get("0") is None and cache.get("8") == wide
+    assert (cache.stats()["bytes"], cache.stats()["evictions"]) == (240, 1)
+    cache.put("huge", "✓" * 11)                # 33 bytes > max_bytes // 8: not cached
+    assert cache.get("huge") is None
+
+
+def test_texts_are_stored_once_and_read_back(client, db, query_budget):
+    p_id = client.post("/api/v1/prompts", json={"text": f"B {uuid.uuid4()}"}).json()["data"]["id"]
+    text = f"Shared template {uuid.uuid4()} " * 40
+    ids = [client.post(f"/api/v1/prompts/{p_id}/instances", json={"formatted_text": text}).json()["data"]["id"]
+           for _ in range(3)]
+    with db.db_manager.get_session() as s:
+        assert s.scalar(select(func.count()).select_from(TextBlob).where(TextBlob.hash == blobs.digest(text))) == 1
+        assert s.scalar(select(TextBlob.codec).where(TextBlob.hash == blobs.digest(text))) == blobs.ZLIB
+
+    blobs.cache.clear()
+    with query_budget(3) as seen:
+        cold = client.get(f"/api/v1/prompts/{p_id}/instances").json()["data"]["items"]
+        warm = client.get(f"/api/v1/prompts/{p_id}/instances").json()["data"]["items"]
+    assert sorted(i["id"] for i in cold) == sorted(ids) and {i["formatted_text"] for i in warm} == {text}
+    cold_sql, warm_sql = (" ".join(sql.statements) for _, sql in seen)
+    assert "text_blobs" in cold_sql and "text_blobs" not in warm_sql     # second read from the LRU
+    assert client.get("/api/v1/health/cache").json()["data"]["text_blobs"]["hits"] >= 1
+
+
+def test_migration_moves_inline_text(tmp_path):
+    path = tmp_path / "legacy.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE prompt_instances (id TEXT PRIMARY KEY, prompt_id TEXT, formatted_text TEXT NOT NULL);
+        CREATE TABLE responses (id TEXT PRIMARY KEY, prompt_instance_id TEXT, content TEXT NOT NULL);
+        INSERT INTO prompt_instances VALUES ('i1', 'p', 'same'), ('i2', 'p', 'same'), ('i3', 'p', 'other');
+        INSERT INTO responses VALUES ('r1', 'i1', 'ok');
+    """)
+    conn.commit()
+    conn.close()
+
+    engine = create_engine(f"sqlite:///{path}")
+    assert migrate_text_blobs.migrate(engine, batch_size=2, progress=lambda _: None) == {
+        "prompt_instances": 3, "responses": 1}
+    assert migrate_text_blobs.migrate(engine, progress=lambda _: None) == {}      # idempotent
+    with engine.connect() as c:
+        hashes = dict(c.exec_driver_sql("SELECT id, formatted_text_hash FROM prompt_instances").all())
+        assert hashes["i1"] == hashes["i2"] == blobs.digest("same")
+        assert c.exec_driver_sql("SELECT count(*) FROM text_blobs").scalar() == 3
+        assert "formatted_text" not in {r[1] for r in c.exec_driver_sql("PRAGMA table_info(prompt_instances)")}
+    engine.dispose()
@@ -0,0 +1,121 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from src.services.cache import MemoryCache, RedisCache
+from src.services.feedback_service import FeedbackService
+from src.services.job_service import JobService
+from src.services.prompt_service import PromptService
+
+
+def test_memory_cache_lru_and_ttl():
+    async def run():
+        cache = MemoryCache(max_entries=2, ttl=60)
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        assert await cache.get("a") == 1          # a is now most recent
+        await cache.set("c", 3)                   # evicts b
+        assert await cache.get("b") is None
+        await cache.set("d", 4, ttl=0.01)
+        time.sleep(0.02)
+        assert await cache.get("d") is None
+        return await cache.stats()
+
+    stats = asyncio.run(run())
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["evictions"] == 2
+    assert stats["expirations"] == 1
+
+
+def test_redis_cache_roundtrip():
+    aioredis = pytest.importorskip("fakeredis.aioredis")
+
+    async def run():
+        cache = RedisCache(aioredis.FakeRedis(), ttl=60)
+        assert await cache.get("k") is None
+        await cache.set("k", {"avg_score": 0.5, "last_scores": [0.5]})
+        value = await cache.get("k")
+        await cache.delete("k")
+        return value, await cache.get("k"), await cache.stats()
+
+    value, gone, stats = asyncio.run(run())
+    assert value == {"avg_score": 0.5, "last_scores": [0.5]}
+    assert gone is None
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_set_after_a_newer_delete_is_dropped():
+    async def run():
+        cache = MemoryCache()
+        generation = await cache.generation("k")     # reader: before its DB read
+        await cache.delete("k")                      # writer: after its commit
+        await cache.set("k", "old row", generation=generation)
+        dropped = await cache.get("k")
+        await cache.set("k", "new row", generation=await cache.generation("k"))
+        return dropped, await cache.get("k"), await cache.stats()
+
+    dropped, kept, stats = asyncio.run(run())
+    assert (dropped, kept, stats["stale_sets"]) == (None, "new row", 1)
+
+
+def test_redis_generations_and_sync_delete():
+    fakeredis = pytest.importorskip("fakeredis")
+    import fakeredis.aioredis
+
+    server = fakeredis.FakeServer()
+    cache = RedisCache(fakeredis.aioredis.FakeRedis(server=server), ttl=60,
+                       sync_client=fakeredis.FakeRedis(server=server))
+
+    async def run():
+        generation = await cache.generation("k")
+        cache.delete_sync("k")                       # e.g. the job worker
+        await cache.set("k", {"v": 1}, generation=generation)
+        dropped = await cache.get("k")
+        await cache.set("k", {"v": 2}, generation=await cache.generation("k"))
+        kept = await cache.get("k")
+        await cache.delete("k")
+        return dropped, kept, await cache.get("k")
+
+    assert asyncio.run(run()) == (None, {"v": 2}, None)
+    assert cache.stale_sets == 1
+
+
+def test_sync_writers_invalidate_cached_reads(client, db):
+    pid = client.post("/api/v1/prompts", json={"text": f"T {uuid.uuid4()}"}).json()["data"]["id"]
+    assert client.get(f"/api/v1/prompts/{pid}").json()["data"]["version"] == 1      # cached
+    PromptService(db).update(pid, text="edited by a script")
+    assert client.get(f"/api/v1/prompts/{pid}").json()["data"]["text"] == "edited by a script"
+
+    client.post(f"/api/v1/prompts/{pid}/optimize", json={"strategy": "stub"})
+    jobs = JobService(db)
+    job = jobs.claim_next("w1")
+    jobs.complete(job.id, "w1", "optimized")
+    assert client.get(f"/api/v1/prompts/{pid}").json()["data"]["version"] == 3
+
+    assert client.get(f"/api/v1/prompts/{pid}/stats").json()["data"]["total_feedback"] == 0
+    fb = PromptService(db).add_feedback(pid, 0.5)
+    assert client.get(f"/api/v1/prompts/{pid}/stats").json()["data"]["total_feedback"] == 1
+    FeedbackService(db).add_score(fb.response_id, 0.7)
+    assert client.get(f"/api/v1/prompts/{pid}/stats").json()["data"]["total_feedback"] == 2
+
+
+def test_writes_invalidate_cached_reads(client):
+    pid = client.post("/api/v1/prompts", json={"text": f"T {uuid.uuid4()}"}).json()["data"]["id"]
+    inst = client.post(f"/api/v1/prompts/{pid}/instances", json={"formatted_text": "Ping"}).json()["data"]["id"]
+    resp = client.post(f"/api/v1/instances/{inst}/responses", json={"content": "Pong"}).json()["data"]["id"]
+
+    before = client.get("/api/v1/health/cache").json()["data"]
+    assert client.get(f"/api/v1/prompts/{pid}/stats").json()["data"]["total_feedback"] == 0
+    assert client.get(f"/api/v1/prompts/{pid}/stats").json()["data"]["total_feedback"] == 0
+    client.post(f"/api/v1/responses/{resp}/feedback", json={"score": 0.4})
+    assert client.get(f"/api/v1/prompts/{pid}/stats").json()["data"]["total_feedback"] == 1
+
+    client.put(f"/api/v1/prompts/{pid}", json={"text": "new text"})
+    got = client.get(f"/api/v1/prompts/{pid}").json()["data"]
+    assert (got["text"], got["version"]) == ("new text", 2)
+
+    after = client.get("/api/v1/health/cache").json()["data"]
+    assert after["hits"] > before["hits"]
@@ -0,0 +1,53 @@
+# src/tests/test_calls.py
+import uuid
+
+
+def _prompt(client):
+    return client.post("/api/v1/prompts", json={"text": f"T {uuid.uuid4()}"}).json()["data"]["id"]
+
+
+def _call(prompt_id, **extra):
+    return {"prompt_id": prompt_id, "formatted_text": "Translate: hi",
+            "context": {"lang": "fr"}, "content": "salut", "metadata": {"model": "gpt"}, **extra}
+
+
+def test_log_single_call(client):
+    p_id = _prompt(client)
+    r = client.post("/api/v1/calls", json=_call(p_id, score=0.8))
+    assert r.status_code == 201
+    data = r.json()["data"]
+    assert data["ok"] and data["feedback_id"]
+
+    inst = client.get(f"/api/v1/prompts/{p_id}/instances").json()["data"]["items"]
+    assert [i["id"] for i in inst] == [data["instance_id"]]
+    assert inst[0]["context"] == {"lang": "fr"}
+    resp = client.get(f"/api/v1/instances/{data['instance_id']}/responses").json()["data"]["items"]
+    assert resp[0]["id"] == data["response_id"] and resp[0]["response_metadata"] == {"model": "gpt"}
+    stats = client.get(f"/api/v1/prompts/{p_id}/stats").json()["data"]
+    assert stats["total_feedback"] == 1 and stats["last_score"] == 0.8
+
+    assert client.post("/api/v1/calls", json=_call(str(uuid.uuid4()))).status_code == 404
+    assert client.post("/api/v1/calls", json=_call(p_id, score=2)).status_code == 400
+
+
+def test_log_call_batch_with_client_ids(client):
+    p_id = _prompt(client)
+    inst_id = str(uuid.uuid4())
+    items = [_call(p_id, score=0.5, instance_id=inst_id)] + [_call(p_id) for _ in range(3)] + [
+        _call(str(uuid.uuid4()), score=0.5),
+        _call(p_id, score=-1),
+    ]
+    data = client.post("/api/v1/calls:batch", json={"items": items}).json()["data"]
+    assert (data["created"], data["duplicates"], data["failed"]) == (4, 0, 2)
+    assert data["items"][0]["instance_id"] == inst_id
+    assert data["items"][3]["feedback_id"] is None
+    assert data["items"][4]["error"] == "Prompt not found"
+
+    # a retried call is acknowledged but not written twice
+    again = client.post("/api/v1/calls:batch", json={"items": items[:1]}).json()["data"]
+    assert again["duplicates"] == 1 and again["items"][0]["duplicate"]
+    first, retried = data["items"][0], again["items"][0]
+    assert (retried["response_id"], retried["feedback_id"]) == (first["response_id"], first["feedback_id"])
+    stats = client.get(f"/api/v1/prompts/{p_id}/stats").json()["data"]
+    assert stats["total_feedback"] == 1
+    assert len(client.get(f"/api/v1/prompts/{p_id}/instances").json()["data"]["items"]) == 4
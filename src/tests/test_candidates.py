@@ -0,0 +1,37 @@
+# src/tests/test_candidates.py
+import uuid
+
+
+def _prompt_with_scores(client, scores):
+    p_id = client.post("/api/v1/prompts", json={"text": f"C {uuid.uuid4()}"}).json()["data"]["id"]
+    client.post("/api/v1/calls:batch", json={"items": [
+        {"prompt_id": p_id, "formatted_text": "x", "content": "y", "score": s} for s in scores]})
+    return p_id
+
+
+def test_candidates_ranked_by_expected_gain(client):
+    small_gap = _prompt_with_scores(client, [0.6] * 30)      # gain (0.7-0.6)*30 = 3
+    big_gap = _prompt_with_scores(client, [0.2] * 30)        # gain 15
+    good = _prompt_with_scores(client, [0.9] * 30)
+    few = _prompt_with_scores(client, [0.1] * 3)
+
+    r = client.get("/api/v1/optimization/candidates", params={"min_samples": 30, "limit": 1000})
+    assert r.status_code == 200
+    data = r.json()["data"]
+    ids = [c["prompt_id"] for c in data["items"]]
+    assert ids.index(big_gap) < ids.index(small_gap)
+    assert good not in ids and few not in ids
+    assert data["total"] == len(ids) and data["max_avg_score"] == 0.7
+    top = data["items"][ids.index(big_gap)]
+    assert abs(top["expected_gain"] - 15) < 1e-6 and abs(top["avg_score"] - 0.2) < 1e-9
+
+    # thresholds are per request
+    ids = [c["prompt_id"] for c in client.get(
+        "/api/v1/optimization/candidates",
+        params={"min_samples": 3, "max_avg_score": 0.95, "limit": 1000, "total": "none"},
+    ).json()["data"]["items"]]
+    assert {small_gap, big_gap, good, few} <= set(ids)
+
+    page = client.get("/api/v1/optimization/candidates",
+                      params={"min_samples": 30, "offset": 1, "limit": 1}).json()["data"]
+    assert len(page["items"]) == 1 and page["offset"] == 1
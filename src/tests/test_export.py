@@ -0,0 +1,61 @@
+import csv
+import gzip
+import io
+import json
+import uuid
+
+from src.config import Config
+from src.models import models
+from src.services.export_utils import export_all_json, export_all_ndjson, export_table_csv
+
+
+def _seed(client):
+    p_id = client.post("/api/v1/prompts", json={"text": f"T {uuid.uuid4()}"}).json()["data"]["id"]
+    inst_id = client.post(f"/api/v1/prompts/{p_id}/instances", json={"formatted_text": "Ping"}).json()["data"]["id"]
+    resp_id = client.post(f"/api/v1/instances/{inst_id}/responses", json={"content": "Pong"}).json()["data"]["id"]
+    client.post(f"/api/v1/responses/{resp_id}/feedback", json={"score": 0.25})
+    return p_id
+
+
+def test_file_exports(client, db, tmp_path):
+    p_id = _seed(client)
+    with db.db_manager.get_session() as s:
+        export_all_json(s, tmp_path / "all.json")
+        export_all_ndjson(s, tmp_path / "all.ndjson.gz", compress=True)
+        export_table_csv(s, models.Prompt, tmp_path / "prompts.csv")
+
+    dump = json.loads((tmp_path / "all.json").read_text())
+    assert set(dump) == {"prompts", "instances", "responses", "feedback"}
+    assert any(p["id"] == p_id for p in dump["prompts"])
+    assert all(isinstance(f["score"], float) for f in dump["feedback"])
+    assert {"Ping"} <= {i["formatted_text"] for i in dump["instances"]}     # text, not blob hashes
+    assert {"Pong"} <= {r["content"] for r in dump["responses"]}
+
+    lines = gzip.decompress((tmp_path / "all.ndjson.gz").read_bytes()).decode().splitlines()
+    assert sum(json.loads(l)["table"] == "prompts" for l in lines) == len(dump["prompts"])
+
+    rows = list(csv.DictReader((tmp_path / "prompts.csv").open()))
+    assert any(r["id"] == p_id for r in rows)
+
+
+def test_export_endpoint_is_off_unless_enabled(client, monkeypatch):
+    monkeypatch.setattr(Config, "ADMIN_EXPORT_ENABLED", False)
+    r = client.get("/api/v1/admin/export", params={"format": "csv", "tables": "prompts"})
+    assert r.status_code == 404
+
+
+def test_export_endpoint_streams(client, monkeypatch):
+    monkeypatch.setattr(Config, "ADMIN_EXPORT_ENABLED", True)
+    p_id = _seed(client)
+    r = client.get("/api/v1/admin/export", params={"format": "csv", "tables": "prompts"})
+    assert r.status_code == 200
+    assert any(row["id"] == p_id for row in csv.DictReader(io.StringIO(r.text)))
+
+    r = client.get("/api/v1/admin/export", params={"format": "ndjson", "gzip": "true"})
+    assert r.headers["content-type"] == "application/gzip"
+    lines = [json.loads(l) for l in gzip.decompress(r.content).decode().splitlines()]
+    assert {l["table"] for l in lines} == {"prompts", "instances", "responses", "feedback"}
+    assert "Pong" in {l.get("content") for l in lines}
+
+    r = client.get("/api/v1/admin/export", params={"format": "csv"})
+    assert r.status_code == 400
@@ -0,0 +1,32 @@
+import uuid
+
+
+def _response(client):
+    p_id = client.post("/api/v1/prompts", json={"text": f"T {uuid.uuid4()}"}).json()["data"]["id"]
+    inst_id = client.post(f"/api/v1/prompts/{p_id}/instances", json={"formatted_text": "Ping"}).json()["data"]["id"]
+    resp_id = client.post(f"/api/v1/instances/{inst_id}/responses", json={"content": "Pong"}).json()["data"]["id"]
+    return p_id, resp_id
+
+
+def test_batch_feedback(client):
+    p1, r1 = _response(client)
+    p2, r2 = _response(client)
+    items = [{"response_id": r1, "score": 0.5}] * 1500 + [
+        {"response_id": r2, "score": 0.9},
+        {"response_id": "missing", "score": 0.5},
+        {"response_id": r2, "score": 1.5},
+    ]
+    r = client.post("/api/v1/feedback:batch", json={"items": items})
+    assert r.status_code == 201
+    data = r.json()["data"]
+    assert data["created"] == 1501
+    assert data["failed"] == 2
+    assert data["items"][-2]["error"] == "Response not found"
+    assert data["items"][-1]["ok"] is False
+
+    s1 = client.get(f"/api/v1/prompts/{p1}/stats").json()["data"]
+    assert s1["total_feedback"] == 1500
+    assert s1["avg_score"] == 0.5
+    s2 = client.get(f"/api/v1/prompts/{p2}/stats").json()["data"]
+    assert s2["total_feedback"] == 1
+    assert s2["last_score"] == 0.9
@@ -0,0 +1,36 @@
+# src/tests/test_fields.py
+import uuid
+
+
+def test_sparse_fieldsets_skip_the_big_columns(client, query_budget):
+    p_id = client.post("/api/v1/prompts", json={"text": f"F {uuid.uuid4()}"}).json()["data"]["id"]
+    inst = client.post(f"/api/v1/prompts/{p_id}/instances",
+                       json={"formatted_text": "x" * 5000, "context": {"tier": "pro"}}).json()["data"]
+    resp = client.post(f"/api/v1/instances/{inst['id']}/responses",
+                       json={"content": "y" * 5000, "metadata": {"model": "m"}}).json()["data"]
+
+    with query_budget(2) as seen:
+        listed = client.get(f"/api/v1/prompts/{p_id}/instances", params={"fields": "context"}).json()["data"]
+        answers = client.get(f"/api/v1/instances/{inst['id']}/responses",
+                             params={"fields": "response_metadata,prompt_instance_id"}).json()["data"]
+        prompts = client.get("/api/v1/prompts", params={"fields": "version", "limit": 5}).json()["data"]
+    assert listed["items"] == [{"id": inst["id"], "context": {"tier": "pro"}, "created_at": inst["created_at"]}]
+    assert set(answers["items"][0]) == {"id", "prompt_instance_id", "response_metadata", "created_at"}
+    assert set(prompts["items"][0]) == {"id", "version", "created_at"}
+    statements = " ".join(s for _, sql in seen for s in sql.statements)
+    assert "prompt_instances" in statements
+    assert "formatted_text" not in statements and "content" not in statements
+
+    # full text stays one request away
+    assert client.get(f"/api/v1/instances/{inst['id']}").json()["data"]["formatted_text"] == "x" * 5000
+    full = client.get(f"/api/v1/responses/{resp['id']}").json()["data"]
+    assert full["content"] == "y" * 5000 and full["response_metadata"] == {"model": "m"}
+    one = client.get(f"/api/v1/prompts/{p_id}", params={"fields": "description"}).json()["data"]
+    assert set(one) == {"id", "description", "created_at"}
+
+
+def test_unknown_fields_and_missing_items(client):
+    r = client.get("/api/v1/prompts", params={"fields": "text,password"})
+    assert r.status_code == 400 and "password" in r.text
+    assert client.get(f"/api/v1/instances/{uuid.uuid4()}").status_code == 404
+    assert client.get(f"/api/v1/responses/{uuid.uuid4()}", params={"fields": "content"}).status_code == 404
@@ -0,0 +1,37 @@
+# src/tests/test_ids.py
+import uuid
+from sqlalchemy.dialects import postgresql, sqlite
+from src.database.migrate_uuid_keys import guid_columns, migrate, migration_sql
+from src.models.ids import GUID, NIL_UUID, new_id, uuid7
+
+
+def test_uuid7_is_time_ordered():
+    ids = [uuid7() for _ in range(5000)]
+    assert all(u.version == 7 and u.variant == uuid.RFC_4122 for u in ids)
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    # the text form sorts the same way, so (created_at, id) keyset order holds
+    text_ids = [str(u) for u in ids]
+    assert text_ids == sorted(text_ids)
+    assert len(new_id()) == 36
+
+
+def test_guid_binding():
+    t = GUID()
+    upper = str(uuid.uuid4()).upper()
+    assert t.process_bind_param(upper, sqlite.dialect()) == upper.lower()
+    assert t.process_bind_param("missing", sqlite.dialect()) == "missing"
+    assert t.process_bind_param("missing", postgresql.dialect()) == NIL_UUID
+    assert isinstance(t.load_dialect_impl(postgresql.dialect()), postgresql.UUID)
+
+
+def test_uuid_migration_plan(db):
+    assert migrate(db.db_manager.engine) == []          # SQLite: nothing to do
+    assert "prompt_instance_id" in guid_columns()["responses"]
+    fk = {"name": "responses_prompt_instance_id_fkey", "constrained_columns": ["prompt_instance_id"],
+          "referred_table": "prompt_instances", "referred_columns": ["id"],
+          "options": {"ondelete": "CASCADE"}}
+    sql = migration_sql([("responses", fk)], [("prompt_instances", "id"), ("responses", "prompt_instance_id")])
+    assert sql[0].startswith('ALTER TABLE "responses" DROP CONSTRAINT')
+    assert 'TYPE uuid USING "id"::uuid' in sql[1]
+    assert sql[-1].endswith("ON DELETE CASCADE")
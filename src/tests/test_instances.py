@@ -27,3 +27,14 @@ def test_instance_and_response_flow(client):
     # 5. list responses
     r = client.get(f"/api/v1/instances/{instance_id}/responses")
     assert any(rp["id"] == response_id for rp in r.json()["data"]["items"])
+
+
+def test_instance_context_round_trip(client):
+    prompt_id = _create_prompt(client)
+    r = client.post(f"/api/v1/prompts/{prompt_id}/instances",
+                    json={"formatted_text": "Hi", "context": {"user": "u1", "n": 2}})
+    assert r.status_code == 201
+    assert r.json()["data"]["context"] == {"user": "u1", "n": 2}
+
+    items = client.get(f"/api/v1/prompts/{prompt_id}/instances").json()["data"]["items"]
+    assert items[0]["context"] == {"user": "u1", "n": 2}
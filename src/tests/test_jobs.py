@@ -0,0 +1,61 @@
+# src/tests/test_jobs.py
+import uuid
+from src.services.job_service import JobService
+from src.services.job_worker import run_worker
+
+
+def _prompt(client):
+    return client.post(
+        "/api/v1/prompts", json={"text": f"T {uuid.uuid4()}", "description": ""}
+    ).json()["data"]["id"]
+
+
+def test_optimize_job_runs_to_completion(client, db):
+    p_id = _prompt(client)
+    r = client.post(f"/api/v1/prompts/{p_id}/optimize", json={"strategy": "stub"})
+    assert r.status_code == 202
+    job = r.json()["data"]
+    assert job["status"] == "queued"
+
+    assert run_worker(db, worker_id="test-worker", once=True) >= 1
+
+    done = client.get(f"/api/v1/jobs/{job['id']}").json()["data"]
+    assert done["status"] == "completed"
+    assert done["progress"] == 100
+    assert done["result"] == {"prompt_id": p_id, "version": 2}
+    prompt = client.get(f"/api/v1/prompts/{p_id}").json()["data"]
+    assert prompt["version"] == 2
+    assert prompt["parent_id"] is None
+
+
+def test_completed_job_is_comparable_to_the_previous_version(client, db):
+    p_id = _prompt(client)
+    client.post(f"/api/v1/prompts/{p_id}/optimize", json={"strategy": "stub"})
+    jobs = JobService(db)
+    job = jobs.claim_next("w1")
+    assert jobs.complete(job.id, "w1", "optimized text") == p_id
+
+    r = client.get(f"/api/v1/prompts/{p_id}/versions/compare")
+    assert r.status_code == 200
+    cmp = r.json()["data"]
+    assert (cmp["a"]["version"], cmp["b"]["version"]) == (1, 2)
+
+
+def test_job_is_claimed_once(client, db):
+    p_id = _prompt(client)
+    client.post(f"/api/v1/prompts/{p_id}/optimize", json={"strategy": "stub"})
+    jobs = JobService(db)
+    first = jobs.claim_next("w1")
+    assert first is not None and first.worker_id == "w1"
+    assert jobs.claim_next("w2") is None
+    # the lease holder can still finish it; anyone else can't
+    assert jobs.complete(first.id, "w2", "nope") is None
+    assert jobs.complete(first.id, "w1", "better") is not None
+
+
+def test_optimize_errors(client):
+    assert client.post(f"/api/v1/prompts/{uuid.uuid4()}/optimize").status_code == 404
+    p_id = _prompt(client)
+    r = client.post(f"/api/v1/prompts/{p_id}/optimize", json={"strategy": "nope"})
+    assert r.status_code == 400
+    assert client.get(f"/api/v1/jobs/{uuid.uuid4()}").status_code == 404
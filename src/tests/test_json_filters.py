@@ -0,0 +1,66 @@
+# src/tests/test_json_filters.py
+import uuid
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from src.models.models import Response
+from src.services.json_filters import apply_json_filters, parse_filter, parse_filters
+
+
+def _instance_with_responses(client, metas):
+    p_id = client.post("/api/v1/prompts", json={"text": f"T {uuid.uuid4()}"}).json()["data"]["id"]
+    inst_id = client.post(f"/api/v1/prompts/{p_id}/instances",
+                          json={"formatted_text": "Ping", "context": {"tier": "pro"}}).json()["data"]["id"]
+    for meta in metas:
+        r_id = client.post(f"/api/v1/instances/{inst_id}/responses",
+                           json={"content": "Pong", "metadata": meta}).json()["data"]["id"]
+        client.post(f"/api/v1/responses/{r_id}/feedback", json={"score": 0.5})
+    return p_id, inst_id
+
+
+def test_parse_filter():
+    assert parse_filter("model=gpt-4") == (("model",), "=", "gpt-4")
+    assert parse_filter("latency_ms>2000") == (("latency_ms",), ">", 2000)
+    assert parse_filter("usage.total_tokens<=1.5").path == ("usage", "total_tokens")
+    assert parse_filter("cached=true").value is True
+    for bad in ("model", "=x", "a>true", "a={}"):
+        with pytest.raises(ValueError):
+            parse_filter(bad)
+
+
+def test_postgres_filters_use_indexable_operators():
+    q = apply_json_filters(select(Response.id), Response.response_metadata,
+                           parse_filters(["model=gpt-4", "latency_ms>2000"]), "postgresql")
+    sql = str(q.compile(dialect=postgresql.dialect()))
+    assert "@>" in sql and "@@" in sql
+
+
+def test_metadata_filters_over_api(client):
+    metas = [{"model": "gpt-4", "latency_ms": 2500, "usage": {"tokens": 10}},
+             {"model": "gpt-4", "latency_ms": 300},
+             {"model": "claude", "latency_ms": 4000},
+             None]
+    p_id, inst_id = _instance_with_responses(client, metas)
+
+    def responses(*filters):
+        r = client.get(f"/api/v1/instances/{inst_id}/responses", params={"metadata": list(filters)})
+        assert r.status_code == 200
+        return r.json()["data"]["items"]
+
+    assert len(responses()) == 4
+    assert len(responses("model=gpt-4")) == 2
+    assert [r["response_metadata"]["latency_ms"] for r in responses("model=gpt-4", "latency_ms>2000")] == [2500]
+    assert len(responses("usage.tokens>=10")) == 1
+    assert len(responses("model!=gpt-4")) == 2          # missing metadata counts as "not equal"
+    assert responses("model=gpt-4")[0]["response_metadata"]["model"] == "gpt-4"
+
+    fb = client.get(f"/api/v1/prompts/{p_id}/feedback", params={"metadata": "latency_ms>1000"})
+    assert fb.json()["data"]["total"] == 2
+
+    inst = client.get(f"/api/v1/prompts/{p_id}/instances", params={"context": "tier=pro"})
+    assert [i["context"] for i in inst.json()["data"]["items"]] == [{"tier": "pro"}]
+    assert client.get(f"/api/v1/prompts/{p_id}/instances",
+                      params={"context": "tier=free"}).json()["data"]["items"] == []
+
+    assert client.get(f"/api/v1/instances/{inst_id}/responses",
+                      params={"metadata": "nonsense"}).status_code == 400
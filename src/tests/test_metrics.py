@@ -0,0 +1,41 @@
+# src/tests/test_metrics.py
+import re
+import uuid
+from src.config import Config
+from src.services.metrics import Histogram
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = Histogram("x_seconds", "X.", ("route",), (0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        h.observe(("/a",), value)
+    assert h.render() == [
+        "# HELP x_seconds X.",
+        "# TYPE x_seconds histogram",
+        'x_seconds_bucket{route="/a",le="0.1"} 2',
+        'x_seconds_bucket{route="/a",le="1"} 3',
+        'x_seconds_bucket{route="/a",le="+Inf"} 4',
+        'x_seconds_sum{route="/a"} 3.65',
+        'x_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_metrics_endpoint_counts_sql_per_route(client):
+    p_id = client.post("/api/v1/prompts", json={"text": f"M {uuid.uuid4()}"}).json()["data"]["id"]
+    client.get(f"/api/v1/prompts/{p_id}/stats")
+    r = client.get("/metrics")
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = r.text
+    route = 'method="GET",route="/api/v1/prompts/{prompt_id}/stats"'
+    assert re.search(r'http_request_duration_seconds_count\{%s,status="200"\} [1-9]' % re.escape(route), body)
+    sql_sum = re.search(r"http_request_sql_statements_sum\{%s\} (\d+)" % re.escape(route), body)
+    assert sql_sum and int(sql_sum.group(1)) >= 1
+    assert "http_request_serialize_seconds_bucket" in body
+    assert f"/api/v1/prompts/{p_id}" not in body                 # templates, not raw paths
+
+
+def test_server_timing_header(client, monkeypatch):
+    assert "server-timing" not in client.get("/api/v1/prompts").headers
+    monkeypatch.setattr(Config, "SERVER_TIMING", True)
+    header = client.get("/api/v1/prompts").headers["server-timing"]
+    assert re.match(r'db;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+, total;dur=[\d.]+$', header)
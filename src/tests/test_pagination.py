@@ -0,0 +1,44 @@
+import uuid
+
+
+def _response(client):
+    p_id = client.post("/api/v1/prompts", json={"text": f"T {uuid.uuid4()}"}).json()["data"]["id"]
+    inst_id = client.post(f"/api/v1/prompts/{p_id}/instances", json={"formatted_text": "Ping"}).json()["data"]["id"]
+    resp_id = client.post(f"/api/v1/instances/{inst_id}/responses", json={"content": "Pong"}).json()["data"]["id"]
+    return p_id, resp_id
+
+
+def test_cursor_walks_every_row_once(client):
+    p_id, resp_id = _response(client)
+    client.post("/api/v1/feedback:batch",
+                json={"items": [{"response_id": resp_id, "score": 0.5}] * 23})
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 10, "total": "none"}
+        if cursor:
+            params["cursor"] = cursor
+        data = client.get(f"/api/v1/prompts/{p_id}/feedback", params=params).json()["data"]
+        assert data["total"] is None
+        seen += [fb["id"] for fb in data["items"]]
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 23
+
+
+def test_total_modes_and_bad_cursor(client):
+    p_id, resp_id = _response(client)
+    client.post(f"/api/v1/responses/{resp_id}/feedback", json={"score": 0.5})
+
+    exact = client.get(f"/api/v1/prompts/{p_id}/feedback").json()["data"]
+    estimate = client.get(f"/api/v1/prompts/{p_id}/feedback?total=estimate").json()["data"]
+    assert exact["total"] == estimate["total"] == 1
+    assert exact["next_cursor"] is None
+
+    page = client.get("/api/v1/prompts?limit=1").json()["data"]
+    assert page["next_cursor"]
+    nxt = client.get(f"/api/v1/prompts?limit=1&cursor={page['next_cursor']}").json()["data"]
+    assert nxt["items"][0]["id"] != page["items"][0]["id"]
+
+    assert client.get("/api/v1/feedback?cursor=not-a-cursor").status_code == 400
@@ -0,0 +1,27 @@
+import uuid
+
+from src.api.dependencies import get_db
+from src.database.registry import EngineRegistry
+
+
+def test_get_db_reuses_one_database(client):
+    assert get_db() is get_db()
+    assert get_db().db_manager.engine is get_db().db_manager.engine
+
+
+def test_pool_metrics_count_checkouts(client):
+    client.post("/api/v1/prompts", json={"text": f"T {uuid.uuid4()}"})
+    r = client.get("/api/v1/health/pool")
+    assert r.status_code == 200
+    engines = r.json()["data"]["engines"]
+    assert len(engines) >= 1
+    assert sum(e["checkouts"] for e in engines.values()) >= 1
+    assert all(e["checked_out"] == 0 for e in engines.values())
+
+
+def test_dispose_all_drops_engines(test_db_url):
+    reg = EngineRegistry()
+    first = reg.get(test_db_url)
+    assert reg.get(test_db_url) is first
+    reg.dispose_all()
+    assert reg.get(test_db_url) is not first
@@ -0,0 +1,120 @@
+# src/tests/test_query_budgets.py
+"""
+SQL statements allowed per API call.  A change that adds a query to a route
+(or an N+1 to a list endpoint) fails here with the statements listed;
+raise the number only on purpose.
+
+Routes that write or return instance / response text count one statement
+for text_blobs: the INSERT … ON CONFLICT on writes, the lookup on reads
+whose blobs aren't in the LRU yet (src/services/blobs.py).
+"""
+import logging
+import uuid
+
+import pytest
+from sqlalchemy import text
+from fastapi.routing import APIRoute
+
+from src.config import Config
+from src.database import query_stats
+from src.main import app
+from src.services.prompt_service import PromptService
+
+BUDGETS = {
+    "POST /api/v1/prompts": 2,
+    "GET /api/v1/prompts/{prompt_id}": 1,
+    "GET /api/v1/prompts": 2,
+    "PUT /api/v1/prompts/{prompt_id}": 3,
+    "GET /api/v1/prompts/{prompt_id}/versions": 2,
+    "GET /api/v1/prompts/{prompt_id}/versions/compare": 4,
+    "POST /api/v1/prompts/{prompt_id}/instances": 3,
+    "GET /api/v1/prompts/{prompt_id}/instances": 3,
+    "POST /api/v1/instances/{instance_id}/responses": 2,
+    "GET /api/v1/instances/{instance_id}/responses": 3,
+    "GET /api/v1/instances/{instance_id}": 2,
+    "GET /api/v1/responses/{response_id}": 2,
+    "POST /api/v1/responses/{response_id}/feedback": 8,
+    "POST /api/v1/feedback:batch": 8,
+    "GET /api/v1/prompts/{prompt_id}/feedback": 2,
+    "GET /api/v1/feedback": 2,
+    "GET /api/v1/prompts/{prompt_id}/stats": 1,
+    "GET /api/v1/prompts/{prompt_id}/stats/timeseries": 1,
+    "GET /api/v1/prompts/{prompt_id}/stats/analytics": 1,
+    "GET /api/v1/prompts/{prompt_id}/optimization/readiness": 1,
+    "POST /api/v1/optimization/readiness:batch": 1,
+    "GET /api/v1/optimization/candidates": 2,
+    "POST /api/v1/calls": 11,
+    "POST /api/v1/calls:batch": 11,
+    "POST /api/v1/prompts/{prompt_id}/optimize": 2,
+    "GET /api/v1/jobs/{job_id}": 1,
+    "GET /api/v1/admin/export": 1,
+    "GET /api/v1/health": 0,
+    "GET /api/v1/health/pool": 0,
+    "GET /api/v1/health/cache": 0,
+    "GET /api/v1/health/feedback-buffer": 0,
+    "GET /metrics": 0,
+}
+
+
+def test_every_route_has_a_budget():
+    routes = {f"{method} {r.path_format}" for r in app.routes if isinstance(r, APIRoute)
+              for method in r.methods}
+    assert routes == set(BUDGETS)
+
+
+def test_endpoint_query_budgets(client, db, query_budget, monkeypatch):
+    monkeypatch.setattr(Config, "ADMIN_EXPORT_ENABLED", True)
+    with query_budget(BUDGETS):
+        p_id = client.post("/api/v1/prompts", json={"text": f"Q {uuid.uuid4()}"}).json()["data"]["id"]
+        client.get(f"/api/v1/prompts/{p_id}")
+        client.get("/api/v1/prompts", params={"limit": 20})
+        client.put(f"/api/v1/prompts/{p_id}", json={"text": f"Q2 {uuid.uuid4()}"})
+        inst = client.post(f"/api/v1/prompts/{p_id}/instances", json={"formatted_text": "x"}).json()["data"]
+        resp = client.post(f"/api/v1/instances/{inst['id']}/responses", json={"content": "y"}).json()["data"]
+        client.post(f"/api/v1/responses/{resp['id']}/feedback", json={"score": 0.4})
+        calls = [{"prompt_id": p_id, "formatted_text": f"c{i}", "content": "r", "score": i / 20}
+                 for i in range(20)]
+        client.post("/api/v1/calls:batch", json={"items": calls})
+        client.post("/api/v1/calls", json=calls[0])
+        client.post("/api/v1/feedback:batch", json={"items": [
+            {"response_id": resp["id"], "score": i / 10} for i in range(10)]})
+        client.get(f"/api/v1/prompts/{p_id}/instances")
+        client.get(f"/api/v1/instances/{inst['id']}/responses")
+        client.get(f"/api/v1/instances/{inst['id']}")
+        client.get(f"/api/v1/responses/{resp['id']}")
+        client.get(f"/api/v1/prompts/{p_id}/feedback")
+        client.get("/api/v1/feedback", params={"prompt_id": p_id})
+        client.get(f"/api/v1/prompts/{p_id}/versions")
+        client.get(f"/api/v1/prompts/{p_id}/versions/compare", params={"a": 1, "b": 2})
+        client.get(f"/api/v1/prompts/{p_id}/stats")
+        client.get(f"/api/v1/prompts/{p_id}/stats/timeseries", params={"bucket": "1h"})
+        client.get(f"/api/v1/prompts/{p_id}/stats/analytics")
+        client.get(f"/api/v1/prompts/{p_id}/optimization/readiness")
+        client.post("/api/v1/optimization/readiness:batch", json={"prompt_ids": [p_id, str(uuid.uuid4())]})
+        client.get("/api/v1/optimization/candidates", params={"limit": 20})
+        job = client.post(f"/api/v1/prompts/{p_id}/optimize", json={"strategy": "stub"}).json()["data"]
+        client.get(f"/api/v1/jobs/{job['id']}")
+        client.get("/api/v1/admin/export", params={"format": "csv", "tables": "prompts"})
+        for path in ("/api/v1/health", "/api/v1/health/pool", "/api/v1/health/cache",
+                     "/api/v1/health/feedback-buffer", "/metrics"):
+            client.get(path)
+
+
+def test_budget_failure_lists_repeated_statements(db):
+    svc = PromptService(db)
+    ids = [svc.create(f"N1 {uuid.uuid4()}") for _ in range(3)]
+    with pytest.raises(query_stats.QueryBudgetExceeded) as exc:
+        with query_stats.query_budget(2, "N+1"):
+            with db.db_manager.get_session() as s:
+                for p_id in ids:                          # one SELECT per prompt
+                    s.execute(text("SELECT text FROM prompts WHERE id = :id"), {"id": p_id})
+    message = str(exc.value)
+    assert message.startswith("N+1 ran 3 SQL statements, budget is 2")
+    assert "   3 × SELECT text FROM prompts WHERE id = ?" in message
+
+
+def test_slow_query_log_names_the_route(client, monkeypatch, caplog):
+    monkeypatch.setattr(Config, "SLOW_QUERY_MS", 1e-6)
+    with caplog.at_level(logging.WARNING, logger="src.database.query_stats"):
+        client.get("/api/v1/prompts")
+    assert any("[GET /api/v1/prompts]: SELECT" in r.getMessage() for r in caplog.records)
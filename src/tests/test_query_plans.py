@@ -0,0 +1,199 @@
+"""
+Query-plan regression tests.
+
+Seeds a large dataset, drives every read endpoint through the real app,
+captures each SELECT the app sends and runs EXPLAIN on it.  A sequential
+scan of one of the big tables fails the test.
+
+SQLite always runs.  Set PROMPTCRAFT_PLAN_TEST_PG_URL to a *throwaway*
+Postgres database (tables are dropped and recreated) to check Postgres too.
+"""
+import asyncio
+import json
+import os
+import re
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert, text
+
+from src.database.async_database import AsyncDatabaseManager
+from src.database.database import Database
+from src.database.registry import registry
+from src.main import app
+from src.models.models import Base, Feedback, Prompt, PromptInstance, Response
+from src.services import blobs
+from src.services.stats_rollup import rebuild
+
+BIG_TABLES = {"prompts", "prompt_instances", "responses", "feedback"}
+PROMPTS, INSTANCES_PER_PROMPT, RESPONSES_PER_INSTANCE, FEEDBACK_PER_RESPONSE = 300, 8, 2, 3
+
+
+def _seed(db: Database) -> dict:
+    start = datetime(2024, 1, 1)
+    prompts, instances, responses, feedback = [], [], [], []
+    tick = 0
+    for _ in range(PROMPTS):
+        pid = str(uuid.uuid4())
+        prompts.append({"id": pid, "text": "t", "version": 1,
+                        "created_at": start + timedelta(seconds=tick), "updated_at": start})
+        for _ in range(INSTANCES_PER_PROMPT):
+            iid = str(uuid.uuid4())
+            tick += 1
+            instances.append({"id": iid, "prompt_id": pid, "formatted_text_hash": blobs.digest("x"),
+                              "created_at": start + timedelta(seconds=tick)})
+            for _ in range(RESPONSES_PER_INSTANCE):
+                rid = str(uuid.uuid4())
+                responses.append({"id": rid, "prompt_instance_id": iid, "content_hash": blobs.digest("y"),
+                                  "created_at": start + timedelta(seconds=tick)})
+                for k in range(FEEDBACK_PER_RESPONSE):
+                    feedback.append({"id": str(uuid.uuid4()), "response_id": rid,
+                                     "score": (k + 1) / 4,
+                                     "created_at": start + timedelta(seconds=tick, milliseconds=k)})
+    with db.db_manager.get_session() as s:
+        blobs.store(s, ["x", "y"])
+        for model, rows in ((Prompt, prompts), (PromptInstance, instances),
+                            (Response, responses), (Feedback, feedback)):
+            s.execute(insert(model), rows)
+        rebuild(s)
+    with db.db_manager.engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    return {"prompt_id": prompts[0]["id"], "instance_id": instances[0]["id"]}
+
+
+def _capture_selects(url: str, ids: dict, monkeypatch) -> list:
+    """Hit every read endpoint and return the distinct (sql, params) SELECTs."""
+    captured = {}
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.setdefault(statement, parameters)
+
+    monkeypatch.setenv("DATABASE_URL", url)
+    with TestClient(app) as client:
+        engine = registry.get_async().engine.sync_engine
+        event.listen(engine, "before_cursor_execute", _record)
+        pid, iid = ids["prompt_id"], ids["instance_id"]
+        for path in (
+            "/api/v1/prompts?limit=20",
+            f"/api/v1/prompts/{pid}",
+            f"/api/v1/prompts/{pid}/feedback",
+            "/api/v1/feedback",
+            f"/api/v1/prompts/{pid}/stats",
+            f"/api/v1/prompts/{pid}/optimization/readiness",
+            f"/api/v1/prompts/{pid}/instances",
+            f"/api/v1/instances/{iid}/responses",
+        ):
+            r = client.get(path)
+            assert r.status_code == 200, path
+            cursor = (r.json()["data"] or {}).get("next_cursor")
+            if cursor:   # second page through the keyset predicate
+                sep = "&" if "?" in path else "?"
+                assert client.get(f"{path}{sep}cursor={cursor}&total=none").status_code == 200
+        event.remove(engine, "before_cursor_execute", _record)
+    return list(captured.items())
+
+
+async def _explain_all(url: str, statements: list, prefix: str) -> list:
+    adb = AsyncDatabaseManager(url)
+    try:
+        async with adb.engine.connect() as conn:
+            return [
+                (sql, (await conn.exec_driver_sql(prefix + sql, params)).all())
+                for sql, params in statements
+            ]
+    finally:
+        await adb.dispose()
+
+
+def _sqlite_seq_scans(plan_rows) -> list:
+    # "SCAN feedback" = full table scan; "SCAN x USING [COVERING] INDEX" is fine
+    scans = []
+    for row in plan_rows:
+        m = re.match(r"SCAN (\w+)$", row[-1])
+        if m and m.group(1) in BIG_TABLES:
+            scans.append(row[-1])
+    return scans
+
+
+def _pg_seq_scans(plan_rows) -> list:
+    scans = []
+
+    def walk(node):
+        if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in BIG_TABLES:
+            scans.append(f"Seq Scan on {node['Relation Name']}")
+        for child in node.get("Plans", []):
+            walk(child)
+
+    plan = plan_rows[0][0]
+    walk((json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"])
+    return scans
+
+
+def _is_unfiltered_count(sql: str) -> bool:
+    # a bare count(*) of a whole table has no better plan than reading it
+    return sql.lstrip().upper().startswith("SELECT COUNT(") and " WHERE " not in sql.upper()
+
+
+def _backends():
+    yield pytest.param("sqlite", id="sqlite")
+    yield pytest.param(
+        "postgresql", id="postgresql",
+        marks=pytest.mark.skipif(
+            not os.getenv("PROMPTCRAFT_PLAN_TEST_PG_URL"),
+            reason="set PROMPTCRAFT_PLAN_TEST_PG_URL to check Postgres plans",
+        ),
+    )
+
+
+@pytest.mark.parametrize("backend", _backends())
+def test_no_sequential_scans_on_hot_paths(backend, monkeypatch):
+    if backend == "sqlite":
+        url = f"sqlite:///{tempfile.mkdtemp()}/plans.sqlite3"
+        prefix, find_scans = "EXPLAIN QUERY PLAN ", _sqlite_seq_scans
+    else:
+        url = os.environ["PROMPTCRAFT_PLAN_TEST_PG_URL"]
+        prefix, find_scans = "EXPLAIN (FORMAT JSON) ", _pg_seq_scans
+
+    db = Database(url)
+    Base.metadata.drop_all(db.db_manager.engine)
+    db.initialize()
+    try:
+        ids = _seed(db)
+        statements = _capture_selects(url, ids, monkeypatch)
+        assert statements
+        plans = asyncio.run(_explain_all(url, statements, prefix))
+        offenders = {
+            sql: scans
+            for sql, rows in plans
+            if not (backend == "postgresql" and _is_unfiltered_count(sql))
+            for scans in [find_scans(rows)] if scans
+        }
+        assert not offenders, json.dumps(offenders, indent=2)
+    finally:
+        if backend == "postgresql":
+            Base.metadata.drop_all(db.db_manager.engine)
+        db.db_manager.dispose()
+
+
+def test_upgrade_replaces_superseded_indexes(tmp_path):
+    from sqlalchemy import create_engine, inspect
+    from src.database.database import DatabaseManager
+
+    url = f"sqlite:///{tmp_path}/legacy.sqlite3"
+    legacy = create_engine(url)
+    Base.metadata.create_all(legacy)
+    with legacy.begin() as conn:       # as a pre-keyset database left it
+        conn.execute(text("DROP INDEX idx_feedback_created_at_id"))
+        conn.execute(text("CREATE INDEX idx_feedback_created_at ON feedback(created_at)"))
+    legacy.dispose()
+
+    manager = DatabaseManager(url)
+    manager.create_tables()
+    indexes = {i["name"]: i["column_names"] for i in inspect(manager.engine).get_indexes("feedback")}
+    manager.dispose()
+    assert "idx_feedback_created_at" not in indexes
+    assert indexes["idx_feedback_created_at_id"] == ["created_at", "id"]
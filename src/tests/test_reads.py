@@ -0,0 +1,53 @@
+# src/tests/test_reads.py
+import uuid
+from types import SimpleNamespace
+
+from src.api.schemas.feedback import FeedbackOut
+from src.api.schemas.instance import PromptInstanceOut, ResponseOut
+from src.api.schemas.prompt import PromptOut
+from src.models.models import Feedback, Prompt, PromptInstance, Response
+from src.services import blobs, reads
+
+BLOB_TEXT = {PromptInstance: ("formatted_text", "formatted_text_hash"), Response: ("content", "content_hash")}
+
+
+def _with_text(session, obj):
+    """ORM object → attributes the *Out DTOs read, blob text included."""
+    attrs = {c.key: getattr(obj, c.key) for c in obj.__mapper__.column_attrs}
+    if type(obj) in BLOB_TEXT:
+        name, column = BLOB_TEXT[type(obj)]
+        attrs[name] = blobs.load(session, [attrs[column]])[attrs[column]]
+    return SimpleNamespace(**attrs)
+
+
+def test_rows_match_the_dtos(client, db):
+    p_id = client.post("/api/v1/prompts", json={"text": f"R {uuid.uuid4()}"}).json()["data"]["id"]
+    inst = client.post(f"/api/v1/prompts/{p_id}/instances",
+                       json={"formatted_text": "x", "context": {"tier": "pro"}}).json()["data"]
+    bare = client.post(f"/api/v1/instances/{inst['id']}/responses", json={"content": "a"}).json()["data"]
+    client.post(f"/api/v1/instances/{inst['id']}/responses", json={"content": "b", "metadata": {"m": 1}})
+    client.post(f"/api/v1/responses/{bare['id']}/feedback", json={"score": 0.35})
+
+    cases = [
+        (Prompt, PromptOut, reads.select_rows(reads.PromptRow)[0].where(Prompt.id == p_id), reads.PromptRow),
+        (PromptInstance, PromptInstanceOut,
+         reads.select_rows(reads.InstanceRow)[0].where(PromptInstance.id == inst["id"]), reads.InstanceRow),
+        (Response, ResponseOut,
+         reads.select_rows(reads.ResponseRow)[0].where(Response.prompt_instance_id == inst["id"]), reads.ResponseRow),
+        (Feedback, FeedbackOut, reads.select_rows(reads.FeedbackRow)[0].where(Feedback.response_id == bare["id"]),
+         reads.FeedbackRow),
+    ]
+    with db.db_manager.get_session() as s:
+        for model, dto, stmt, row_type in cases:
+            got = reads.resolve(s, sorted(reads.rows(s.execute(stmt), row_type), key=lambda r: r.id))
+            orm = sorted(s.scalars(stmt.with_only_columns(model)), key=lambda o: o.id)
+            assert len(got) == len(orm) > 0
+            for row, obj in zip(got, orm):
+                expected = dto.model_validate(_with_text(s, obj), from_attributes=True).model_dump(by_alias=True)
+                assert dto.model_validate(row, from_attributes=True).model_dump(by_alias=True) == expected
+
+    # the list endpoints encode the rows directly, in the same shape
+    listed = client.get(f"/api/v1/instances/{inst['id']}/responses").json()["data"]
+    assert sorted(r["response_metadata"] == {} for r in listed["items"]) == [False, True]
+    fb = client.get(f"/api/v1/prompts/{p_id}/feedback").json()["data"]["items"]
+    assert fb[0]["score"] == 0.35 and isinstance(fb[0]["score"], float)
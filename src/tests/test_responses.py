@@ -0,0 +1,43 @@
+# src/tests/test_responses.py
+import json
+import uuid
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from src.api import responses
+from src.api.responses import APIJSONResponse
+from src.api.schemas.base import APIResponse
+from src.api.schemas.instance import ResponseOut
+from src.api.schemas.prompt import PaginatedPrompts, PromptOut
+
+
+def test_fast_path_matches_fastapi_encoding(monkeypatch):
+    now = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    items = [PromptOut(id=str(uuid.uuid4()), text="Héllo {x}", version=2, description=None,
+                       created_at=now, updated_at=now)]
+    aliased = ResponseOut(id="r", prompt_instance_id="i", content="c", created_at=now,
+                          response_metadata={"model": "gpt", 1: [0.5]})
+    for data in (PaginatedPrompts(items=items, total=None, offset=0, limit=10), aliased,
+                 {"nested": {"when": now, "scores": [0.1, 1.0]}}, None):
+        env = APIResponse(data=data, message="ok")
+        assert json.loads(APIJSONResponse(env).body) == jsonable_encoder(env)
+        with monkeypatch.context() as m:                 # pydantic-core fallback
+            m.setattr(responses, "orjson", None)
+            assert json.loads(APIJSONResponse(env).body) == jsonable_encoder(env)
+
+
+def test_routes_use_the_fast_path(client, monkeypatch):
+    rendered = []
+    render = APIJSONResponse.render
+    monkeypatch.setattr(APIJSONResponse, "render", lambda self, c: rendered.append(c) or render(self, c))
+    p_id = client.post("/api/v1/prompts", json={"text": f"R {uuid.uuid4()}"}).json()["data"]["id"]
+    r = client.get("/api/v1/prompts", params={"limit": 5})
+    assert r.status_code == 200 and r.headers["content-type"] == "application/json"
+    body = r.json()
+    assert set(body) == {"success", "data", "message", "errors", "timestamp"}
+    assert set(body["data"]) == {"items", "total", "offset", "limit", "next_cursor"}
+    assert [type(c) for c in rendered] == [APIResponse, APIResponse]
+    one = client.get(f"/api/v1/prompts/{p_id}").json()["data"]
+    assert one["created_at"] == datetime.fromisoformat(one["created_at"]).isoformat()
+    assert client.get(f"/api/v1/prompts/{uuid.uuid4()}").json()["success"] is False
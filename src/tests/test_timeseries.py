@@ -0,0 +1,67 @@
+# src/tests/test_timeseries.py
+from datetime import datetime, timedelta
+import json
+import uuid
+import numpy as np
+import pytest
+from src.services.timeseries import bucket_start, fold, parse_bucket, quantiles
+
+
+def test_bucket_parsing_and_alignment():
+    assert parse_bucket("1h") == timedelta(hours=1)
+    assert parse_bucket("2d") == timedelta(days=2)
+    for bad in ("15m", "0h", "h", ""):
+        with pytest.raises(ValueError):
+            parse_bucket(bad)
+    at = datetime(2024, 5, 3, 17, 42)
+    assert bucket_start(at, timedelta(hours=1)) == datetime(2024, 5, 3, 17)
+    assert bucket_start(at, timedelta(hours=6)) == datetime(2024, 5, 3, 12)
+    assert bucket_start(at, timedelta(days=1)) == datetime(2024, 5, 3)
+
+
+def test_fold_merges_hours():
+    def row(hour, scores):
+        hist = [0] * 101
+        for cents, n in scores.items():
+            hist[cents] = n
+        return (datetime(2024, 1, 1, hour), sum(scores.values()),
+                sum(c / 100 * n for c, n in scores.items()),
+                min(scores) / 100, max(scores) / 100, json.dumps(hist))
+    rows = [row(0, {10: 1, 50: 2}), row(1, {90: 1}), row(7, {30: 4})]
+    [day] = fold(rows, timedelta(days=1))
+    assert day["count"] == 8 and day["start"] == datetime(2024, 1, 1)
+    assert (day["min_score"], day["max_score"]) == (0.1, 0.9)
+    assert day["p50"] == 0.3 and day["p90"] == 0.9
+    assert [b["count"] for b in fold(rows, timedelta(hours=6))] == [4, 4]
+    assert fold([], timedelta(hours=1)) == []
+
+
+def test_quantiles_nearest_rank():
+    hist = np.zeros((1, 101), dtype=np.int64)
+    hist[0, [20, 40, 60, 80, 100]] = 1
+    assert quantiles(hist, (0.5, 0.9, 1.0)).tolist() == [[0.6, 1.0, 1.0]]
+
+
+def test_timeseries_endpoint(client):
+    p_id = client.post("/api/v1/prompts", json={"text": f"T {uuid.uuid4()}"}).json()["data"]["id"]
+    calls = [{"prompt_id": p_id, "formatted_text": "x", "content": "y", "score": s}
+             for s in (0.2, 0.4, 0.6, 0.8, 1.0)]
+    client.post("/api/v1/calls:batch", json={"items": calls})
+
+    r = client.get(f"/api/v1/prompts/{p_id}/stats/timeseries", params={"bucket": "1h"})
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert data["bucket"] == "1h" and "from" in data
+    [b] = data["buckets"]
+    assert b["count"] == 5
+    assert b["avg_score"] == pytest.approx(0.6)
+    assert (b["p50"], b["p90"], b["min_score"], b["max_score"]) == (0.6, 1.0, 0.2, 1.0)
+
+    old = (datetime.utcnow() - timedelta(days=30)).isoformat()
+    r = client.get(f"/api/v1/prompts/{p_id}/stats/timeseries",
+                   params={"from": old, "to": (datetime.utcnow() - timedelta(days=29)).isoformat()})
+    assert r.json()["data"]["buckets"] == []
+    assert client.get(f"/api/v1/prompts/{p_id}/stats/timeseries",
+                      params={"bucket": "5m"}).status_code == 400
+    assert client.get(f"/api/v1/prompts/{p_id}/stats/timeseries",
+                      params={"bucket": "1h", "from": "2000-01-01T00:00:00"}).status_code == 400
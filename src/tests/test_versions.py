@@ -0,0 +1,82 @@
+# src/tests/test_versions.py
+import uuid
+import json
+import numpy as np
+from src.services.ab_testing import compare, histogram, t_two_sided, welch
+from src.services.stats_rollup import apply_hourly
+from src.services.versions import backfill
+from src.models.models import Prompt, PromptFeedbackHourly, PromptVersion
+
+
+def test_t_distribution_tail():
+    assert abs(t_two_sided(0.0, 7) - 1.0) < 1e-12
+    assert abs(t_two_sided(1.0, 1) - 0.5) < 1e-12          # Cauchy: P(|T| ≥ 1) = 1/2
+    assert abs(t_two_sided(1.959964, 1e6) - 0.05) < 1e-4   # → normal for large df
+    assert abs(t_two_sided(2.228139, 10) - 0.05) < 1e-6
+
+
+def test_welch_and_bootstrap_on_histograms():
+    a = histogram([(0.4, 30), (0.5, 40), (0.6, 30)])
+    b = histogram([(0.6, 30), (0.7, 40), (0.8, 30)])
+    result = compare(a, b, seed=1)
+    assert abs(result["difference"] - 0.2) < 1e-9
+    assert result["welch"]["p_value"] < 1e-6
+    assert result["significant"] and result["winner"] == "b"
+    assert 0.15 < result["bootstrap"]["ci_low"] < 0.2 < result["bootstrap"]["ci_high"] < 0.25
+    assert result["bootstrap"]["prob_b_better"] == 1.0
+    assert welch(a, histogram([(0.5, 1)]))["p_value"] is None
+    assert compare(a, a, seed=1)["winner"] is None
+    assert np.array_equal(histogram([]), np.zeros(101))
+
+
+def test_comparison_and_hourly_histograms_share_slots():
+    scores = [0.29, 0.57, 0.555, 1.0]          # 0.29 * 100 == 28.999…
+    hourly = PromptFeedbackHourly()
+    apply_hourly(hourly, scores)
+    hist = histogram((score, 1) for score in scores)
+    assert json.loads(hourly.histogram) == hist.tolist()
+    assert np.flatnonzero(hist).tolist() == [29, 56, 57, 100]
+
+
+def test_feedback_attributed_per_version(client):
+    p_id = client.post("/api/v1/prompts", json={"text": f"V1 {uuid.uuid4()}"}).json()["data"]["id"]
+    v1_calls = [{"prompt_id": p_id, "formatted_text": "x", "content": "y", "score": s}
+                for s in (0.3, 0.4, 0.5, 0.4)]
+    client.post("/api/v1/calls:batch", json={"items": v1_calls})
+    client.put(f"/api/v1/prompts/{p_id}", json={"text": "V2"})
+    v2_calls = [{**c, "score": c["score"] + 0.4} for c in v1_calls]
+    client.post("/api/v1/calls:batch", json={"items": v2_calls})
+    # explicitly pinned to the old version after the update
+    inst = client.post(f"/api/v1/prompts/{p_id}/instances",
+                       json={"formatted_text": "late v1", "version": 1}).json()["data"]
+
+    versions = client.get(f"/api/v1/prompts/{p_id}/versions").json()["data"]
+    assert [(v["version"], v["text"], v["feedback_count"]) for v in versions] == [
+        (1, versions[0]["text"], 4), (2, "V2", 4)]
+    assert inst["prompt_version_id"] == versions[0]["id"]
+
+    r = client.get(f"/api/v1/prompts/{p_id}/versions/compare", params={"seed": 7})
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert (data["a"]["version"], data["b"]["version"]) == (1, 2)
+    assert abs(data["difference"] - 0.4) < 1e-9
+    assert data["significant"] and data["winner"] == "b"
+
+    assert client.get(f"/api/v1/prompts/{p_id}/versions/compare", params={"a": 2}).status_code == 400
+    assert client.get(f"/api/v1/prompts/{p_id}/versions/compare", params={"a": 9}).status_code == 404
+    assert client.post(f"/api/v1/prompts/{p_id}/instances",
+                       json={"formatted_text": "x", "version": 9}).status_code == 404
+    bad = {"prompt_id": p_id, "version": 9, "formatted_text": "x", "content": "y"}
+    assert client.post("/api/v1/calls", json=bad).status_code == 404
+
+
+def test_backfill_adds_missing_head_versions(db):
+    with db.db_manager.get_session() as s:
+        legacy = Prompt(text="pre-versioning", version=3)
+        s.add(legacy)
+        s.commit()
+        assert backfill(s) >= 1
+        s.commit()
+        row = s.query(PromptVersion).filter_by(prompt_id=legacy.id).one()
+        assert (row.version, row.text) == (3, "pre-versioning")
+        assert backfill(s) == 0